@@ -0,0 +1,59 @@
+"""Unique client phone numbers
+
+Revision ID: 0ba6a30c0bf4
+Revises: e1aa5b102cc6
+Create Date: 2026-10-16 09:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0ba6a30c0bf4'
+down_revision = 'e1aa5b102cc6'
+branch_labels = None
+depends_on = None
+
+
+# Blank phone numbers mean "no phone number" and must not collide
+CLEAR_BLANK_PHONES = """
+UPDATE clients SET phone_number = NULL, phone_verified = false
+WHERE btrim(phone_number) = ''
+"""
+
+# A shared phone number stays with the client who registered first; the
+# others have to enter theirs again
+CLEAR_DUPLICATE_PHONES = """
+UPDATE clients SET phone_number = NULL, phone_verified = false
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, row_number() OVER (PARTITION BY phone_number ORDER BY created_at, id) AS row_number
+        FROM clients
+        WHERE phone_number IS NOT NULL
+    ) AS ranked
+    WHERE ranked.row_number > 1
+)
+"""
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Fresh databases get the index from create_all when the app starts
+    if not inspector.has_table("clients"):
+        return
+    if any(index["name"] == "ix_clients_phone_number" for index in inspector.get_indexes("clients")):
+        return
+
+    op.execute(CLEAR_BLANK_PHONES)
+    op.execute(CLEAR_DUPLICATE_PHONES)
+
+    # Build the index without blocking client writes; CONCURRENTLY cannot
+    # run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY ix_clients_phone_number ON clients (phone_number)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_clients_phone_number")
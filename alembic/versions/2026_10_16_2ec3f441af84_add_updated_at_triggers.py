@@ -0,0 +1,55 @@
+"""Set updated_at from a trigger on every UPDATE
+
+Revision ID: 2ec3f441af84
+Revises: e24959c6f02c
+Create Date: 2026-10-16 10:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2ec3f441af84'
+down_revision = 'e24959c6f02c'
+branch_labels = None
+depends_on = None
+
+
+# Same function app.models.base installs on create_all; the models no
+# longer set updated_at themselves, so every table needs the trigger
+TOUCH_UPDATED_AT_FUNCTION = """
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def _updated_at_tables() -> list:
+    """Names of the existing tables with an updated_at column."""
+    inspector = sa.inspect(op.get_bind())
+    return [
+        table for table in inspector.get_table_names()
+        if any(column["name"] == "updated_at" for column in inspector.get_columns(table))
+    ]
+
+
+def upgrade() -> None:
+    op.execute(TOUCH_UPDATED_AT_FUNCTION)
+
+    for table in _updated_at_tables():
+        trigger = f"{table}_touch_updated_at"
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+        op.execute(
+            f"CREATE TRIGGER {trigger} BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION touch_updated_at()"
+        )
+
+
+def downgrade() -> None:
+    for table in _updated_at_tables():
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_touch_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS touch_updated_at()")
@@ -0,0 +1,51 @@
+"""One business hours row per business and day
+
+Revision ID: 50dc135e6c4e
+Revises: 857a91b52f2b
+Create Date: 2026-10-16 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '50dc135e6c4e'
+down_revision = '857a91b52f2b'
+branch_labels = None
+depends_on = None
+
+
+# Keep the most recently edited row of each (business, day); it is the one
+# the hours endpoints have been showing
+DELETE_DUPLICATE_HOURS = """
+DELETE FROM business_hours
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, row_number() OVER (
+            PARTITION BY business_id, day_of_week
+            ORDER BY updated_at DESC, created_at DESC, id DESC
+        ) AS row_number
+        FROM business_hours
+    ) AS ranked
+    WHERE ranked.row_number > 1
+)
+"""
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Fresh databases get the constraint from create_all when the app starts
+    if not inspector.has_table("business_hours"):
+        return
+    if any(c["name"] == "uq_business_hours_business_day" for c in inspector.get_unique_constraints("business_hours")):
+        return
+
+    op.execute(DELETE_DUPLICATE_HOURS)
+    op.create_unique_constraint(
+        "uq_business_hours_business_day", "business_hours", ["business_id", "day_of_week"]
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE IF EXISTS business_hours DROP CONSTRAINT IF EXISTS uq_business_hours_business_day")
@@ -0,0 +1,50 @@
+"""Add appointment_range generated column
+
+Revision ID: 5f9da214f686
+Revises:
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSTZRANGE
+
+
+# revision identifiers, used by Alembic.
+revision = '5f9da214f686'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# Postgres only marks ``timestamptz + interval`` as STABLE, so this
+# IMMUTABLE wrapper is what allows the range to back a generated column.
+APPOINTMENT_PERIOD_FUNCTION = """
+CREATE OR REPLACE FUNCTION appointment_period(start_at timestamptz, minutes integer)
+RETURNS tstzrange
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$ SELECT tstzrange(start_at, start_at + make_interval(mins => minutes)) $$
+"""
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Fresh databases get the column from create_all when the app starts
+    if not inspector.has_table("appointments"):
+        return
+
+    op.execute(APPOINTMENT_PERIOD_FUNCTION)
+    if "appointment_range" not in {column["name"] for column in inspector.get_columns("appointments")}:
+        op.add_column(
+            "appointments",
+            sa.Column(
+                "appointment_range",
+                TSTZRANGE(),
+                sa.Computed("appointment_period(appointment_date, duration_minutes)", persisted=True)
+            )
+        )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE IF EXISTS appointments DROP COLUMN IF EXISTS appointment_range")
+    op.execute("DROP FUNCTION IF EXISTS appointment_period(timestamptz, integer)")
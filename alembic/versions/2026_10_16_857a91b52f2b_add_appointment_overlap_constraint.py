@@ -0,0 +1,83 @@
+"""Forbid overlapping active appointments
+
+Revision ID: 857a91b52f2b
+Revises: 5f9da214f686
+Create Date: 2026-10-16 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '857a91b52f2b'
+down_revision = '5f9da214f686'
+branch_labels = None
+depends_on = None
+
+
+ACTIVE_STATUSES = "('PENDING', 'CONFIRMED')"
+
+# Walk the overlapping active appointments oldest booking first and cancel
+# each one that overlaps an earlier booking still active, so the first
+# booking of every double-booked slot is the one kept.
+CANCEL_OVERLAPPING_APPOINTMENTS = f"""
+DO $$
+DECLARE
+    appt record;
+BEGIN
+    FOR appt IN
+        SELECT a.id, a.business_id, a.appointment_range, a.created_at
+        FROM appointments AS a
+        WHERE a.status IN {ACTIVE_STATUSES}
+          AND EXISTS (
+              SELECT 1 FROM appointments AS other
+              WHERE other.business_id = a.business_id
+                AND other.id <> a.id
+                AND other.status IN {ACTIVE_STATUSES}
+                AND other.appointment_range && a.appointment_range
+          )
+        ORDER BY a.created_at, a.id
+    LOOP
+        UPDATE appointments
+        SET status = 'CANCELLED',
+            cancelled_at = now(),
+            cancellation_reason = 'OTHER',
+            cancellation_notes = 'Cancelled automatically: overlapped an earlier booking',
+            cancelled_by_client = false
+        WHERE id = appt.id
+          AND EXISTS (
+              SELECT 1 FROM appointments AS earlier
+              WHERE earlier.business_id = appt.business_id
+                AND earlier.status IN {ACTIVE_STATUSES}
+                AND earlier.appointment_range && appt.appointment_range
+                AND (earlier.created_at, earlier.id) < (appt.created_at, appt.id)
+          );
+    END LOOP;
+END $$
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Fresh databases get the constraint from create_all when the app starts
+    if not sa.inspect(bind).has_table("appointments"):
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    has_constraint = bind.scalar(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'excl_appointments_no_overlap')"
+    ))
+    if has_constraint:
+        return
+
+    op.execute(CANCEL_OVERLAPPING_APPOINTMENTS)
+    op.execute(
+        "ALTER TABLE appointments ADD CONSTRAINT excl_appointments_no_overlap "
+        "EXCLUDE USING gist (business_id WITH =, appointment_range WITH &&) "
+        f"WHERE (status IN {ACTIVE_STATUSES})"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE IF EXISTS appointments DROP CONSTRAINT IF EXISTS excl_appointments_no_overlap")
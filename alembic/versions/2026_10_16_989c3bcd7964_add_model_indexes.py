@@ -0,0 +1,89 @@
+"""Build the composite and partial indexes the models declare
+
+Revision ID: 989c3bcd7964
+Revises: 2ec3f441af84
+Create Date: 2026-10-16 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '989c3bcd7964'
+down_revision = '2ec3f441af84'
+branch_labels = None
+depends_on = None
+
+
+# Indexes declared on the models that create_all only adds to new tables,
+# by name, with the table they are on and their definition
+INDEXES = {
+    "ix_appointments_client_date": ("appointments", "(client_id, appointment_date DESC)"),
+    "ix_appointments_business_date": ("appointments", "(business_id, appointment_date DESC)"),
+    "ix_appointments_business_date_active": (
+        "appointments", "(business_id, appointment_date) WHERE status IN ('PENDING', 'CONFIRMED')"
+    ),
+    "ix_businesses_listed_rating": (
+        "businesses",
+        "(coalesce(average_rating, 0) DESC, id DESC) WHERE is_active = true AND is_approved = true"
+    ),
+    "ix_businesses_listed_category": (
+        "businesses",
+        "(category_id, coalesce(average_rating, 0) DESC, id DESC) WHERE is_active = true AND is_approved = true"
+    ),
+    "ix_services_business": ("services", "(business_id)"),
+    "ix_services_business_active": ("services", "(business_id, sort_order, name) WHERE is_active = true"),
+    "ix_business_gallery_business_sort": ("business_gallery", "(business_id, sort_order, created_at)"),
+    "ix_service_gallery_service_sort": ("service_gallery", "(service_id, sort_order, created_at)"),
+    "ix_chat_messages_room_created": ("chat_messages", "(chat_room_id, created_at DESC, id DESC)"),
+    "ix_clients_name_trgm": ("clients", "USING gin (lower(first_name || ' ' || last_name) gin_trgm_ops)"),
+}
+
+# Single-column indexes the ones above (or a unique constraint) lead with,
+# so they only cost writes now
+SUPERSEDED_INDEXES = {
+    "ix_appointments_client_id": ("appointments", "(client_id)"),
+    "ix_appointments_business_id": ("appointments", "(business_id)"),
+    "ix_business_gallery_business_id": ("business_gallery", "(business_id)"),
+    "ix_service_gallery_service_id": ("service_gallery", "(service_id)"),
+    "ix_chat_messages_chat_room_id": ("chat_messages", "(chat_room_id)"),
+    "ix_chat_rooms_client_id": ("chat_rooms", "(client_id)"),
+}
+
+# Tables whose primary key also had a plain index on id
+ID_INDEXED_TABLES = (
+    "appointments", "business_categories", "business_collection_items", "business_collections",
+    "business_gallery", "business_hours", "businesses", "chat_messages", "chat_rooms", "clients",
+    "favorite_businesses", "notification_logs", "notification_preferences", "notification_templates",
+    "payment_methods", "payment_transactions", "review_helpfulness", "reviews", "service_gallery",
+    "services", "staff_members", "staff_time_off", "staff_working_hours",
+)
+SUPERSEDED_INDEXES.update({f"ix_{table}_id": (table, "(id)") for table in ID_INDEXED_TABLES})
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Fresh databases get the indexes from create_all when the app starts
+    if inspector.has_table("clients"):
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Build the indexes without blocking writes, and only then drop the ones
+    # they replace; CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, (table, definition) in INDEXES.items():
+            if inspector.has_table(table):
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+        for name in SUPERSEDED_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    with op.get_context().autocommit_block():
+        for name, (table, definition) in SUPERSEDED_INDEXES.items():
+            if inspector.has_table(table):
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,51 @@
+"""Add businesses.search_tsv full-text document and GIN index
+
+Revision ID: 9bbebfd50997
+Revises: 50dc135e6c4e
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+
+# revision identifiers, used by Alembic.
+revision = '9bbebfd50997'
+down_revision = '50dc135e6c4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Fresh databases get the column and index from create_all when the app starts
+    if not inspector.has_table("businesses"):
+        return
+
+    if "search_tsv" not in {column["name"] for column in inspector.get_columns("businesses")}:
+        op.add_column(
+            "businesses",
+            sa.Column(
+                "search_tsv",
+                TSVECTOR(),
+                sa.Computed(
+                    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))",
+                    persisted=True
+                )
+            )
+        )
+
+    # Build the index without blocking writes to businesses; CONCURRENTLY
+    # cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_businesses_search_tsv "
+            "ON businesses USING gin (search_tsv)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_businesses_search_tsv")
+    op.execute("ALTER TABLE IF EXISTS businesses DROP COLUMN IF EXISTS search_tsv")
@@ -0,0 +1,80 @@
+"""One chat room per client and business
+
+Revision ID: e1aa5b102cc6
+Revises: 9bbebfd50997
+Create Date: 2026-10-16 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1aa5b102cc6'
+down_revision = '9bbebfd50997'
+branch_labels = None
+depends_on = None
+
+
+# Every room of a (client, business) pair that has more than one, mapped to
+# the pair's oldest room, which is the one kept
+COLLECT_DUPLICATE_ROOMS = """
+CREATE TEMPORARY TABLE chat_room_merge ON COMMIT DROP AS
+SELECT id, kept_id FROM (
+    SELECT id,
+           first_value(id) OVER (PARTITION BY client_id, business_id ORDER BY created_at, id) AS kept_id,
+           count(*) OVER (PARTITION BY client_id, business_id) AS rooms
+    FROM chat_rooms
+) AS grouped
+WHERE rooms > 1
+"""
+
+# The kept room takes over the latest activity and unread counts of the group
+MERGE_ROOM_STATE = """
+UPDATE chat_rooms AS kept
+SET last_message_at = merged.last_message_at,
+    client_unread_count = merged.client_unread_count,
+    business_unread_count = merged.business_unread_count
+FROM (
+    SELECT m.kept_id,
+           max(r.last_message_at) AS last_message_at,
+           sum(r.client_unread_count) AS client_unread_count,
+           sum(r.business_unread_count) AS business_unread_count
+    FROM chat_room_merge AS m
+    JOIN chat_rooms AS r ON r.id = m.id
+    GROUP BY m.kept_id
+) AS merged
+WHERE kept.id = merged.kept_id
+"""
+
+MOVE_MESSAGES = """
+UPDATE chat_messages
+SET chat_room_id = m.kept_id
+FROM chat_room_merge AS m
+WHERE chat_messages.chat_room_id = m.id AND m.id <> m.kept_id
+"""
+
+DELETE_DUPLICATE_ROOMS = """
+DELETE FROM chat_rooms
+USING chat_room_merge AS m
+WHERE chat_rooms.id = m.id AND m.id <> m.kept_id
+"""
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Fresh databases get the constraint from create_all when the app starts
+    if not inspector.has_table("chat_rooms"):
+        return
+    if any(c["name"] == "uq_chat_rooms_client_business" for c in inspector.get_unique_constraints("chat_rooms")):
+        return
+
+    op.execute(COLLECT_DUPLICATE_ROOMS)
+    op.execute(MERGE_ROOM_STATE)
+    op.execute(MOVE_MESSAGES)
+    op.execute(DELETE_DUPLICATE_ROOMS)
+    op.create_unique_constraint("uq_chat_rooms_client_business", "chat_rooms", ["client_id", "business_id"])
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE IF EXISTS chat_rooms DROP CONSTRAINT IF EXISTS uq_chat_rooms_client_business")
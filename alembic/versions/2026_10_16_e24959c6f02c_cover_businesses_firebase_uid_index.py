@@ -0,0 +1,66 @@
+"""Cover id, email and is_active in ix_businesses_firebase_uid
+
+Revision ID: e24959c6f02c
+Revises: 0ba6a30c0bf4
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e24959c6f02c'
+down_revision = '0ba6a30c0bf4'
+branch_labels = None
+depends_on = None
+
+
+# Whether ix_businesses_firebase_uid already carries INCLUDE columns
+IS_COVERING = """
+SELECT EXISTS (
+    SELECT 1 FROM pg_index
+    JOIN pg_class ON pg_class.oid = pg_index.indexrelid
+    WHERE pg_class.relname = 'ix_businesses_firebase_uid' AND pg_index.indnatts > pg_index.indnkeyatts
+)
+"""
+
+
+def _swap_index(definition: str) -> None:
+    """
+    Replace ix_businesses_firebase_uid without blocking business writes.
+
+    The new index is built CONCURRENTLY under a temporary name, then takes
+    over the old one's name, which duplicate-registration errors are mapped
+    by. CONCURRENTLY cannot run inside the migration transaction.
+    """
+    with op.get_context().autocommit_block():
+        # Left behind invalid if an earlier attempt failed mid-build
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_businesses_firebase_uid_new")
+        op.execute(f"CREATE UNIQUE INDEX CONCURRENTLY ix_businesses_firebase_uid_new ON businesses {definition}")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_businesses_firebase_uid")
+        op.execute("ALTER INDEX ix_businesses_firebase_uid_new RENAME TO ix_businesses_firebase_uid")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Fresh databases get the index from create_all when the app starts
+    if not sa.inspect(bind).has_table("businesses"):
+        return
+
+    # Vacuum eagerly so the visibility map stays current for index-only scans
+    op.execute(
+        "ALTER TABLE businesses SET "
+        "(autovacuum_vacuum_scale_factor = 0.02, autovacuum_analyze_scale_factor = 0.01)"
+    )
+
+    if not bind.scalar(sa.text(IS_COVERING)):
+        _swap_index("(firebase_uid) INCLUDE (id, email, is_active)")
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("businesses"):
+        return
+
+    op.execute("ALTER TABLE businesses RESET (autovacuum_vacuum_scale_factor, autovacuum_analyze_scale_factor)")
+    _swap_index("(firebase_uid)")
@@ -0,0 +1,10 @@
+"""
+Version 1 of the Bookora API.
+
+The v1 router is built once in app.api.v1.api and re-exported here so
+every application entry point mounts the same router instance.
+"""
+
+from app.api.v1.api import api_router
+
+__all__ = ["api_router"]
@@ -7,70 +7,184 @@ Firebase UID is passed as parameter from frontend.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from sqlalchemy import and_, bindparam, func, select, DateTime
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import uuid
 
-from app.core.database import get_db
-from app.models.appointments import Appointment, AppointmentStatus
-from app.models.businesses import Business, Service
-from app.models.clients import Client
+from app.core.auth import Principal, PrincipalKind, get_current_business_id, get_principal, get_principals
+from app.core.database import get_async_db, get_replica_db
+from app.core.db_errors import EXCLUSION_VIOLATION
+from app.core.responses import json_data_response, json_list_response, json_response
+from app.models.appointments import ACTIVE_APPOINTMENT_STATUSES, Appointment, AppointmentStatus
+from app.models.businesses import WEEKDAYS
+from app.services.catalog_cache import (
+    CachedHours, get_availability_cached, get_business_cached, get_business_hours_cached,
+    get_service_cached, invalidate_availability, store_availability
+)
 from app.schemas.appointments import (
     AppointmentCreate, AppointmentUpdate, AppointmentResponse,
-    AppointmentListResponse, AppointmentReschedule
+    AppointmentListResponse, AppointmentReschedule, AvailableSlotsResponse
 )
 
 router = APIRouter()
 
+# Granularity of bookable slot start times
+SLOT_INTERVAL_MINUTES = 15
+
+# "HH:MM" labels indexed by minute of the day
+MINUTES_PER_DAY = 24 * 60
+MINUTE_LABELS = tuple(f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(MINUTES_PER_DAY))
+
+# Validates calendar rows straight from ORM objects
+_APPOINTMENT_LIST_ADAPTER = TypeAdapter(List[AppointmentResponse])
+
+
+# Hot statements built once at import; requests only bind parameters, so the
+# compiled SQL is served from the engine's statement cache.
+_BUSINESS_CALENDAR_STMT = (
+    select(Appointment)
+    .options(raiseload("*"))
+    .where(
+        and_(
+            Appointment.business_id == bindparam("business_id"),
+            Appointment.appointment_date >= bindparam("start_date"),
+            Appointment.appointment_date <= bindparam("end_date")
+        )
+    )
+    .order_by(Appointment.appointment_date)
+)
+
+
+async def _commit_or_conflict(db: AsyncSession, detail: str):
+    """
+    Commit, mapping an overlapping-appointment exclusion violation to 409.
+    
+    Raises:
+        HTTPException: 409 if the commit would double-book the business
+    """
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if getattr(e.orig, "pgcode", None) == EXCLUSION_VIOLATION:
+            raise HTTPException(status_code=409, detail=detail)
+        raise
+
+
+def _business_tz(name: str) -> ZoneInfo:
+    """Resolve a business timezone name, falling back to UTC if it is unknown."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+async def _find_open_slots(
+    db: AsyncSession,
+    business_id: uuid.UUID,
+    slot_date: date,
+    hours: CachedHours,
+    duration_minutes: int,
+    tz: ZoneInfo
+) -> List[str]:
+    """
+    Find free slot start times (HH:MM, business timezone) within a day's hours.
+    
+    Candidate slots are generated in SQL with generate_series over the
+    business hours and filtered with a NOT EXISTS overlap check against
+    pending/confirmed appointments, so the whole computation is one
+    indexed query.
+    """
+    duration = timedelta(minutes=duration_minutes)
+    open_at = datetime.combine(slot_date, hours.open_time, tzinfo=tz)
+    close_at = datetime.combine(slot_date, hours.close_time, tzinfo=tz)
+    
+    slots = select(
+        func.generate_series(
+            open_at,
+            close_at - duration,
+            timedelta(minutes=SLOT_INTERVAL_MINUTES),
+            type_=DateTime(timezone=True)
+        ).label("start_at")
+    ).subquery("slots")
+    slot_period = func.tstzrange(slots.c.start_at, slots.c.start_at + duration)
+    
+    booked = (
+        select(Appointment.id)
+        .where(
+            Appointment.business_id == business_id,
+            Appointment.status.in_(ACTIVE_APPOINTMENT_STATUSES),
+            Appointment.appointment_range.op("&&")(slot_period)
+        )
+        .exists()
+    )
+    
+    stmt = (
+        select(slots.c.start_at)
+        .where(slots.c.start_at > func.now(), ~booked)
+        .order_by(slots.c.start_at)
+    )
+    
+    if hours.break_start and hours.break_end:
+        break_period = func.tstzrange(
+            datetime.combine(slot_date, hours.break_start, tzinfo=tz),
+            datetime.combine(slot_date, hours.break_end, tzinfo=tz)
+        )
+        stmt = stmt.where(~slot_period.op("&&")(break_period))
+    
+    # Label each slot by its own local wall time: offsets from opening
+    # would be off by an hour for slots after a DST transition
+    labels = []
+    for start_at in await db.scalars(stmt):
+        local = start_at.astimezone(tz)
+        labels.append(MINUTE_LABELS[local.hour * 60 + local.minute])
+    return labels
+
+
+def _is_appointment_client(appointment: Appointment, principals: List[Principal]) -> bool:
+    """Check whether any of the caller's accounts is the client who booked the appointment."""
+    return any(
+        principal.kind == PrincipalKind.CLIENT and appointment.client_id == principal.id
+        for principal in principals
+    )
+
+
+def _is_appointment_business(appointment: Appointment, principals: List[Principal]) -> bool:
+    """Check whether any of the caller's accounts is the business the appointment is with."""
+    return any(
+        principal.kind == PrincipalKind.BUSINESS and appointment.business_id == principal.id
+        for principal in principals
+    )
+
+
 @router.post("/book", response_model=AppointmentResponse)
 async def book_appointment(
     appointment_data: AppointmentCreate,
-    firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    principal: Optional[Principal] = Depends(get_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Book a new appointment."""
-    # Get client
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
+    if principal is None or principal.kind != PrincipalKind.CLIENT:
         raise HTTPException(status_code=404, detail="Client profile not found")
     
-    # Validate business and service
-    service = db.query(Service).filter(Service.id == appointment_data.service_id).first()
+    # Service and business rarely change, so they are served from Redis
+    service = await get_service_cached(db, appointment_data.service_id)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
     
-    business = service.business
+    business = await get_business_cached(db, service.business_id)
     if business.status != "active":
         raise HTTPException(status_code=400, detail="Business is not accepting appointments")
     
-    # Check for scheduling conflicts
-    appointment_end = appointment_data.appointment_date + timedelta(minutes=service.duration_minutes)
-    
-    conflicts = db.query(Appointment).filter(
-        and_(
-            Appointment.business_id == business.id,
-            Appointment.status.in_([AppointmentStatus.CONFIRMED, AppointmentStatus.PENDING]),
-            or_(
-                and_(
-                    Appointment.appointment_date <= appointment_data.appointment_date,
-                    Appointment.appointment_date + timedelta(minutes=Appointment.duration_minutes) > appointment_data.appointment_date
-                ),
-                and_(
-                    Appointment.appointment_date < appointment_end,
-                    Appointment.appointment_date >= appointment_data.appointment_date
-                )
-            )
-        )
-    ).first()
-    
-    if conflicts:
-        raise HTTPException(status_code=409, detail="Time slot is already booked")
-    
     # Create appointment
     appointment = Appointment(
-        client_id=client.id,
+        client_id=principal.id,
         business_id=business.id,
         service_id=service.id,
         appointment_date=appointment_data.appointment_date,
@@ -81,117 +195,115 @@ async def book_appointment(
         status=AppointmentStatus.PENDING
     )
     
-    # Generate confirmation code
-    appointment.generate_confirmation_code()
-    
+    # The confirmation code is assigned by its column default within the INSERT.
+    # Scheduling conflicts are rejected by the excl_appointments_no_overlap constraint
     db.add(appointment)
-    db.commit()
-    db.refresh(appointment)
+    await _commit_or_conflict(db, "Time slot is already booked")
+    await invalidate_availability(business.id)
     
-    return appointment
+    return json_response(AppointmentResponse.model_validate(appointment))
 
 
 @router.get("/my-appointments", response_model=AppointmentListResponse)
 async def get_my_appointments(
-    firebase_uid: str = Query(..., description="Firebase UID from frontend"),
+    principal: Optional[Principal] = Depends(get_principal),
     status: Optional[AppointmentStatus] = Query(None, description="Filter by status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_replica_db)
 ):
     """Get appointments for the current user (client or business)."""
     
-    # Check if user is a client
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    
-    # Check if user is a business
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
-    if not client and not business:
+    # Check if user is a client or a business
+    if not principal:
         raise HTTPException(status_code=404, detail="User profile not found")
     
-    # Build query
-    query = db.query(Appointment)
+    # Build query. AppointmentResponse only reads appointment columns, so
+    # relationships are never loaded; raiseload makes an accidental
+    # per-row lazy load fail loudly instead of issuing N queries.
+    query = select(Appointment).options(raiseload("*"))
     
-    if client:
-        query = query.filter(Appointment.client_id == client.id)
+    if principal.kind == PrincipalKind.CLIENT:
+        query = query.where(Appointment.client_id == principal.id)
     else:
-        query = query.filter(Appointment.business_id == business.id)
+        query = query.where(Appointment.business_id == principal.id)
     
     if status:
-        query = query.filter(Appointment.status == status)
-    
-    # Get total count
-    total = query.count()
+        query = query.where(Appointment.status == status)
     
-    # Apply pagination and ordering
-    appointments = (
-        query.order_by(Appointment.appointment_date.desc())
+    # Fetch the page and the total count together with COUNT(*) OVER ()
+    result = await db.execute(
+        query.add_columns(func.count().over().label("total"))
+        .order_by(Appointment.appointment_date.desc())
         .offset(skip)
         .limit(limit)
-        .all()
     )
+    rows = result.all()
+    appointments = [AppointmentResponse.model_validate(row.Appointment) for row in rows]
+    
+    if rows:
+        total = rows[0].total
+    elif skip:
+        # Page is past the end, so the window count is unavailable
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    else:
+        total = 0
     
-    return AppointmentListResponse(
+    # Items are validated above, so the envelope is built without revalidating them
+    return json_response(AppointmentListResponse.model_construct(
         appointments=appointments,
         total=total,
         skip=skip,
         limit=limit
-    )
+    ))
 
 
 @router.get("/{appointment_id}", response_model=AppointmentResponse)
 async def get_appointment(
     appointment_id: uuid.UUID = Path(..., description="Appointment ID"),
-    firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    principals: List[Principal] = Depends(get_principals),
+    db: AsyncSession = Depends(get_replica_db)
 ):
     """Get a specific appointment by ID."""
     
-    appointment = db.query(Appointment).filter(Appointment.id == appointment_id).first()
+    appointment = await db.get(Appointment, appointment_id)
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
     
     # Check if user has access to this appointment
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
     has_access = False
-    if client and appointment.client_id == client.id:
+    if _is_appointment_client(appointment, principals):
         has_access = True
-    elif business and appointment.business_id == business.id:
+    elif _is_appointment_business(appointment, principals):
         has_access = True
     
     if not has_access:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    return appointment
+    return json_response(AppointmentResponse.model_validate(appointment))
 
 
 @router.put("/{appointment_id}/status", response_model=AppointmentResponse)
 async def update_appointment_status(
     appointment_id: uuid.UUID,
     status: AppointmentStatus,
-    firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    principals: List[Principal] = Depends(get_principals),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update appointment status (business owners and clients can modify)."""
     
-    appointment = db.query(Appointment).filter(Appointment.id == appointment_id).first()
+    appointment = await db.get(Appointment, appointment_id)
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
     
     # Check if user has access to modify this appointment
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
     has_access = False
-    if client and appointment.client_id == client.id:
+    if _is_appointment_client(appointment, principals):
         # Clients can only cancel appointments
         if status not in [AppointmentStatus.CANCELLED]:
             raise HTTPException(status_code=403, detail="Clients can only cancel appointments")
         has_access = True
-    elif business and appointment.business_id == business.id:
+    elif _is_appointment_business(appointment, principals):
         # Businesses can modify any status
         has_access = True
     
@@ -199,94 +311,103 @@ async def update_appointment_status(
         raise HTTPException(status_code=403, detail="Access denied")
     
     appointment.status = status
-    appointment.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(appointment)
+    # Reactivating an appointment can collide with one booked in the meantime
+    await _commit_or_conflict(db, "Time slot is already booked")
+    await invalidate_availability(appointment.business_id)
     
-    return appointment
+    return json_response(AppointmentResponse.model_validate(appointment))
 
 
 @router.put("/{appointment_id}/reschedule", response_model=AppointmentResponse)
 async def reschedule_appointment(
     appointment_id: uuid.UUID,
     reschedule_data: AppointmentReschedule,
-    firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    principals: List[Principal] = Depends(get_principals),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Reschedule an appointment."""
     
-    appointment = db.query(Appointment).filter(Appointment.id == appointment_id).first()
+    appointment = await db.get(Appointment, appointment_id)
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
     
     # Check if user has access
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
     has_access = False
-    if client and appointment.client_id == client.id:
+    if _is_appointment_client(appointment, principals):
         has_access = True
-    elif business and appointment.business_id == business.id:
+    elif _is_appointment_business(appointment, principals):
         has_access = True
     
     if not has_access:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Check for conflicts with new time
-    appointment_end = reschedule_data.new_date + timedelta(minutes=appointment.duration_minutes)
-    
-    conflicts = db.query(Appointment).filter(
-        and_(
-            Appointment.business_id == appointment.business_id,
-            Appointment.id != appointment.id,
-            Appointment.status.in_([AppointmentStatus.CONFIRMED, AppointmentStatus.PENDING]),
-            or_(
-                and_(
-                    Appointment.appointment_date <= reschedule_data.new_date,
-                    Appointment.appointment_date + timedelta(minutes=Appointment.duration_minutes) > reschedule_data.new_date
-                ),
-                and_(
-                    Appointment.appointment_date < appointment_end,
-                    Appointment.appointment_date >= reschedule_data.new_date
-                )
-            )
-        )
-    ).first()
-    
-    if conflicts:
-        raise HTTPException(status_code=409, detail="New time slot is already booked")
+    # Update appointment; conflicts with the new time are rejected by the
+    # excl_appointments_no_overlap constraint
+    appointment.appointment_date = reschedule_data.new_appointment_date
     
-    # Update appointment
-    appointment.appointment_date = reschedule_data.new_date
-    appointment.updated_at = datetime.utcnow()
+    await _commit_or_conflict(db, "New time slot is already booked")
+    await invalidate_availability(appointment.business_id)
     
-    db.commit()
-    db.refresh(appointment)
-    
-    return appointment
+    return json_response(AppointmentResponse.model_validate(appointment))
 
 
 # Business-specific appointment endpoints
 @router.get("/business/calendar", response_model=List[AppointmentResponse])
 async def get_business_calendar(
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     start_date: datetime = Query(..., description="Start date for calendar"),
     end_date: datetime = Query(..., description="End date for calendar"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_replica_db)
 ):
     """Get business calendar with all appointments in date range."""
     
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
+    result = await db.scalars(
+        _BUSINESS_CALENDAR_STMT,
+        {"business_id": business_id, "start_date": start_date, "end_date": end_date}
+    )
     
-    appointments = db.query(Appointment).filter(
-        and_(
-            Appointment.business_id == business.id,
-            Appointment.appointment_date >= start_date,
-            Appointment.appointment_date <= end_date
+    return json_list_response(_APPOINTMENT_LIST_ADAPTER, result.all())
+
+
+@router.get("/business/{business_id}/available-slots", response_model=AvailableSlotsResponse)
+async def get_available_slots(
+    business_id: uuid.UUID = Path(..., description="Business ID"),
+    service_id: uuid.UUID = Query(..., description="Service to book"),
+    slot_date: date = Query(..., alias="date", description="Date to check (YYYY-MM-DD)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get bookable time slots for a service on a given date.
+    
+    Responses are cached briefly per business, and dropped whenever its
+    appointments, hours or services change.
+    """
+    cached = await get_availability_cached(business_id, slot_date, service_id)
+    if cached is not None:
+        return json_data_response(cached)
+    
+    service = await get_service_cached(db, service_id)
+    if not service or service.business_id != business_id:
+        raise HTTPException(status_code=404, detail="Service not found")
+    
+    business = await get_business_cached(db, business_id)
+    schedule = await get_business_hours_cached(db, business_id)
+    hours = schedule.get(WEEKDAYS[slot_date.weekday()])
+    
+    response = AvailableSlotsResponse(
+        business_id=business_id,
+        service_id=service_id,
+        date=slot_date,
+        duration_minutes=service.duration_minutes,
+        slot_interval_minutes=SLOT_INTERVAL_MINUTES
+    )
+    
+    if hours and not hours.is_closed and hours.open_time and hours.close_time:
+        response.slots = await _find_open_slots(
+            db, business_id, slot_date, hours, service.duration_minutes, _business_tz(business.timezone)
         )
-    ).order_by(Appointment.appointment_date).all()
     
-    return appointments
\ No newline at end of file
+    await store_availability(business_id, slot_date, service_id, response.model_dump(mode="json"))
+    
+    return json_response(response)
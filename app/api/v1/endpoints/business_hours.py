@@ -8,140 +8,201 @@ Authentication is handled by API key middleware.
 Firebase UID is passed as parameter from frontend.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Path
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, delete, exists, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import List, Optional
-from datetime import datetime, time
+from datetime import date, time
 import uuid
 
-from app.core.database import get_db
-from app.models.businesses import Business, BusinessHours, WeekDay
+from app.core.auth import get_business_id, get_current_business_id
+from app.core.database import get_async_db
+from app.core.responses import json_data_response, json_list_response, json_response
+from app.services.catalog_cache import (
+    get_business_hours_cached, invalidate_availability, invalidate_business_hours
+)
+from app.models.businesses import WEEKDAYS, Business, BusinessHours
 from app.schemas.businesses import BusinessHoursCreate, BusinessHoursUpdate, BusinessHoursResponse
 
 router = APIRouter()
 
+_HOURS_LIST_ADAPTER = TypeAdapter(List[BusinessHoursResponse])
+
+# Hot statements are built once; requests only bind values
+_WEEK_HOURS_STMT = (
+    select(BusinessHours)
+    .where(BusinessHours.business_id == bindparam("business_id"))
+    .order_by(BusinessHours.day_of_week)
+)
+_ACTIVE_BUSINESS_EXISTS_STMT = select(
+    exists().where(Business.id == bindparam("business_id"), Business.is_active == True)
+)
+_DAY_HOURS_EXIST_STMT = select(
+    exists().where(
+        BusinessHours.business_id == bindparam("business_id"),
+        BusinessHours.day_of_week == bindparam("day_of_week")
+    )
+)
+_OWNED_HOURS_STMT = (
+    select(BusinessHours)
+    .join(BusinessHours.business)
+    .where(
+        BusinessHours.id == bindparam("hours_id"),
+        Business.firebase_uid == bindparam("firebase_uid")
+    )
+)
+_DELETE_OWNED_HOURS_STMT = (
+    delete(BusinessHours)
+    .where(
+        BusinessHours.id == bindparam("hours_id"),
+        BusinessHours.business_id == (
+            select(Business.id).where(Business.firebase_uid == bindparam("firebase_uid")).scalar_subquery()
+        )
+    )
+    .returning(BusinessHours.business_id)
+)
+
+
+async def _get_owned_hours(db: AsyncSession, hours_id: uuid.UUID, firebase_uid: str) -> BusinessHours:
+    """
+    Load business hours owned by the business with the given Firebase UID.
+    
+    Ownership and the row are resolved in one joined query; the business
+    is only looked up separately to pick the right 404 when nothing matches.
+    
+    Raises:
+        HTTPException: 404 if the business or the hours don't exist
+    """
+    business_hours = await db.scalar(_OWNED_HOURS_STMT, {"hours_id": hours_id, "firebase_uid": firebase_uid})
+    if business_hours:
+        return business_hours
+    
+    if not await get_business_id(db, firebase_uid):
+        raise HTTPException(status_code=404, detail="Business not found")
+    raise HTTPException(status_code=404, detail="Business hours not found")
+
+
+def _validate_hours(
+    is_closed: bool,
+    open_time: Optional[time],
+    close_time: Optional[time],
+    break_start: Optional[time],
+    break_end: Optional[time]
+) -> None:
+    """
+    Check that a day's hours are ordered open <= break start < break end <= close.
+    
+    Valid hours pass with a single chained comparison; the individual
+    checks only run to pick the error message.
+    
+    Raises:
+        HTTPException: 400 if the hours are missing or out of order
+    """
+    if is_closed:
+        return
+    
+    if open_time is None or close_time is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Open and close times are required when business is not closed"
+        )
+    
+    if break_start is None or break_end is None:
+        if open_time < close_time:
+            return
+    elif open_time <= break_start < break_end <= close_time:
+        return
+    
+    if open_time >= close_time:
+        detail = "Close time must be after open time"
+    elif break_start >= break_end:
+        detail = "Break end time must be after break start time"
+    else:
+        detail = "Break times must be within operating hours"
+    raise HTTPException(status_code=400, detail=detail)
+
 
 @router.get("/", response_model=List[BusinessHoursResponse])
 async def get_business_hours(
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    business_id: uuid.UUID = Depends(get_current_business_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all operating hours for the business.
     Business owner only.
     Returns hours for all days of the week.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
     # Get all business hours ordered by day
-    hours = (
-        db.query(BusinessHours)
-        .filter(BusinessHours.business_id == business.id)
-        .order_by(BusinessHours.day_of_week)
-        .all()
-    )
+    hours = await db.scalars(_WEEK_HOURS_STMT, {"business_id": business_id})
     
-    return hours
+    return json_list_response(_HOURS_LIST_ADAPTER, hours.all())
 
 
 @router.get("/public/{business_id}", response_model=List[BusinessHoursResponse])
 async def get_business_hours_public(
     business_id: uuid.UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get business operating hours (public endpoint).
     Anyone can view business hours to know when they're open.
     """
     # Verify business exists
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.is_active == True
-    ).first()
+    business_exists = await db.scalar(_ACTIVE_BUSINESS_EXISTS_STMT, {"business_id": business_id})
     
-    if not business:
+    if not business_exists:
         raise HTTPException(status_code=404, detail="Business not found")
     
     # Get all business hours
-    hours = (
-        db.query(BusinessHours)
-        .filter(BusinessHours.business_id == business_id)
-        .order_by(BusinessHours.day_of_week)
-        .all()
-    )
+    hours = await db.scalars(_WEEK_HOURS_STMT, {"business_id": business_id})
     
-    return hours
+    return json_list_response(_HOURS_LIST_ADAPTER, hours.all())
 
 
 @router.post("/", response_model=BusinessHoursResponse)
 async def create_business_hours(
     hours_data: BusinessHoursCreate,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    business_id: uuid.UUID = Depends(get_current_business_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Set operating hours for a specific day.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
     # Check if hours already exist for this day
-    existing_hours = db.query(BusinessHours).filter(
-        BusinessHours.business_id == business.id,
-        BusinessHours.day_of_week == hours_data.day_of_week
-    ).first()
+    hours_exist = await db.scalar(
+        _DAY_HOURS_EXIST_STMT,
+        {"business_id": business_id, "day_of_week": hours_data.day_of_week}
+    )
     
-    if existing_hours:
+    if hours_exist:
         raise HTTPException(
             status_code=400,
             detail=f"Hours already exist for {hours_data.day_of_week}. Use PUT to update."
         )
     
-    # Validate times if not closed
-    if not hours_data.is_closed:
-        if not hours_data.open_time or not hours_data.close_time:
-            raise HTTPException(
-                status_code=400,
-                detail="Open and close times are required when business is not closed"
-            )
-        
-        if hours_data.open_time >= hours_data.close_time:
-            raise HTTPException(
-                status_code=400,
-                detail="Close time must be after open time"
-            )
-        
-        # Validate break times if provided
-        if hours_data.break_start and hours_data.break_end:
-            if hours_data.break_start >= hours_data.break_end:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Break end time must be after break start time"
-                )
-            
-            if hours_data.break_start < hours_data.open_time or hours_data.break_end > hours_data.close_time:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Break times must be within operating hours"
-                )
+    _validate_hours(
+        hours_data.is_closed,
+        hours_data.open_time,
+        hours_data.close_time,
+        hours_data.break_start,
+        hours_data.break_end
+    )
     
     # Create business hours
     business_hours = BusinessHours(
-        business_id=business.id,
+        business_id=business_id,
         **hours_data.model_dump()
     )
     
     db.add(business_hours)
-    db.commit()
-    db.refresh(business_hours)
+    await db.commit()
+    await invalidate_business_hours(business_id)
+    await invalidate_availability(business_id)
     
-    return business_hours
+    return json_response(BusinessHoursResponse.model_validate(business_hours))
 
 
 @router.put("/{hours_id}", response_model=BusinessHoursResponse)
@@ -149,213 +210,164 @@ async def update_business_hours(
     hours_id: uuid.UUID,
     hours_update: BusinessHoursUpdate,
     firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update operating hours for a specific day.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Get business hours
-    business_hours = db.query(BusinessHours).filter(
-        BusinessHours.id == hours_id,
-        BusinessHours.business_id == business.id
-    ).first()
-    
-    if not business_hours:
-        raise HTTPException(status_code=404, detail="Business hours not found")
+    # Get business hours, verifying business ownership
+    business_hours = await _get_owned_hours(db, hours_id, firebase_uid)
     
     # Update fields
     update_data = hours_update.model_dump(exclude_unset=True)
     
-    # Validate times if being updated
-    if not update_data.get('is_closed', business_hours.is_closed):
-        open_time = update_data.get('open_time', business_hours.open_time)
-        close_time = update_data.get('close_time', business_hours.close_time)
-        
-        if open_time and close_time:
-            if open_time >= close_time:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Close time must be after open time"
-                )
-        
-        # Validate break times if provided
-        break_start = update_data.get('break_start', business_hours.break_start)
-        break_end = update_data.get('break_end', business_hours.break_end)
-        
-        if break_start and break_end:
-            if break_start >= break_end:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Break end time must be after break start time"
-                )
-            
-            if break_start < open_time or break_end > close_time:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Break times must be within operating hours"
-                )
+    # Validate the hours as they will be stored after the update
+    _validate_hours(*(
+        update_data.get(field, getattr(business_hours, field))
+        for field in ("is_closed", "open_time", "close_time", "break_start", "break_end")
+    ))
     
     # Apply updates
     for field, value in update_data.items():
         setattr(business_hours, field, value)
     
-    business_hours.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(business_hours)
+    await db.commit()
+    await invalidate_business_hours(business_hours.business_id)
+    await invalidate_availability(business_hours.business_id)
     
-    return business_hours
+    return json_response(BusinessHoursResponse.model_validate(business_hours))
 
 
 @router.delete("/{hours_id}")
 async def delete_business_hours(
     hours_id: uuid.UUID,
     firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete operating hours for a specific day.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Get and delete business hours
-    business_hours = db.query(BusinessHours).filter(
-        BusinessHours.id == hours_id,
-        BusinessHours.business_id == business.id
-    ).first()
+    # Delete the hours only if the business owns them, in a single statement
+    business_id = await db.scalar(_DELETE_OWNED_HOURS_STMT, {"hours_id": hours_id, "firebase_uid": firebase_uid})
     
-    if not business_hours:
+    if not business_id:
+        if not await get_business_id(db, firebase_uid):
+            raise HTTPException(status_code=404, detail="Business not found")
         raise HTTPException(status_code=404, detail="Business hours not found")
     
-    db.delete(business_hours)
-    db.commit()
+    await db.commit()
+    await invalidate_business_hours(business_id)
+    await invalidate_availability(business_id)
     
     return {"message": "Business hours deleted successfully"}
 
 
 @router.post("/batch", response_model=List[BusinessHoursResponse])
 async def set_batch_business_hours(
-    hours_list: List[BusinessHoursCreate],
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    hours_list: List[BusinessHoursCreate] = Body(
+        ...,
+        max_length=len(WEEKDAYS),
+        description="Hours for up to one entry per day of the week"
+    ),
+    business_id: uuid.UUID = Depends(get_current_business_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Set operating hours for multiple days at once.
     Useful for setting up weekly schedule in one request.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
+    for hours_data in hours_list:
+        _validate_hours(
+            hours_data.is_closed,
+            hours_data.open_time,
+            hours_data.close_time,
+            hours_data.break_start,
+            hours_data.break_end
+        )
     
-    created_hours = []
+    # One row per day; the last entry for a day wins
+    rows = {
+        hours_data.day_of_week: {"business_id": business_id, **hours_data.model_dump()}
+        for hours_data in hours_list
+    }
+    if not rows:
+        return []
     
-    for hours_data in hours_list:
-        # Check if hours already exist for this day
-        existing_hours = db.query(BusinessHours).filter(
-            BusinessHours.business_id == business.id,
-            BusinessHours.day_of_week == hours_data.day_of_week
-        ).first()
-        
-        if existing_hours:
-            # Update existing hours
-            update_data = hours_data.model_dump()
-            for field, value in update_data.items():
-                setattr(existing_hours, field, value)
-            existing_hours.updated_at = datetime.utcnow()
-            created_hours.append(existing_hours)
-        else:
-            # Create new hours
-            business_hours = BusinessHours(
-                business_id=business.id,
-                **hours_data.model_dump()
-            )
-            db.add(business_hours)
-            created_hours.append(business_hours)
-    
-    db.commit()
-    
-    # Refresh all objects
-    for hours in created_hours:
-        db.refresh(hours)
-    
-    return created_hours
+    # Insert new days and update existing ones in a single upsert that
+    # returns the stored rows, instead of a lookup and refresh per day
+    stmt = pg_insert(BusinessHours).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_business_hours_business_day",
+        set_={field: stmt.excluded[field] for field in BusinessHoursCreate.model_fields if field != "day_of_week"}
+    ).returning(BusinessHours)
+    
+    result = await db.scalars(stmt, execution_options={"populate_existing": True})
+    saved_hours = result.all()
+    
+    await db.commit()
+    await invalidate_business_hours(business_id)
+    await invalidate_availability(business_id)
+    
+    return json_list_response(_HOURS_LIST_ADAPTER, saved_hours)
 
 
 @router.get("/check-availability", response_model=dict)
 async def check_business_availability(
     business_id: uuid.UUID,
     check_date: str = Query(..., description="Date to check (YYYY-MM-DD format)"),
-    db: Session = Depends(get_db)
+    check_time: Optional[time] = Query(None, description="Time of day to check (HH:MM)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Check if business is open on a specific date.
     Public endpoint - useful for clients to know if they can book.
-    Returns opening hours and break times for the day.
+    Returns opening hours and break times for the day, and whether the
+    business is open at check_time when one is given.
     """
-    from datetime import datetime
-    
     # Parse date
     try:
-        date_obj = datetime.strptime(check_date, "%Y-%m-%d").date()
+        date_obj = date.fromisoformat(check_date)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    # Get day of week (0=Monday, 6=Sunday)
-    day_of_week = date_obj.weekday()
-    
-    # Map to WeekDay enum
-    weekday_map = {
-        0: WeekDay.MONDAY,
-        1: WeekDay.TUESDAY,
-        2: WeekDay.WEDNESDAY,
-        3: WeekDay.THURSDAY,
-        4: WeekDay.FRIDAY,
-        5: WeekDay.SATURDAY,
-        6: WeekDay.SUNDAY
-    }
-    
-    weekday = weekday_map[day_of_week]
+    weekday = WEEKDAYS[date_obj.weekday()]
     
-    # Get business hours for this day
-    hours = db.query(BusinessHours).filter(
-        BusinessHours.business_id == business_id,
-        BusinessHours.day_of_week == weekday
-    ).first()
+    # Get business hours for this day from the cached weekly schedule
+    schedule = await get_business_hours_cached(db, business_id)
+    hours = schedule.get(weekday)
     
     if not hours:
-        return {
+        return json_data_response({
             "is_open": False,
             "reason": "No hours configured for this day",
             "date": check_date,
             "day_of_week": weekday.value
-        }
+        })
     
     if hours.is_closed:
-        return {
+        return json_data_response({
             "is_open": False,
             "reason": "Business is closed on this day",
             "date": check_date,
             "day_of_week": weekday.value
-        }
+        })
     
-    return {
+    availability = {
         "is_open": True,
         "date": check_date,
         "day_of_week": weekday.value,
-        "open_time": hours.open_time.isoformat() if hours.open_time else None,
-        "close_time": hours.close_time.isoformat() if hours.close_time else None,
-        "break_start": hours.break_start.isoformat() if hours.break_start else None,
-        "break_end": hours.break_end.isoformat() if hours.break_end else None
+        "open_time": hours.open_time,
+        "close_time": hours.close_time,
+        "break_start": hours.break_start,
+        "break_end": hours.break_end
     }
+    
+    if check_time is not None:
+        availability["check_time"] = check_time
+        availability["is_open_at_time"] = hours.is_open_at(check_time)
+    
+    return json_data_response(availability)
 
@@ -6,44 +6,358 @@ Authentication is handled by API key middleware.
 Firebase UID is passed as parameter from frontend.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload, selectinload
 from sqlalchemy.sql import func
-from sqlalchemy import desc
-from typing import List, Optional
-from datetime import datetime, timedelta
+from sqlalchemy import Integer, bindparam, cast, column, delete, desc, exists, insert, literal, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.exc import IntegrityError
+from geoalchemy2 import Geometry
+from typing import AsyncIterator, List, Optional, Tuple
+from decimal import Decimal
+import base64
+import orjson
 import uuid
 
-from app.core.database import get_db
+from app.core.auth import get_business_id, invalidate_principal
+from app.core.cache import cache_delete, cache_get_bytes, cache_set_bytes
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.core.db_errors import raise_if_duplicate
+from app.core.responses import json_list_response, json_response
+from app.services.catalog_cache import (
+    get_active_categories_cached, get_business_etag, get_gallery_etag, get_services_etag,
+    invalidate_availability, invalidate_business, invalidate_business_content, invalidate_service
+)
+from app.services.search_cache import cached_search_response, search_cache_key
+from app.models.base import geography_point, location_point
 from app.models.businesses import (
-    Business, BusinessCategory, Service, BusinessHours, BusinessGallery, ServiceGallery
+    LISTING_RATING, Business, BusinessCategory, Service, BusinessHours, BusinessGallery, ServiceGallery
 )
 from app.schemas.businesses import (
     BusinessCreate, BusinessUpdate, BusinessResponse, BusinessListResponse,
     BusinessCategoryResponse, ServiceCreate, ServiceUpdate, ServiceResponse,
-    BusinessGalleryCreate, BusinessGalleryUpdate, BusinessGalleryResponse,
+    BusinessGalleryCreate, BusinessGalleryUpdate, BusinessGalleryResponse, GalleryOrderItem,
     ServiceGalleryCreate, ServiceGalleryUpdate, ServiceGalleryResponse
 )
 
 router = APIRouter()
 
+# List schemas resolved once at import instead of per response
+_CATEGORY_LIST_ADAPTER = TypeAdapter(List[BusinessCategoryResponse])
+_SERVICE_LIST_ADAPTER = TypeAdapter(List[ServiceResponse])
+_BUSINESS_GALLERY_LIST_ADAPTER = TypeAdapter(List[BusinessGalleryResponse])
+_SERVICE_GALLERY_LIST_ADAPTER = TypeAdapter(List[ServiceGalleryResponse])
+_BUSINESS_ADAPTER = TypeAdapter(BusinessResponse)
+_BUSINESS_GALLERY_ADAPTER = TypeAdapter(BusinessGalleryResponse)
+_SERVICE_GALLERY_ADAPTER = TypeAdapter(ServiceGalleryResponse)
+
+# BusinessResponse fields read straight from a Business column
+_BUSINESS_COLUMN_FIELDS = [
+    name for name in BusinessResponse.model_fields
+    if name not in ("category", "latitude", "longitude")
+]
+
+# Columns search results are serialized from, so list pages don't hydrate
+# Business objects or transfer the geography value and search document;
+# coordinates are extracted in SQL and the category arrives joined
+_BUSINESS_LIST_COLUMNS = (
+    *(getattr(Business, name).label(name) for name in _BUSINESS_COLUMN_FIELDS),
+    func.ST_Y(cast(Business.location, Geometry(geometry_type="POINT", srid=4326))).label("latitude"),
+    func.ST_X(cast(Business.location, Geometry(geometry_type="POINT", srid=4326))).label("longitude"),
+    *(getattr(BusinessCategory, name).label(f"category__{name}") for name in BusinessCategoryResponse.model_fields),
+)
+
+# Unique indexes on businesses and the error reported when a write collides with one
+_DUPLICATE_DETAILS = {
+    "ix_businesses_firebase_uid": "Business already registered for this Firebase UID",
+    "ix_businesses_email": "Email already registered",
+    "ix_businesses_booking_slug": "Booking slug already taken",
+}
+
+# Gallery images are fetched and serialized in batches of this many rows
+GALLERY_YIELD_PER = 50
+
+# Media type of newline-delimited JSON, which gallery listings can stream instead of an array
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Hot statements are built once with bind parameters, so requests only bind
+# values and hit the compiled cache instead of rebuilding the statement
+
+# ID of the business registered under the firebase_uid parameter
+_OWNER_BUSINESS_ID = select(Business.id).where(Business.firebase_uid == bindparam("firebase_uid"))
+
+# Criteria matching the service_id / image_id parameter's row only if it is
+# owned by the firebase_uid parameter's business
+_OWNED_SERVICE = (
+    Service.id == bindparam("service_id"),
+    Service.business_id == _OWNER_BUSINESS_ID.scalar_subquery()
+)
+_OWNED_GALLERY_IMAGE = (
+    BusinessGallery.id == bindparam("image_id"),
+    BusinessGallery.business_id == _OWNER_BUSINESS_ID.scalar_subquery()
+)
+# A service gallery image's ownership is checked with an EXISTS correlated
+# to the image's own service, a single primary key probe on services
+_OWNED_SERVICE_GALLERY_IMAGE = (
+    ServiceGallery.id == bindparam("image_id"),
+    exists().where(
+        Service.id == ServiceGallery.service_id,
+        Service.business_id == _OWNER_BUSINESS_ID.scalar_subquery()
+    )
+)
+
+# Owner key sources for INSERT ... SELECT of business-owned and service-owned rows
+_OWNER_BUSINESS = select(Business.id.label("business_id")).where(Business.firebase_uid == bindparam("firebase_uid"))
+_OWNER_SERVICE = select(Service.id.label("service_id")).where(*_OWNED_SERVICE)
+
+# Businesses with the category BusinessResponse requires; existing
+# identity-map state is overwritten, so these also reload server-generated
+# values after a commit
+_MY_BUSINESS_STMT = (
+    select(Business)
+    .options(joinedload(Business.category))
+    .where(Business.firebase_uid == bindparam("firebase_uid"))
+    .execution_options(populate_existing=True)
+)
+_BUSINESS_BY_ID_STMT = (
+    select(Business)
+    .options(joinedload(Business.category))
+    .where(Business.id == bindparam("business_id"), Business.is_active == True)
+    .execution_options(populate_existing=True)
+)
+
+_SOFT_DELETE_SERVICE_STMT = (
+    update(Service).where(*_OWNED_SERVICE).values(is_active=False).returning(Service.business_id)
+)
+_DELETE_GALLERY_IMAGE_STMT = (
+    delete(BusinessGallery).where(*_OWNED_GALLERY_IMAGE).returning(BusinessGallery.business_id)
+)
+_DELETE_SERVICE_GALLERY_IMAGE_STMT = (
+    delete(ServiceGallery).where(*_OWNED_SERVICE_GALLERY_IMAGE).returning(ServiceGallery.service_id)
+)
+
+
+def _service_gallery_key(service_id: uuid.UUID, active_only: bool) -> str:
+    """Cache key of a serialized service gallery listing."""
+    return f"service_gallery:{service_id}:{int(active_only)}"
+
+
+async def _invalidate_service_gallery(service_id: uuid.UUID):
+    """Drop both cached listings of a service's gallery. Call after any image changes."""
+    await cache_delete(*(_service_gallery_key(service_id, active_only) for active_only in (True, False)))
+
+
+async def _business_page_body(
+    db: AsyncSession, page_stmt, count_stmt, skip: int, limit: int, after_cursor: bool = False, keyset: bool = False
+) -> bytes:
+    """
+    Fetch a page of businesses and serialize it as a BusinessListResponse body.
+    
+    Rows are selected with _BUSINESS_LIST_COLUMNS and serialized straight
+    from the row mappings, without hydrating Business objects.
+    
+    Offset pages carry the total as a COUNT(*) OVER () column. Pages
+    continuing from a cursor (after_cursor) only see the rows past it, so
+    their total comes from count_stmt. With keyset ordering, a full page
+    ends with the cursor for the next one.
+    """
+    rows = (await db.execute(page_stmt)).all()
+    
+    if rows and not after_cursor:
+        total = rows[0].total
+    else:
+        # Page continues from a cursor or is past the end (or empty), so
+        # the window count is unavailable
+        total = await db.scalar(count_stmt) if skip or after_cursor else 0
+    
+    next_cursor = None
+    if keyset and len(rows) == limit:
+        next_cursor = _encode_search_cursor(rows[-1].average_rating or 0, rows[-1].id)
+    
+    items = b",".join(
+        _BUSINESS_ADAPTER.dump_json(_BUSINESS_ADAPTER.validate_python(_business_from_row(row._mapping)))
+        for row in rows
+    )
+    return b'{"businesses":[%b],"total":%d,"skip":%d,"limit":%d,"next_cursor":%b}' % (
+        items, total, skip, limit, orjson.dumps(next_cursor)
+    )
+
+
+async def _stream_rows(stmt, adapter: TypeAdapter, ndjson: bool) -> AsyncIterator[bytes]:
+    """
+    Stream ORM rows as a JSON array, or as NDJSON with one object per line.
+    
+    Rows come from a server-side cursor GALLERY_YIELD_PER at a time, so
+    memory stays flat and the first bytes go out after the first batch
+    however many rows there are. The generator owns its session, since it
+    runs after the endpoint has returned.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream_scalars(stmt.execution_options(yield_per=GALLERY_YIELD_PER))
+        
+        if ndjson:
+            async for row in result:
+                yield adapter.dump_json(adapter.validate_python(row)) + b"\n"
+            return
+        
+        yield b"["
+        first = True
+        async for row in result:
+            if not first:
+                yield b","
+            first = False
+            yield adapter.dump_json(adapter.validate_python(row))
+        yield b"]"
+
+
+def _gallery_stmt(business_id: uuid.UUID, active_only: bool, after: Optional[uuid.UUID], limit: Optional[int]):
+    """
+    Gallery images of a business in display order.
+    
+    after is the ID of the last image the client already has; the page
+    resumes right after it by keyset instead of OFFSET.
+    """
+    stmt = select(BusinessGallery).where(BusinessGallery.business_id == business_id)
+    
+    if active_only:
+        stmt = stmt.where(BusinessGallery.is_active == True)
+    
+    if after is not None:
+        last = aliased(BusinessGallery)
+        stmt = stmt.where(
+            tuple_(BusinessGallery.sort_order, BusinessGallery.created_at, BusinessGallery.id)
+            > tuple_(
+                select(last.sort_order).where(last.id == after).scalar_subquery(),
+                select(last.created_at).where(last.id == after).scalar_subquery(),
+                after
+            )
+        )
+    
+    return stmt.order_by(BusinessGallery.sort_order, BusinessGallery.created_at, BusinessGallery.id).limit(limit)
+
+
+def _cache_headers(etag: str) -> dict:
+    """Validator and freshness headers for a public business resource."""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.PUBLIC_CACHE_MAX_AGE}, stale-while-revalidate=300"
+    }
+
+
+def _gallery_response(request: Request, stmt) -> StreamingResponse:
+    """Stream gallery images as NDJSON if the client accepts it, otherwise as a JSON array."""
+    ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    return StreamingResponse(
+        _stream_rows(stmt, _BUSINESS_GALLERY_ADAPTER, ndjson),
+        media_type=NDJSON_MEDIA_TYPE if ndjson else "application/json"
+    )
+
+
+def _encode_search_cursor(average_rating: Decimal, business_id: uuid.UUID) -> str:
+    """Opaque search cursor for the position after the given row."""
+    return base64.urlsafe_b64encode(orjson.dumps([str(average_rating), str(business_id)])).decode()
+
+
+def _decode_search_cursor(cursor: str) -> Tuple[Decimal, uuid.UUID]:
+    """
+    Decode a cursor returned as next_cursor by search.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        average_rating, business_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return Decimal(average_rating), uuid.UUID(business_id)
+    except (ValueError, TypeError, ArithmeticError, orjson.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _business_from_row(row) -> dict:
+    """BusinessResponse data from a row selected with _BUSINESS_LIST_COLUMNS."""
+    business = {name: row[name] for name in _BUSINESS_COLUMN_FIELDS}
+    business["latitude"] = row["latitude"]
+    business["longitude"] = row["longitude"]
+    business["category"] = {
+        name: row[f"category__{name}"] for name in BusinessCategoryResponse.model_fields
+    }
+    return business
+
+
+def _insert_owned(model, owner_select, params: dict, values: dict):
+    """
+    Build an INSERT ... SELECT that only inserts when the owner row exists.
+    
+    owner_select selects the single owner key column (labelled with the
+    foreign key's name) and is bound with params; the new row's values are
+    bound alongside it, so ownership is checked by the same statement that
+    writes the row. The parameters are bound into the statement, since the
+    ORM treats parameters passed to an INSERT at execution as rows.
+    """
+    columns = model.__table__.c
+    owner_key = owner_select.selected_columns[0].name
+    return insert(model).from_select(
+        [owner_key, *values],
+        owner_select.params(**params).add_columns(
+            *(literal(value, columns[name].type) for name, value in values.items())
+        )
+    ).returning(model)
+
+
+async def _write_owned(db: AsyncSession, stmt, params: dict, not_found: str):
+    """
+    Run a write restricted to business-owned rows and return what it RETURNING'd.
+    
+    Ownership is part of the statement's WHERE clause, so the write costs a
+    single round trip; the business is only looked up separately to pick the
+    right 404 when nothing matched. The caller commits.
+    
+    Args:
+        db: Database session
+        stmt: Write statement using the firebase_uid bind parameter
+        params: Bind parameter values, including firebase_uid
+        not_found: 404 detail when the business exists but the row doesn't
+    
+    Raises:
+        HTTPException: 404 if the business or the row doesn't exist
+    """
+    # _insert_owned statements already carry their parameters
+    row = await db.scalar(
+        stmt, None if stmt.is_insert else params, execution_options={"populate_existing": True}
+    )
+    if row is not None:
+        return row
+    
+    if not await get_business_id(db, params["firebase_uid"]):
+        raise HTTPException(status_code=404, detail="Business not found")
+    raise HTTPException(status_code=404, detail=not_found)
+
 
 # Business Categories (Public - No auth needed)
 @router.get("/categories", response_model=List[BusinessCategoryResponse])
 async def get_business_categories(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all active business categories.
     Public endpoint - no authentication required.
+    Supports If-None-Match; an unchanged list is answered with 304.
     """
-    categories = db.query(BusinessCategory).filter(
-        BusinessCategory.is_active == True
-    ).offset(skip).limit(limit).all()
+    categories = await get_active_categories_cached(db)
+    headers = {"ETag": categories.etag, "Cache-Control": f"public, max-age={settings.CATEGORY_CACHE_TTL}"}
+    
+    if request.headers.get("if-none-match") == categories.etag:
+        return Response(status_code=304, headers=headers)
     
-    return categories
+    response = json_list_response(_CATEGORY_LIST_ADAPTER, categories.items[skip:skip + limit])
+    response.headers.update(headers)
+    return response
 
 
 # Business Registration 
@@ -51,109 +365,91 @@ async def get_business_categories(
 async def register_business(
     business_data: BusinessCreate,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Register a new business with Firebase UID."""
-    
-    # Check if business already exists for this Firebase UID
-    existing_business = db.query(Business).filter(
-        Business.firebase_uid == firebase_uid
-    ).first()
-    
-    if existing_business:
-        raise HTTPException(
-            status_code=400,
-            detail="Business already registered for this Firebase UID"
-        )
-    
-    # Check if email already exists
-    if business_data.email:
-        existing_email = db.query(Business).filter(
-            Business.email == business_data.email
-        ).first()
-        if existing_email:
-            raise HTTPException(
-                status_code=400,
-                detail="Email already registered"
+    business_dict = business_data.model_dump(exclude={"firebase_uid", "owner_email", "latitude", "longitude"})
+    
+    # Coordinates are stored as a single geography point
+    if business_data.latitude is not None and business_data.longitude is not None:
+        business_dict["location"] = location_point(business_data.latitude, business_data.longitude)
+    
+    # Duplicate Firebase UIDs and emails are rejected by their unique indexes,
+    # so the INSERT is the only round trip besides loading the category
+    try:
+        business = await db.scalar(
+            insert(Business)
+            .values(
+                firebase_uid=firebase_uid,
+                email=business_data.owner_email,
+                email_verified=False,  # Email verification handled by Firebase on frontend
+                **business_dict
             )
+            .returning(Business)
+            .options(selectinload(Business.category))
+        )
+        await db.commit()
+    except IntegrityError as e:
+        await raise_if_duplicate(db, e, _DUPLICATE_DETAILS)
     
-    # Create business
-    business_dict = business_data.model_dump(exclude={'firebase_uid'})
-    
-    business = Business(
-        firebase_uid=firebase_uid,
-        email_verified=False,  # Email verification handled by Firebase on frontend
-        **business_dict
-    )
-    
-    # Set location if provided
-    if business_data.latitude and business_data.longitude:
-        business.set_location(business_data.latitude, business_data.longitude)
-    
-    db.add(business)
-    db.commit()
-    db.refresh(business)
+    await invalidate_principal(business.firebase_uid)
     
-    return business
+    return json_response(BusinessResponse.model_validate(business))
 
 
 # Business Profile Management
 @router.get("/me", response_model=BusinessResponse)
 async def get_my_business(
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's business profile."""
-    business = db.query(Business).filter(
-        Business.firebase_uid == firebase_uid
-    ).first()
+    business = await db.scalar(_MY_BUSINESS_STMT, {"firebase_uid": firebase_uid})
     
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
-    return business
+    return json_response(BusinessResponse.model_validate(business))
 
 
 @router.put("/me", response_model=BusinessResponse)
 async def update_my_business(
     business_update: BusinessUpdate,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user's business profile."""
-    business = db.query(Business).filter(
-        Business.firebase_uid == firebase_uid
-    ).first()
-    
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Update fields
     update_data = business_update.model_dump(exclude_unset=True)
     
-    # Check email conflicts if email is being updated
-    if "email" in update_data and update_data["email"] != business.email:
-        existing_email = db.query(Business).filter(
-            Business.email == update_data["email"],
-            Business.id != business.id
-        ).first()
-        if existing_email:
-            raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Apply updates
-    for field, value in update_data.items():
-        setattr(business, field, value)
+    # Coordinates are stored as a single geography point
+    latitude = update_data.pop("latitude", None)
+    longitude = update_data.pop("longitude", None)
+    if latitude is not None and longitude is not None:
+        update_data["location"] = location_point(latitude, longitude)
+    
+    # Update and return the row in one statement instead of loading it first;
+    # the category needed by BusinessResponse follows in one IN query.
+    # Conflicting unique values are rejected by their indexes.
+    try:
+        business = await db.scalar(
+            update(Business)
+            .where(Business.firebase_uid == firebase_uid)
+            .values(**update_data)
+            .returning(Business)
+            .options(selectinload(Business.category)),
+            execution_options={"populate_existing": True}
+        )
+    except IntegrityError as e:
+        await raise_if_duplicate(db, e, _DUPLICATE_DETAILS)
     
-    # Update location if provided
-    if hasattr(business_update, 'latitude') and hasattr(business_update, 'longitude'):
-        if business_update.latitude and business_update.longitude:
-            business.set_location(business_update.latitude, business_update.longitude)
+    if not business:
+        raise HTTPException(status_code=404, detail="Business not found")
     
-    business.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(business)
+    await db.commit()
+    await invalidate_business(business.id)
+    await invalidate_availability(business.id)
     
-    return business
+    return json_response(BusinessResponse.model_validate(business))
 
 
 # Public Business Search (No auth needed)
@@ -167,129 +463,187 @@ async def search_businesses(
     min_rating: Optional[float] = Query(None, ge=0, le=5, description="Minimum rating"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page, instead of skip"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Search businesses with various filters.
     Public endpoint - no authentication required.
-    """
+    Identical searches share one query and a cached response for
+    SEARCH_CACHE_TTL seconds.
     
-    query_builder = db.query(Business).filter(
+    Without a text query or location, results are ordered by rating and
+    can be paged with next_cursor, which stays cheap at any depth unlike
+    skip.
+    """
+    query_builder = select(*_BUSINESS_LIST_COLUMNS).join(Business.category).where(
         Business.is_active == True,
         Business.is_approved == True
     )
     
-    # Text search
-    if query:
-        search_filter = func.lower(func.concat(
-            Business.name, " ", Business.description
-        )).contains(query.lower())
-        query_builder = query_builder.filter(search_filter)
+    # Text search against the GIN-indexed full-text document
+    ts_query = func.websearch_to_tsquery("simple", query) if query else None
+    if ts_query is not None:
+        query_builder = query_builder.where(Business.search_tsv.bool_op("@@")(ts_query))
     
     # Category filter
     if category_id:
-        query_builder = query_builder.filter(Business.category_id == category_id)
+        query_builder = query_builder.where(Business.category_id == category_id)
     
     # Location proximity filter
-    if latitude and longitude:
-        # Use PostGIS distance calculation
-        distance_filter = func.ST_DWithin(
-            Business.location,
-            func.ST_Point(longitude, latitude),
-            radius_km * 1000  # Convert km to meters
-        )
-        query_builder = query_builder.filter(distance_filter)
+    if latitude is not None and longitude is not None:
+        # Geography point (SRID 4326) so distances are in meters, bound once
+        # and shared by the radius filter and the ordering
+        point = geography_point(latitude, longitude)
         
-        # Order by distance
-        query_builder = query_builder.order_by(
-            func.ST_Distance(Business.location, func.ST_Point(longitude, latitude))
+        query_builder = query_builder.where(
+            Business.within_radius(latitude, longitude, radius_km * 1000, point)  # Convert km to meters
         )
+        
+        # Order by distance with the KNN operator, which walks the GiST
+        # index nearest-first instead of computing and sorting ST_Distance
+        query_builder = query_builder.order_by(Business.location.op("<->")(point))
     
     # Rating filter
     if min_rating:
-        query_builder = query_builder.filter(Business.average_rating >= min_rating)
+        query_builder = query_builder.where(Business.average_rating >= min_rating)
+    
+    has_location = latitude is not None and longitude is not None
+    
+    # Without a location, best text matches come first, with the ID as
+    # tie-breaker so equally ranked rows keep a stable order across pages
+    if ts_query is not None and not has_location:
+        query_builder = query_builder.order_by(func.ts_rank(Business.search_tsv, ts_query).desc(), Business.id)
+    
+    # Otherwise order by rating, with the ID as tie-breaker so the order is
+    # total and a cursor can resume right after the last row seen
+    keyset = ts_query is None and not has_location
+    if keyset:
+        query_builder = query_builder.order_by(LISTING_RATING.desc(), Business.id.desc())
     
-    # Get total count
-    total = query_builder.count()
+    count_stmt = select(func.count()).select_from(
+        query_builder.with_only_columns(Business.id, maintain_column_froms=True).order_by(None).subquery()
+    )
     
-    # Apply pagination
-    businesses = query_builder.offset(skip).limit(limit).all()
+    if cursor:
+        if not keyset:
+            raise HTTPException(
+                status_code=400,
+                detail="Cursor paging is only available without a search query or location"
+            )
+        # Seek past the cursor instead of scanning and discarding skip rows
+        page_stmt = query_builder.where(
+            tuple_(LISTING_RATING, Business.id) < tuple_(*_decode_search_cursor(cursor))
+        ).limit(limit)
+        skip = 0
+    else:
+        # Fetch the page and the total count together with COUNT(*) OVER ()
+        page_stmt = (
+            query_builder.add_columns(func.count().over().label("total"))
+            .offset(skip)
+            .limit(limit)
+        )
     
-    return BusinessListResponse(
-        businesses=businesses,
-        total=total,
-        skip=skip,
-        limit=limit
+    # Coordinates in the key are bucketed to 3 decimals (about 100 m) so that
+    # nearby users share cached results; the query itself uses the exact ones
+    cache_key = search_cache_key("businesses", {
+        "query": query,
+        "category_id": category_id,
+        "latitude": round(latitude, 3) if has_location else None,
+        "longitude": round(longitude, 3) if has_location else None,
+        "radius_km": radius_km,
+        "min_rating": min_rating,
+        "skip": skip,
+        "limit": limit,
+        "cursor": cursor,
+    })
+    
+    return await cached_search_response(
+        cache_key,
+        lambda: _business_page_body(db, page_stmt, count_stmt, skip, limit, after_cursor=bool(cursor), keyset=keyset)
     )
 
 
 @router.get("/{business_id}", response_model=BusinessResponse)
 async def get_business_by_id(
+    request: Request,
     business_id: uuid.UUID = Path(..., description="Business ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get business details by ID.
     Public endpoint - no authentication required.
+    Supports conditional requests: 304 when If-None-Match matches the ETag.
     """
-    business = db.query(Business).filter(
-        Business.id == business_id,
-        Business.is_active == True
-    ).first()
+    etag = await get_business_etag(db, business_id)
+    if not etag:
+        raise HTTPException(status_code=404, detail="Business not found")
+    
+    headers = _cache_headers(etag)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    business = await db.scalar(_BUSINESS_BY_ID_STMT, {"business_id": business_id})
     
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
-    return business
+    response = json_response(BusinessResponse.model_validate(business))
+    response.headers.update(headers)
+    return response
 
 
 # Service Management Endpoints
 @router.get("/{business_id}/services", response_model=List[ServiceResponse])
 async def get_business_services(
+    request: Request,
     business_id: uuid.UUID = Path(..., description="Business ID"),
     include_inactive: bool = Query(False, description="Include inactive services"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all services for a business.
     Public endpoint - returns active services by default.
+    Supports conditional requests: 304 when If-None-Match matches the ETag.
     """
-    query = db.query(Service).filter(Service.business_id == business_id)
+    etag = await get_services_etag(db, business_id)
+    headers = _cache_headers(etag) if etag else {}
+    if etag and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    query = select(Service).where(Service.business_id == business_id)
     
     if not include_inactive:
-        query = query.filter(Service.is_active == True)
+        query = query.where(Service.is_active == True)
     
-    services = query.order_by(Service.sort_order, Service.name).all()
+    services = await db.scalars(query.order_by(Service.sort_order, Service.name))
     
-    return services
+    response = json_list_response(_SERVICE_LIST_ADAPTER, services.all())
+    response.headers.update(headers)
+    return response
 
 
 @router.post("/me/services", response_model=ServiceResponse)
 async def create_service(
     service_data: ServiceCreate,
     firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new service for the business.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Create service
-    service = Service(
-        business_id=business.id,
-        **service_data.model_dump()
+    # Insert the service only if the business exists, in a single statement
+    service = await db.scalar(
+        _insert_owned(Service, _OWNER_BUSINESS, {"firebase_uid": firebase_uid}, service_data.model_dump())
     )
+    if service is None:
+        raise HTTPException(status_code=404, detail="Business not found")
     
-    db.add(service)
-    db.commit()
-    db.refresh(service)
+    await db.commit()
+    await invalidate_business_content(service.business_id)
     
-    return service
+    return json_response(ServiceResponse.model_validate(service))
 
 
 @router.put("/me/services/{service_id}", response_model=ServiceResponse)
@@ -297,67 +651,53 @@ async def update_service(
     service_id: uuid.UUID,
     service_update: ServiceUpdate,
     firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a service.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Get service
-    service = db.query(Service).filter(
-        Service.id == service_id,
-        Service.business_id == business.id
-    ).first()
-    
-    if not service:
-        raise HTTPException(status_code=404, detail="Service not found")
-    
-    # Update service
-    update_data = service_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(service, field, value)
+    # Update the service only if the business owns it, in a single statement
+    service = await _write_owned(
+        db,
+        update(Service)
+        .where(*_OWNED_SERVICE)
+        .values(**service_update.model_dump(exclude_unset=True))
+        .returning(Service),
+        {"service_id": service_id, "firebase_uid": firebase_uid},
+        "Service not found"
+    )
     
-    service.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(service)
+    await db.commit()
+    await invalidate_service(service.id)
+    await invalidate_business_content(service.business_id)
+    await invalidate_availability(service.business_id)
     
-    return service
+    return json_response(ServiceResponse.model_validate(service))
 
 
 @router.delete("/me/services/{service_id}")
 async def delete_service(
     service_id: uuid.UUID,
     firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete (soft delete) a service.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Get service
-    service = db.query(Service).filter(
-        Service.id == service_id,
-        Service.business_id == business.id
-    ).first()
-    
-    if not service:
-        raise HTTPException(status_code=404, detail="Service not found")
-    
-    # Soft delete (mark as inactive)
-    service.is_active = False
-    service.updated_at = datetime.utcnow()
+    # Soft delete (mark as inactive) only if the business owns the service
+    business_id = await _write_owned(
+        db,
+        _SOFT_DELETE_SERVICE_STMT,
+        {"service_id": service_id, "firebase_uid": firebase_uid},
+        "Service not found"
+    )
     
-    db.commit()
+    await db.commit()
+    await invalidate_service(service_id)
+    await invalidate_business_content(business_id)
+    await invalidate_availability(business_id)
     
     return {"message": "Service deleted successfully"}
 
@@ -370,7 +710,7 @@ async def delete_service(
 async def add_business_gallery_image(
     image_data: BusinessGalleryCreate,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add an image to business gallery.
@@ -383,32 +723,27 @@ async def add_business_gallery_image(
     
     **Example image types**: exterior, interior, work_sample, team, product, etc.
     """
-    # Get business by Firebase UID
-    business = db.query(Business).filter(
-        Business.firebase_uid == firebase_uid
-    ).first()
-    
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Create gallery image
-    gallery_image = BusinessGallery(
-        business_id=business.id,
-        **image_data.model_dump()
+    # Insert the image only if the business exists, in a single statement
+    gallery_image = await db.scalar(
+        _insert_owned(BusinessGallery, _OWNER_BUSINESS, {"firebase_uid": firebase_uid}, image_data.model_dump())
     )
+    if gallery_image is None:
+        raise HTTPException(status_code=404, detail="Business not found")
     
-    db.add(gallery_image)
-    db.commit()
-    db.refresh(gallery_image)
+    await db.commit()
+    await invalidate_business_content(gallery_image.business_id)
     
-    return gallery_image
+    return json_response(BusinessGalleryResponse.model_validate(gallery_image))
 
 
 @router.get("/gallery", response_model=List[BusinessGalleryResponse])
 async def get_business_gallery(
+    request: Request,
     business_id: uuid.UUID = Query(..., description="Business ID"),
     active_only: bool = Query(True, description="Return only active images"),
-    db: Session = Depends(get_db)
+    cursor: Optional[uuid.UUID] = Query(None, description="ID of the last image already received"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Maximum number of images to return"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all gallery images for a business.
@@ -418,23 +753,29 @@ async def get_business_gallery(
     **Who uses it**: Clients viewing business profile, business owners managing gallery.
     
     **FlutterFlow**: Display in a gallery/carousel widget on business profile page.
-    """
-    query = db.query(BusinessGallery).filter(
-        BusinessGallery.business_id == business_id
-    )
     
-    if active_only:
-        query = query.filter(BusinessGallery.is_active == True)
-    
-    images = query.order_by(BusinessGallery.sort_order, BusinessGallery.created_at).all()
+    **Paging**: Pass limit, then the last image's ID as cursor to get the next images.
+    Send `Accept: application/x-ndjson` to receive one image per line as they are read.
     
-    return images
+    **Caching**: Send the ETag back in If-None-Match to get a 304 while the gallery is unchanged.
+    """
+    etag = await get_gallery_etag(db, business_id)
+    headers = {**_cache_headers(etag), "Vary": "Accept"} if etag else {}
+    if etag and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    response = _gallery_response(request, _gallery_stmt(business_id, active_only, cursor, limit))
+    response.headers.update(headers)
+    return response
 
 
 @router.get("/gallery/my", response_model=List[BusinessGalleryResponse])
 async def get_my_business_gallery(
+    request: Request,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    cursor: Optional[uuid.UUID] = Query(None, description="ID of the last image already received"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Maximum number of images to return"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get gallery images for the current business owner.
@@ -444,19 +785,70 @@ async def get_my_business_gallery(
     **Who uses it**: Business owners
     
     **FlutterFlow**: Display in business dashboard gallery management section.
-    """
-    business = db.query(Business).filter(
-        Business.firebase_uid == firebase_uid
-    ).first()
     
-    if not business:
+    **Paging**: Same cursor, limit and NDJSON options as the public gallery endpoint.
+    """
+    # Resolved before streaming starts, so a missing business is still a 404
+    business_id = await get_business_id(db, firebase_uid)
+    if not business_id:
         raise HTTPException(status_code=404, detail="Business not found")
     
-    images = db.query(BusinessGallery).filter(
-        BusinessGallery.business_id == business.id
-    ).order_by(BusinessGallery.sort_order, BusinessGallery.created_at).all()
+    return _gallery_response(request, _gallery_stmt(business_id, False, cursor, limit))
+
+
+@router.post("/gallery/reorder", response_model=List[BusinessGalleryResponse])
+async def reorder_business_gallery(
+    order: List[GalleryOrderItem],
+    firebase_uid: str = Query(..., description="Firebase UID from frontend"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Set the display order of several gallery images at once.
+    
+    **Purpose**: Save a drag-and-drop reorder of the gallery in one request instead of one PUT per image.
+    
+    **Who uses it**: Business owners
+    
+    **FlutterFlow**: Call once with every moved image's new sort_order when the owner finishes reordering.
+    
+    **Note**: Either every image is reordered or none is; unknown images return 404.
+    """
+    # One position per image; the last entry for an image wins
+    positions = {item.image_id: item.sort_order for item in order}
+    if not positions:
+        return []
+    
+    # Update every owned image from a VALUES list in a single statement
+    new_order = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("sort_order", Integer),
+        name="new_order"
+    ).data(list(positions.items()))
+    
+    images = (await db.scalars(
+        update(BusinessGallery)
+        .where(
+            BusinessGallery.id == new_order.c.id,
+            BusinessGallery.business_id == _OWNER_BUSINESS_ID.scalar_subquery()
+        )
+        .values(sort_order=new_order.c.sort_order)
+        .returning(BusinessGallery)
+        .execution_options(synchronize_session=False),
+        {"firebase_uid": firebase_uid},
+        execution_options={"populate_existing": True}
+    )).all()
+    
+    if len(images) != len(positions):
+        await db.rollback()
+        if not await get_business_id(db, firebase_uid):
+            raise HTTPException(status_code=404, detail="Business not found")
+        raise HTTPException(status_code=404, detail="Gallery image not found")
+    
+    await db.commit()
+    await invalidate_business_content(images[0].business_id)
     
-    return images
+    images.sort(key=lambda image: (image.sort_order, image.created_at))
+    return json_list_response(_BUSINESS_GALLERY_LIST_ADAPTER, images)
 
 
 @router.put("/gallery/{image_id}", response_model=BusinessGalleryResponse)
@@ -464,7 +856,7 @@ async def update_business_gallery_image(
     image_id: uuid.UUID,
     image_data: BusinessGalleryUpdate,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update gallery image details (title, description, order, etc.).
@@ -475,39 +867,28 @@ async def update_business_gallery_image(
     
     **FlutterFlow**: Edit form for each gallery image.
     """
-    # Get business
-    business = db.query(Business).filter(
-        Business.firebase_uid == firebase_uid
-    ).first()
-    
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Get image
-    image = db.query(BusinessGallery).filter(
-        BusinessGallery.id == image_id,
-        BusinessGallery.business_id == business.id
-    ).first()
-    
-    if not image:
-        raise HTTPException(status_code=404, detail="Gallery image not found")
-    
-    # Update image
-    update_dict = image_data.model_dump(exclude_unset=True)
-    for key, value in update_dict.items():
-        setattr(image, key, value)
+    # Update the image only if the business owns it, in a single statement
+    image = await _write_owned(
+        db,
+        update(BusinessGallery)
+        .where(*_OWNED_GALLERY_IMAGE)
+        .values(**image_data.model_dump(exclude_unset=True))
+        .returning(BusinessGallery),
+        {"image_id": image_id, "firebase_uid": firebase_uid},
+        "Gallery image not found"
+    )
     
-    db.commit()
-    db.refresh(image)
+    await db.commit()
+    await invalidate_business_content(image.business_id)
     
-    return image
+    return json_response(BusinessGalleryResponse.model_validate(image))
 
 
 @router.delete("/gallery/{image_id}")
 async def delete_business_gallery_image(
     image_id: uuid.UUID,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a gallery image.
@@ -520,25 +901,16 @@ async def delete_business_gallery_image(
     
     **Note**: This only deletes the database record. FlutterFlow should also delete the image from Firebase Storage.
     """
-    # Get business
-    business = db.query(Business).filter(
-        Business.firebase_uid == firebase_uid
-    ).first()
-    
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Get image
-    image = db.query(BusinessGallery).filter(
-        BusinessGallery.id == image_id,
-        BusinessGallery.business_id == business.id
-    ).first()
-    
-    if not image:
-        raise HTTPException(status_code=404, detail="Gallery image not found")
+    # Delete the image only if the business owns it, in a single statement
+    business_id = await _write_owned(
+        db,
+        _DELETE_GALLERY_IMAGE_STMT,
+        {"image_id": image_id, "firebase_uid": firebase_uid},
+        "Gallery image not found"
+    )
     
-    db.delete(image)
-    db.commit()
+    await db.commit()
+    await invalidate_business_content(business_id)
     
     return {"message": "Gallery image deleted successfully"}
 
@@ -552,7 +924,7 @@ async def add_service_gallery_image(
     service_id: uuid.UUID,
     image_data: ServiceGalleryCreate,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add an image to service gallery.
@@ -565,41 +937,27 @@ async def add_service_gallery_image(
     
     **Example image types**: before, after, in_progress, result, sample, etc.
     """
-    # Get business by Firebase UID
-    business = db.query(Business).filter(
-        Business.firebase_uid == firebase_uid
-    ).first()
-    
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Verify service belongs to business
-    service = db.query(Service).filter(
-        Service.id == service_id,
-        Service.business_id == business.id
-    ).first()
-    
-    if not service:
-        raise HTTPException(status_code=404, detail="Service not found")
-    
-    # Create gallery image
-    gallery_image = ServiceGallery(
-        service_id=service_id,
-        **image_data.model_dump()
+    # Insert the image only if the business owns the service, in a single statement
+    params = {"service_id": service_id, "firebase_uid": firebase_uid}
+    gallery_image = await _write_owned(
+        db,
+        _insert_owned(ServiceGallery, _OWNER_SERVICE, params, image_data.model_dump()),
+        params,
+        "Service not found"
     )
     
-    db.add(gallery_image)
-    db.commit()
-    db.refresh(gallery_image)
+    await db.commit()
+    await _invalidate_service_gallery(service_id)
     
-    return gallery_image
+    return json_response(ServiceGalleryResponse.model_validate(gallery_image))
 
 
 @router.get("/services/{service_id}/gallery", response_model=List[ServiceGalleryResponse])
 async def get_service_gallery(
+    request: Request,
     service_id: uuid.UUID,
     active_only: bool = Query(True, description="Return only active images"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all gallery images for a service.
@@ -609,22 +967,49 @@ async def get_service_gallery(
     **Who uses it**: Clients viewing service details, business owners managing service gallery.
     
     **FlutterFlow**: Display in a gallery/carousel widget on service detail page.
+    
+    Send `Accept: application/x-ndjson` to receive one image per line as they are read.
     """
+    headers = {"Vary": "Accept"}
+    ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    
+    # Galleries are read far more often than edited, so the serialized
+    # listing is cached and dropped whenever an image changes
+    cache_key = _service_gallery_key(service_id, active_only)
+    if not ndjson:
+        body = await cache_get_bytes(cache_key)
+        if body is not None:
+            return Response(body, media_type="application/json", headers=headers)
+    
     # Verify service exists
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.get(Service, service_id)
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
     
-    query = db.query(ServiceGallery).filter(
+    query = select(ServiceGallery).where(
         ServiceGallery.service_id == service_id
     )
     
     if active_only:
-        query = query.filter(ServiceGallery.is_active == True)
+        query = query.where(ServiceGallery.is_active == True)
+    
+    query = query.order_by(ServiceGallery.sort_order, ServiceGallery.created_at)
+    
+    # NDJSON is streamed from a server-side cursor, so memory stays flat
+    # however large the gallery grows
+    if ndjson:
+        return StreamingResponse(
+            _stream_rows(query, _SERVICE_GALLERY_ADAPTER, ndjson=True),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers
+        )
     
-    images = query.order_by(ServiceGallery.sort_order, ServiceGallery.created_at).all()
+    images = await db.scalars(query)
     
-    return images
+    response = json_list_response(_SERVICE_GALLERY_LIST_ADAPTER, images.all())
+    response.headers.update(headers)
+    await cache_set_bytes(cache_key, response.body, settings.RESPONSE_CACHE_TTL)
+    return response
 
 
 @router.put("/services/gallery/{image_id}", response_model=ServiceGalleryResponse)
@@ -632,7 +1017,7 @@ async def update_service_gallery_image(
     image_id: uuid.UUID,
     image_data: ServiceGalleryUpdate,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update service gallery image details (title, description, order, etc.).
@@ -643,39 +1028,28 @@ async def update_service_gallery_image(
     
     **FlutterFlow**: Edit form for each service gallery image.
     """
-    # Get business
-    business = db.query(Business).filter(
-        Business.firebase_uid == firebase_uid
-    ).first()
-    
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Get image and verify it belongs to a service owned by this business
-    image = db.query(ServiceGallery).join(Service).filter(
-        ServiceGallery.id == image_id,
-        Service.business_id == business.id
-    ).first()
-    
-    if not image:
-        raise HTTPException(status_code=404, detail="Service gallery image not found")
-    
-    # Update image
-    update_dict = image_data.model_dump(exclude_unset=True)
-    for key, value in update_dict.items():
-        setattr(image, key, value)
+    # Update the image only if it belongs to a service owned by this business
+    image = await _write_owned(
+        db,
+        update(ServiceGallery)
+        .where(*_OWNED_SERVICE_GALLERY_IMAGE)
+        .values(**image_data.model_dump(exclude_unset=True))
+        .returning(ServiceGallery),
+        {"image_id": image_id, "firebase_uid": firebase_uid},
+        "Service gallery image not found"
+    )
     
-    db.commit()
-    db.refresh(image)
+    await db.commit()
+    await _invalidate_service_gallery(image.service_id)
     
-    return image
+    return json_response(ServiceGalleryResponse.model_validate(image))
 
 
 @router.delete("/services/gallery/{image_id}")
 async def delete_service_gallery_image(
     image_id: uuid.UUID,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a service gallery image.
@@ -688,24 +1062,15 @@ async def delete_service_gallery_image(
     
     **Note**: This only deletes the database record. FlutterFlow should also delete the image from Firebase Storage.
     """
-    # Get business
-    business = db.query(Business).filter(
-        Business.firebase_uid == firebase_uid
-    ).first()
-    
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Get image and verify it belongs to a service owned by this business
-    image = db.query(ServiceGallery).join(Service).filter(
-        ServiceGallery.id == image_id,
-        Service.business_id == business.id
-    ).first()
-    
-    if not image:
-        raise HTTPException(status_code=404, detail="Service gallery image not found")
+    # Delete the image only if it belongs to a service owned by this business
+    service_id = await _write_owned(
+        db,
+        _DELETE_SERVICE_GALLERY_IMAGE_STMT,
+        {"image_id": image_id, "firebase_uid": firebase_uid},
+        "Service gallery image not found"
+    )
     
-    db.delete(image)
-    db.commit()
+    await db.commit()
+    await _invalidate_service_gallery(service_id)
     
     return {"message": "Service gallery image deleted successfully"}
\ No newline at end of file
@@ -7,157 +7,143 @@ Firebase UID is passed as parameter from frontend.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from sqlalchemy.sql import func
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, insert
 from typing import List, Optional
-from datetime import datetime
 import uuid
 
-from app.core.database import get_db
-from app.models.clients import Client
+from app.core.auth import invalidate_principal
+from app.core.cache import cache_delete, cache_get_bytes, cache_set_bytes
+from app.core.config import settings
+from app.core.database import get_async_db, safe_select
+from app.core.db_errors import raise_if_duplicate
+from app.core.responses import json_list_response, json_response
+from app.models.base import location_point
+from app.models.clients import CLIENT_NAME_SEARCH, Client
 from app.schemas.clients import ClientCreate, ClientUpdate, ClientResponse
 
 router = APIRouter()
 
+_CLIENT_LIST_ADAPTER = TypeAdapter(List[ClientResponse])
+
+_CLIENT_BY_UID_STMT = safe_select(Client).where(Client.firebase_uid == bindparam("firebase_uid"))
+_ACTIVE_CLIENT_BY_ID_STMT = safe_select(Client).where(Client.id == bindparam("client_id"), Client.is_active == True)
+
+# Unique indexes on clients and the error reported when a write collides with one
+_DUPLICATE_DETAILS = {
+    "ix_clients_firebase_uid": "Client with this Firebase UID already exists",
+    "ix_clients_email": "Email already registered",
+    "ix_clients_phone_number": "Phone number already registered",
+}
+
+
+async def _get_client(db: AsyncSession, firebase_uid: str) -> Client:
+    """
+    Load the client registered under a Firebase UID.
+    
+    Raises:
+        HTTPException: 404 if no client exists
+    """
+    client = await db.scalar(_CLIENT_BY_UID_STMT, {"firebase_uid": firebase_uid})
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return client
+
+
+def _client_key(client_id: uuid.UUID) -> str:
+    """Cache key of a serialized public client profile."""
+    return f"client:{client_id}"
+
+
+def _with_location(data: dict) -> dict:
+    """Replace latitude/longitude in client data with the stored geography point."""
+    latitude = data.pop("latitude", None)
+    longitude = data.pop("longitude", None)
+    if latitude is not None and longitude is not None:
+        data["location"] = location_point(latitude, longitude)
+    return data
+
 
 # Client Registration and Management
 @router.post("/register", response_model=ClientResponse)
 async def register_client(
     client_data: ClientCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Register a new client with Firebase UID."""
     
-    # Check if client already exists
-    existing_client = db.query(Client).filter(
-        Client.firebase_uid == client_data.firebase_uid
-    ).first()
-    
-    if existing_client:
-        raise HTTPException(
-            status_code=400,
-            detail="Client with this Firebase UID already exists"
-        )
-    
-    # Check if email already exists
-    existing_email = db.query(Client).filter(Client.email == client_data.email).first()
-    if existing_email:
-        raise HTTPException(
-            status_code=400,
-            detail="Email already registered"
-        )
-    
-    # Check if phone already exists (if provided)
-    if client_data.phone_number:
-        existing_phone = db.query(Client).filter(Client.phone_number == client_data.phone_number).first()
-        if existing_phone:
-            raise HTTPException(
-                status_code=400,
-                detail="Phone number already registered"
+    # Duplicate Firebase UIDs, emails and phone numbers are rejected by their
+    # unique indexes, so the INSERT is the only round trip
+    try:
+        db_client = await db.scalar(
+            insert(Client)
+            .values(
+                email_verified=False,  # Will be verified by Firebase on frontend
+                **_with_location(client_data.model_dump())
             )
+            .returning(Client)
+        )
+        await db.commit()
+    except IntegrityError as e:
+        await raise_if_duplicate(db, e, _DUPLICATE_DETAILS)
     
-    # Create new client
-    db_client = Client(
-        firebase_uid=client_data.firebase_uid,
-        email=client_data.email,
-        first_name=client_data.first_name,
-        last_name=client_data.last_name,
-        phone_number=client_data.phone_number,
-        date_of_birth=client_data.date_of_birth,
-        gender=client_data.gender,
-        address=client_data.address,
-        city=client_data.city,
-        state=client_data.state,
-        country=client_data.country,
-        postal_code=client_data.postal_code,
-        latitude=client_data.latitude,
-        longitude=client_data.longitude,
-        profile_image_url=client_data.profile_image_url,
-        fcm_token=client_data.fcm_token,
-        email_verified=False,  # Will be verified by Firebase on frontend
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
-    )
-    
-    db.add(db_client)
-    db.commit()
-    db.refresh(db_client)
+    await invalidate_principal(db_client.firebase_uid)
     
-    return db_client
+    return json_response(ClientResponse.model_validate(db_client))
 
 
 @router.get("/profile", response_model=ClientResponse)
 async def get_client_profile(
     firebase_uid: str = Query(..., description="Firebase UID of the client"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get client profile by Firebase UID."""
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    
-    if not client:
-        raise HTTPException(status_code=404, detail="Client not found")
+    client = await _get_client(db, firebase_uid)
     
-    return client
+    return json_response(ClientResponse.model_validate(client))
 
 
 @router.put("/profile", response_model=ClientResponse)
 async def update_client_profile(
     client_update: ClientUpdate,
     firebase_uid: str = Query(..., description="Firebase UID of the client"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update client profile."""
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
+    client = await _get_client(db, firebase_uid)
     
-    if not client:
-        raise HTTPException(status_code=404, detail="Client not found")
-    
-    # Update client fields
-    update_data = client_update.model_dump(exclude_unset=True)
-    
-    # Check for email conflicts if email is being updated
-    if "email" in update_data and update_data["email"] != client.email:
-        existing_email = db.query(Client).filter(
-            Client.email == update_data["email"],
-            Client.id != client.id
-        ).first()
-        if existing_email:
-            raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Check for phone conflicts if phone is being updated
-    if "phone_number" in update_data and update_data["phone_number"] != client.phone_number:
-        existing_phone = db.query(Client).filter(
-            Client.phone_number == update_data["phone_number"],
-            Client.id != client.id
-        ).first()
-        if existing_phone:
-            raise HTTPException(status_code=400, detail="Phone number already registered")
+    # Update client fields; coordinates are stored as a single geography point
+    update_data = _with_location(client_update.model_dump(exclude_unset=True))
     
     # Apply updates
     for field, value in update_data.items():
         setattr(client, field, value)
     
-    client.updated_at = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(client)
+    # Conflicting emails and phone numbers are rejected by their unique indexes
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await raise_if_duplicate(db, e, _DUPLICATE_DETAILS)
+    await cache_delete(_client_key(client.id))
     
-    return client
+    return json_response(ClientResponse.model_validate(client))
 
 
 @router.delete("/profile")
 async def delete_client_profile(
     firebase_uid: str = Query(..., description="Firebase UID of the client"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete client profile."""
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
+    client = await _get_client(db, firebase_uid)
     
-    if not client:
-        raise HTTPException(status_code=404, detail="Client not found")
-    
-    db.delete(client)
-    db.commit()
+    await db.delete(client)
+    await db.commit()
+    await invalidate_principal(firebase_uid)
+    await cache_delete(_client_key(client.id))
     
     return {"message": "Client profile deleted successfully"}
 
@@ -166,18 +152,14 @@ async def delete_client_profile(
 async def update_fcm_token(
     fcm_token: str,
     firebase_uid: str = Query(..., description="Firebase UID of the client"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update FCM token for push notifications."""
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    
-    if not client:
-        raise HTTPException(status_code=404, detail="Client not found")
+    client = await _get_client(db, firebase_uid)
     
     client.fcm_token = fcm_token
-    client.updated_at = datetime.utcnow()
     
-    db.commit()
+    await db.commit()
     
     return {"message": "FCM token updated successfully"}
 
@@ -188,32 +170,41 @@ async def search_clients(
     query: str = Query(..., min_length=2, description="Search query"),
     limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
     skip: int = Query(0, ge=0, description="Number of results to skip"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search clients by name or email (public endpoint for businesses)."""
     
-    search_filter = func.lower(func.concat(Client.first_name, " ", Client.last_name)).contains(query.lower())
+    # Substring match on the trigram-indexed full name
+    search_filter = CLIENT_NAME_SEARCH.contains(query.lower(), autoescape=True)
     
-    clients = db.query(Client).filter(
-        search_filter,
-        Client.is_active == True
-    ).offset(skip).limit(limit).all()
+    clients = await db.scalars(
+        safe_select(Client)
+        .where(search_filter, Client.is_active == True)
+        .offset(skip)
+        .limit(limit)
+    )
     
-    return clients
+    return json_list_response(_CLIENT_LIST_ADAPTER, clients.all())
 
 
 @router.get("/{client_id}", response_model=ClientResponse)
 async def get_client_by_id(
     client_id: uuid.UUID = Path(..., description="Client ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get client by ID (public endpoint for businesses)."""
-    client = db.query(Client).filter(
-        Client.id == client_id,
-        Client.is_active == True
-    ).first()
+    # Businesses look the same clients up repeatedly, so the serialized
+    # profile is cached briefly and dropped when the client edits it
+    cache_key = _client_key(client_id)
+    body = await cache_get_bytes(cache_key)
+    if body is not None:
+        return Response(body, media_type="application/json")
+    
+    client = await db.scalar(_ACTIVE_CLIENT_BY_ID_STMT, {"client_id": client_id})
     
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     
-    return client
\ No newline at end of file
+    response = json_response(ClientResponse.model_validate(client))
+    await cache_set_bytes(cache_key, response.body, settings.RESPONSE_CACHE_TTL)
+    return response
\ No newline at end of file
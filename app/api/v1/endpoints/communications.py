@@ -9,16 +9,24 @@ Firebase UID is passed as parameter from frontend.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
-from typing import List, Optional
+from pydantic import TypeAdapter
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+from sqlalchemy import Integer, and_, or_, func, desc, bindparam, case, exists, insert, literal, select, tuple_, update
+from typing import List, Optional, Tuple
 from datetime import datetime
 import uuid
 
-from app.core.database import get_db
+from app.core.auth import Principal, PrincipalKind, get_cached_principal
+from app.core.cache import cache_get, cache_set
+from app.core.config import settings
+from app.core.database import get_async_db, safe_select
+from app.core.responses import json_data_response, json_list_response, json_response
 from app.models.communications import ChatRoom, ChatMessage, MessageType
-from app.models.clients import Client
 from app.models.businesses import Business
+from app.models.clients import Client
 from app.schemas.communications import (
     ChatRoomResponse, 
     ChatMessageResponse, 
@@ -28,11 +36,237 @@ from app.schemas.communications import (
 
 router = APIRouter()
 
+_CHAT_ROOM_LIST_ADAPTER = TypeAdapter(List[ChatRoomResponse])
+_CHAT_MESSAGE_LIST_ADAPTER = TypeAdapter(List[ChatMessageResponse])
+
+# Rooms are serialized with their latest message and its sender's name, so
+# the participants and that one message are loaded up front, in a fixed
+# number of queries however many rooms there are; async sessions can't
+# lazy load them during serialization
+_ROOM_OPTIONS = (
+    joinedload(ChatRoom.client),
+    joinedload(ChatRoom.business),
+    selectinload(ChatRoom.last_message),
+)
+
+# A room with its participants (message senders are named from them) and
+# which side of the room the caller is on, in a single row
+_ROOM_ACCESS_STMT = (
+    safe_select(
+        ChatRoom,
+        (Client.firebase_uid == bindparam("firebase_uid")).label("is_client"),
+        (Business.firebase_uid == bindparam("firebase_uid")).label("is_business")
+    )
+    .join(ChatRoom.client)
+    .join(ChatRoom.business)
+    .options(contains_eager(ChatRoom.client), contains_eager(ChatRoom.business))
+    .where(ChatRoom.id == bindparam("room_id"))
+)
+_ROOM_ACCESS_WITH_MESSAGES_STMT = _ROOM_ACCESS_STMT.options(selectinload(ChatRoom.messages))
+
+# A participant's rooms, for each side of the conversation
+_CLIENT_ROOMS_STMT = (
+    safe_select(ChatRoom).options(*_ROOM_OPTIONS).where(ChatRoom.client_id == bindparam("participant_id"))
+)
+_BUSINESS_ROOMS_STMT = (
+    safe_select(ChatRoom).options(*_ROOM_OPTIONS).where(ChatRoom.business_id == bindparam("participant_id"))
+)
+
+# Message pages of a room: newest first from the (room, created_at, id)
+# index, optionally before a created_at or (created_at, id) cursor, or
+# oldest first by legacy offset
+_ROOM_MESSAGES = safe_select(ChatMessage).where(ChatMessage.chat_room_id == bindparam("room_id"))
+_NEWEST_FIRST = (ChatMessage.created_at.desc(), ChatMessage.id.desc())
+_LATEST_MESSAGES_STMT = _ROOM_MESSAGES.order_by(*_NEWEST_FIRST).limit(bindparam("limit", type_=Integer))
+_MESSAGES_BEFORE_STMT = (
+    _ROOM_MESSAGES
+    .where(ChatMessage.created_at < bindparam("before"))
+    .order_by(*_NEWEST_FIRST)
+    .limit(bindparam("limit", type_=Integer))
+)
+_MESSAGES_BEFORE_ID_STMT = (
+    _ROOM_MESSAGES
+    .where(
+        tuple_(ChatMessage.created_at, ChatMessage.id) < tuple_(
+            bindparam("before", type_=ChatMessage.created_at.type),
+            bindparam("before_id", type_=ChatMessage.id.type)
+        )
+    )
+    .order_by(*_NEWEST_FIRST)
+    .limit(bindparam("limit", type_=Integer))
+)
+_MESSAGES_BY_OFFSET_STMT = (
+    _ROOM_MESSAGES.order_by(ChatMessage.created_at).offset(bindparam("skip", type_=Integer)).limit(bindparam("limit", type_=Integer))
+)
+_ROOM_MESSAGE_EXISTS_STMT = select(
+    exists().where(ChatMessage.id == bindparam("message_id"), ChatMessage.chat_room_id == bindparam("room_id"))
+)
+
+
+def _mark_message_read_stmt(read_flag, read_at, unread_count):
+    """
+    Build the statement marking a message read for one side of a room.
+    
+    The message flag is set in a CTE only if it wasn't already, and the
+    room's unread count is decremented in the same statement, floored at
+    zero in SQL so concurrent readers can't race it below zero or count a
+    message twice. Returns the room's ID if the message was newly read.
+    """
+    message_read = (
+        update(ChatMessage)
+        .where(
+            ChatMessage.id == bindparam("message_id"),
+            ChatMessage.chat_room_id == bindparam("room_id"),
+            read_flag == False
+        )
+        .values({read_flag: True, read_at: func.now()})
+        .returning(ChatMessage.chat_room_id)
+        .cte("message_read")
+    )
+    return (
+        update(ChatRoom)
+        .where(ChatRoom.id == message_read.c.chat_room_id)
+        .values({unread_count: func.greatest(unread_count - 1, 0)})
+        .returning(ChatRoom.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+_MARK_READ_BY_CLIENT_STMT = _mark_message_read_stmt(
+    ChatMessage.read_by_client, ChatMessage.read_at_client, ChatRoom.client_unread_count
+)
+_MARK_READ_BY_BUSINESS_STMT = _mark_message_read_stmt(
+    ChatMessage.read_by_business, ChatMessage.read_at_business, ChatRoom.business_unread_count
+)
+
+# Messages are serialized with their sender's name, read from the room's participants
+_MESSAGE_SENDER = selectinload(ChatMessage.chat_room).options(
+    joinedload(ChatRoom.client), joinedload(ChatRoom.business)
+)
+
+# A room's participants never change once it is created, so they are cached
+_ROOM_MEMBERS_STMT = select(ChatRoom.client_id, ChatRoom.business_id).where(ChatRoom.id == bindparam("room_id"))
+
+# PostgreSQL error code for a foreign key violation
+FOREIGN_KEY_VIOLATION = "23503"
+
+# Create the caller's room with a business, or return the one they already
+# have, in a single statement: the client is resolved by the INSERT's
+# SELECT, so an unknown client inserts and returns nothing, and the no-op
+# update makes RETURNING yield an existing row on conflict. An unknown
+# business fails the foreign key.
+_insert_room = pg_insert(ChatRoom).from_select(
+    ["client_id", "business_id"],
+    select(Client.id, bindparam("business_id", type_=ChatRoom.business_id.type))
+    .where(Client.firebase_uid == bindparam("firebase_uid"))
+)
+_UPSERT_ROOM_STMT = (
+    select(ChatRoom)
+    .from_statement(
+        _insert_room.on_conflict_do_update(
+            constraint="uq_chat_rooms_client_business",
+            set_={"client_id": _insert_room.excluded.client_id}
+        ).returning(ChatRoom)
+    )
+    .options(
+        selectinload(ChatRoom.client),
+        selectinload(ChatRoom.business),
+        selectinload(ChatRoom.last_message)
+    )
+)
+
+
+async def _get_principal(db: AsyncSession, firebase_uid: str) -> Principal:
+    """
+    Resolve the caller's client or business profile, from Redis when warm.
+    
+    Raises:
+        HTTPException: 404 if no profile exists
+    """
+    principal = await get_cached_principal(db, firebase_uid)
+    if not principal:
+        raise HTTPException(status_code=404, detail="User profile not found")
+    return principal
+
+
+async def _get_room_access(
+    db: AsyncSession,
+    room_id: uuid.UUID,
+    firebase_uid: str,
+    detail: str = "Access denied to chat room",
+    stmt=_ROOM_ACCESS_STMT
+) -> Tuple[ChatRoom, bool]:
+    """
+    Load a chat room and check that the caller takes part in it, in one query.
+    
+    Returns:
+        Tuple[ChatRoom, bool]: The room, and True if the caller is its client or False if its business
+        
+    Raises:
+        HTTPException: 404 if the room doesn't exist, 403 if the caller is not a participant
+    """
+    row = (await db.execute(stmt, {"room_id": room_id, "firebase_uid": firebase_uid})).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Chat room not found")
+    
+    room, is_client, is_business = row
+    if is_client:
+        return room, True
+    if is_business:
+        return room, False
+    raise HTTPException(status_code=403, detail=detail)
+
+
+def _room_members_key(room_id: uuid.UUID) -> str:
+    """Cache key for the client and business IDs of a chat room."""
+    return f"chat_room_members:{room_id}"
+
+
+async def _get_room_side(
+    db: AsyncSession,
+    room_id: uuid.UUID,
+    firebase_uid: str,
+    detail: str = "Access denied to chat room"
+) -> bool:
+    """
+    Check that the caller takes part in a chat room, without loading it.
+    
+    The caller's principal and the room's participants both come from
+    Redis when warm, so repeated calls for the same room skip the database.
+    A caller whose principal doesn't match (e.g. a UID registered as both a
+    client and a business, writing as the business) falls back to the
+    joined access query.
+    
+    Returns:
+        bool: True if the caller is the room's client, False if its business
+        
+    Raises:
+        HTTPException: 404 if the room doesn't exist, 403 if the caller is not a participant
+    """
+    cache_key = _room_members_key(room_id)
+    members = await cache_get(cache_key)
+    if members is None:
+        row = (await db.execute(_ROOM_MEMBERS_STMT, {"room_id": room_id})).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Chat room not found")
+        members = {"client_id": str(row.client_id), "business_id": str(row.business_id)}
+        await cache_set(cache_key, members, settings.CHAT_ROOM_CACHE_TTL)
+    
+    principal = await get_cached_principal(db, firebase_uid)
+    if principal:
+        if principal.kind == PrincipalKind.CLIENT and str(principal.id) == members["client_id"]:
+            return True
+        if principal.kind == PrincipalKind.BUSINESS and str(principal.id) == members["business_id"]:
+            return False
+    
+    _, is_client = await _get_room_access(db, room_id, firebase_uid, detail)
+    return is_client
+
 
 @router.get("/chat-rooms", response_model=List[ChatRoomResponse])
 async def get_chat_rooms(
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all chat rooms for current user.
@@ -40,66 +274,62 @@ async def get_chat_rooms(
     Returns list of chat rooms for client or business based on their Firebase UID.
     """
     # Check if user is client or business
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
+    principal = await _get_principal(db, firebase_uid)
     
-    if client:
-        rooms = db.query(ChatRoom).filter(ChatRoom.client_id == client.id).all()
-    elif business:
-        rooms = db.query(ChatRoom).filter(ChatRoom.business_id == business.id).all()
-    else:
-        raise HTTPException(status_code=404, detail="User profile not found")
+    stmt = _CLIENT_ROOMS_STMT if principal.kind == PrincipalKind.CLIENT else _BUSINESS_ROOMS_STMT
+    rooms = await db.scalars(stmt, {"participant_id": principal.id})
     
-    return rooms
+    return json_list_response(_CHAT_ROOM_LIST_ADAPTER, rooms.all())
 
 
 @router.get("/chat-rooms/{room_id}/messages", response_model=List[ChatMessageResponse])
 async def get_chat_messages(
     room_id: uuid.UUID,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    before: Optional[datetime] = Query(None, description="created_at of the oldest message already received"),
+    before_id: Optional[uuid.UUID] = Query(None, description="ID of the oldest message already received, with before"),
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset from the oldest message; use before instead"),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get messages for a chat room.
     
-    Returns paginated list of messages in a specific chat room.
+    Returns the latest limit messages, oldest first. To load older history,
+    pass the created_at of the first message received as before, and its ID
+    as before_id so messages sharing that timestamp aren't skipped; each
+    page is read straight off the (room, created_at, id) index however long
+    the conversation is.
     """
-    room = db.query(ChatRoom).filter(ChatRoom.id == room_id).first()
-    if not room:
-        raise HTTPException(status_code=404, detail="Chat room not found")
+    # Verify the room exists and the user has access to it; this also loads
+    # the participants that messages' sender names are read from
+    await _get_room_access(db, room_id, firebase_uid)
     
-    # Verify user has access to this room
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
-    has_access = False
-    if client and room.client_id == client.id:
-        has_access = True
-    elif business and room.business_id == business.id:
-        has_access = True
-    
-    if not has_access:
-        raise HTTPException(status_code=403, detail="Access denied to chat room")
-    
-    messages = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.chat_room_id == room_id)
-        .order_by(ChatMessage.created_at)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    params = {"room_id": room_id, "limit": limit}
+    
+    if skip and before is None:
+        # Legacy offset paging from the start of the conversation
+        messages = await db.scalars(_MESSAGES_BY_OFFSET_STMT, {**params, "skip": skip})
+        return json_list_response(_CHAT_MESSAGE_LIST_ADAPTER, messages.all())
+    
+    if before is not None and before_id is not None:
+        messages = await db.scalars(_MESSAGES_BEFORE_ID_STMT, {**params, "before": before, "before_id": before_id})
+    elif before is not None:
+        messages = await db.scalars(_MESSAGES_BEFORE_STMT, {**params, "before": before})
+    else:
+        messages = await db.scalars(_LATEST_MESSAGES_STMT, params)
+    
+    messages = messages.all()
+    messages.reverse()
     
-    return messages
+    return json_list_response(_CHAT_MESSAGE_LIST_ADAPTER, messages)
 
 
 @router.post("/chat-rooms", response_model=ChatRoomResponse)
 async def create_chat_room(
     room_data: ChatRoomCreate,
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create or get existing chat room between client and business.
@@ -107,40 +337,25 @@ async def create_chat_room(
     If a chat room already exists between the client and business,
     returns the existing room. Otherwise creates a new one.
     """
-    # Get current client
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
-    
-    # Verify business exists
-    business = db.query(Business).filter(Business.id == room_data.business_id).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
-    # Check if chat room already exists
-    existing_room = (
-        db.query(ChatRoom)
-        .filter(
-            ChatRoom.client_id == client.id,
-            ChatRoom.business_id == room_data.business_id
+    # Resolve the client and create the room unless they already have one
+    # with this business, in one round trip
+    try:
+        chat_room = await db.scalar(
+            _UPSERT_ROOM_STMT,
+            {"firebase_uid": firebase_uid, "business_id": room_data.business_id}
         )
-        .first()
-    )
+    except IntegrityError as e:
+        await db.rollback()
+        if getattr(e.orig, "pgcode", None) == FOREIGN_KEY_VIOLATION:
+            raise HTTPException(status_code=404, detail="Business not found")
+        raise
     
-    if existing_room:
-        return existing_room
-    
-    # Create new chat room
-    chat_room = ChatRoom(
-        client_id=client.id,
-        business_id=room_data.business_id
-    )
+    if not chat_room:
+        raise HTTPException(status_code=404, detail="Client profile not found")
     
-    db.add(chat_room)
-    db.commit()
-    db.refresh(chat_room)
+    await db.commit()
     
-    return chat_room
+    return json_response(ChatRoomResponse.model_validate(chat_room))
 
 
 @router.post("/chat-rooms/{room_id}/messages", response_model=ChatMessageResponse)
@@ -148,57 +363,70 @@ async def send_message(
     room_id: uuid.UUID,
     message_data: ChatMessageCreate,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Send a message in a chat room.
     
     Creates a new message in the specified chat room from the authenticated user.
     """
-    # Verify chat room exists
-    room = db.query(ChatRoom).filter(ChatRoom.id == room_id).first()
-    if not room:
-        raise HTTPException(status_code=404, detail="Chat room not found")
-    
-    # Check if user has access to this room
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
-    is_from_client = False
-    
-    if client and room.client_id == client.id:
-        is_from_client = True
-    elif business and room.business_id == business.id:
-        is_from_client = False
-    else:
-        raise HTTPException(status_code=403, detail="Access denied to chat room")
-    
-    # Create message
-    message = ChatMessage(
-        chat_room_id=room_id,
-        sender_firebase_uid=firebase_uid,
-        is_from_client=is_from_client,
-        message_type=message_data.message_type or MessageType.TEXT,
-        content=message_data.content,
-        file_url=message_data.file_url,
-        file_name=message_data.file_name
+    values = {
+        "sender_firebase_uid": firebase_uid,
+        "message_type": message_data.message_type or MessageType.TEXT,
+        "content": message_data.content,
+        "file_url": message_data.file_url,
+        "file_name": message_data.file_name
+    }
+    columns = ChatMessage.__table__.c
+    
+    # The caller's side of the room, from their profile IDs
+    caller_client_id = select(Client.id).where(Client.firebase_uid == firebase_uid).scalar_subquery()
+    caller_business_id = select(Business.id).where(Business.firebase_uid == firebase_uid).scalar_subquery()
+    from_client = func.coalesce(ChatRoom.client_id == caller_client_id, False)
+    
+    # Check access, bump the room's last message time and the recipient's
+    # unread count in a CTE that the message INSERT selects from, so all
+    # writes take a single round trip; only the participants named in the
+    # response are loaded after it. Values are bound into the statement,
+    # since the ORM treats parameters passed to an INSERT at execution as
+    # rows.
+    room_update = (
+        update(ChatRoom)
+        .where(
+            ChatRoom.id == room_id,
+            or_(ChatRoom.client_id == caller_client_id, ChatRoom.business_id == caller_business_id)
+        )
+        .values(
+            last_message_at=func.now(),
+            client_unread_count=ChatRoom.client_unread_count + case((from_client, 0), else_=1),
+            business_unread_count=ChatRoom.business_unread_count + case((from_client, 1), else_=0)
+        )
+        .returning(ChatRoom.id.label("chat_room_id"), from_client.label("is_from_client"))
+        .cte("room_update")
+    )
+    message = await db.scalar(
+        select(ChatMessage)
+        .from_statement(
+            insert(ChatMessage).from_select(
+                ["chat_room_id", "is_from_client", *values],
+                select(room_update.c.chat_room_id, room_update.c.is_from_client).add_columns(
+                    *(literal(value, columns[name].type) for name, value in values.items())
+                )
+            ).returning(ChatMessage)
+        )
+        .options(_MESSAGE_SENDER)
     )
     
-    db.add(message)
-    
-    # Update room's last message timestamp
-    room.last_message_at = func.now()
-    
-    # Update unread counts
-    if is_from_client:
-        room.business_unread_count = (room.business_unread_count or 0) + 1
-    else:
-        room.client_unread_count = (room.client_unread_count or 0) + 1
+    if not message:
+        # Nothing was written; find out whether the room is missing or the
+        # caller isn't part of it
+        await db.rollback()
+        await _get_room_access(db, room_id, firebase_uid)
+        raise HTTPException(status_code=404, detail="Chat room not found")
     
-    db.commit()
-    db.refresh(message)
+    await db.commit()
     
-    return message
+    return json_response(ChatMessageResponse.model_validate(message))
 
 
 @router.put("/chat-rooms/{room_id}/messages/{message_id}/read")
@@ -206,76 +434,51 @@ async def mark_message_as_read(
     room_id: uuid.UUID,
     message_id: uuid.UUID,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark a message as read.
     
     Updates the read status of a message for the authenticated user.
     """
-    # Verify access to room and message
-    room = db.query(ChatRoom).filter(ChatRoom.id == room_id).first()
-    if not room:
-        raise HTTPException(status_code=404, detail="Chat room not found")
+    # Verify access to room
+    is_client = await _get_room_side(db, room_id, firebase_uid, "Access denied")
     
-    message = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.id == message_id, ChatMessage.chat_room_id == room_id)
-        .first()
-    )
-    if not message:
-        raise HTTPException(status_code=404, detail="Message not found")
-    
-    # Check user access and update read status
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
-    if client and room.client_id == client.id:
-        message.read_by_client = True
-        message.read_at_client = func.now()
-        # Decrease unread count
-        if room.client_unread_count > 0:
-            room.client_unread_count -= 1
-    elif business and room.business_id == business.id:
-        message.read_by_business = True
-        message.read_at_business = func.now()
-        # Decrease unread count
-        if room.business_unread_count > 0:
-            room.business_unread_count -= 1
-    else:
-        raise HTTPException(status_code=403, detail="Access denied")
+    # Flag the message and decrement the unread count for the user's side
+    # in one atomic statement
+    stmt = _MARK_READ_BY_CLIENT_STMT if is_client else _MARK_READ_BY_BUSINESS_STMT
+    params = {"message_id": message_id, "room_id": room_id}
     
-    db.commit()
+    if not await db.scalar(stmt, params):
+        # Nothing changed: the message is missing or was already read
+        if not await db.scalar(_ROOM_MESSAGE_EXISTS_STMT, params):
+            raise HTTPException(status_code=404, detail="Message not found")
     
-    return {"status": "success", "message": "Message marked as read"}
+    await db.commit()
+    
+    return json_data_response({"status": "success", "message": "Message marked as read"})
 
 
 @router.put("/chat-rooms/{room_id}/mark-all-read")
 async def mark_all_messages_read(
     room_id: uuid.UUID,
     firebase_uid: str = Query(..., description="Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark all messages in a chat room as read.
     
     Updates all unread messages in the room for the authenticated user.
     """
-    room = db.query(ChatRoom).filter(ChatRoom.id == room_id).first()
-    if not room:
-        raise HTTPException(status_code=404, detail="Chat room not found")
-    
-    # Check user access
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
+    room, is_client = await _get_room_access(
+        db, room_id, firebase_uid, "Access denied", _ROOM_ACCESS_WITH_MESSAGES_STMT
+    )
     
-    if client and room.client_id == client.id:
+    if is_client:
         room.mark_read_by_client()
-    elif business and room.business_id == business.id:
-        room.mark_read_by_business()
     else:
-        raise HTTPException(status_code=403, detail="Access denied")
+        room.mark_read_by_business()
     
-    db.commit()
+    await db.commit()
     
-    return {"status": "success", "message": "All messages marked as read"}
+    return json_data_response({"status": "success", "message": "All messages marked as read"})
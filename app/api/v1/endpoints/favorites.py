@@ -9,15 +9,17 @@ Firebase UID is passed as parameter from frontend.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import bindparam, desc, exists, func, select
 from typing import List, Optional
-from datetime import datetime
 import uuid
 
-from app.core.database import get_db
+from app.core.auth import get_client_id
+from app.core.database import get_async_db
+from app.core.responses import json_list_response, json_response
 from app.models.favorites import FavoriteBusiness, BusinessCollection, BusinessCollectionItem
-from app.models.clients import Client
 from app.models.businesses import Business
 from app.schemas.favorites import (
     FavoriteBusinessCreate, FavoriteBusinessUpdate, FavoriteBusinessResponse,
@@ -28,6 +30,53 @@ from app.schemas.favorites import (
 
 router = APIRouter()
 
+_COLLECTION_LIST_ADAPTER = TypeAdapter(List[BusinessCollectionResponse])
+
+# Hot statements are built once; requests only bind values
+_BUSINESS_EXISTS_STMT = select(exists().where(Business.id == bindparam("business_id")))
+_OWNED_FAVORITE_STMT = select(FavoriteBusiness).where(
+    FavoriteBusiness.id == bindparam("favorite_id"),
+    FavoriteBusiness.client_id == bindparam("client_id")
+)
+_OWNED_COLLECTION_STMT = select(BusinessCollection).where(
+    BusinessCollection.id == bindparam("collection_id"),
+    BusinessCollection.client_id == bindparam("client_id")
+)
+_COLLECTION_ITEM_STMT = select(BusinessCollectionItem).where(
+    BusinessCollectionItem.id == bindparam("item_id"),
+    BusinessCollectionItem.collection_id == bindparam("collection_id")
+)
+
+
+async def _get_client_id(db: AsyncSession, firebase_uid: str) -> uuid.UUID:
+    """
+    Look up the ID of the client registered under a Firebase UID, from the
+    Redis-cached principal when warm.
+    
+    Raises:
+        HTTPException: 404 if the client doesn't exist
+    """
+    client_id = await get_client_id(db, firebase_uid)
+    if not client_id:
+        raise HTTPException(status_code=404, detail="Client profile not found")
+    return client_id
+
+
+async def _get_owned_collection(
+    db: AsyncSession, collection_id: uuid.UUID, firebase_uid: str, statement=_OWNED_COLLECTION_STMT
+) -> BusinessCollection:
+    """
+    Load a collection owned by the client with the given Firebase UID.
+    
+    Raises:
+        HTTPException: 404 if the client or the collection doesn't exist
+    """
+    client_id = await _get_client_id(db, firebase_uid)
+    collection = await db.scalar(statement, {"collection_id": collection_id, "client_id": client_id})
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    return collection
+
 
 # Favorite Businesses
 @router.get("/", response_model=FavoriteBusinessListResponse)
@@ -35,69 +84,76 @@ async def get_favorite_businesses(
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all favorite businesses for the current client.
     Client only.
     """
     # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
+    client_id = await _get_client_id(db, firebase_uid)
     
     # Get favorites
-    query = db.query(FavoriteBusiness).filter(FavoriteBusiness.client_id == client.id)
-    
-    total = query.count()
+    query = select(FavoriteBusiness).where(FavoriteBusiness.client_id == client_id)
     
-    favorites = (
-        query.order_by(desc(FavoriteBusiness.created_at))
+    # Fetch the page and the total count together with COUNT(*) OVER ()
+    result = await db.execute(
+        query.add_columns(func.count().over().label("total"))
+        .order_by(desc(FavoriteBusiness.created_at))
         .offset(skip)
         .limit(limit)
-        .all()
     )
-    
-    return FavoriteBusinessListResponse(
+    rows = result.all()
+    favorites = [FavoriteBusinessResponse.model_validate(row.FavoriteBusiness) for row in rows]
+    
+    if rows:
+        total = rows[0].total
+    elif skip:
+        # Page is past the end, so the window count is unavailable
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    else:
+        total = 0
+    
+    # Items are validated above, so the envelope is built without revalidating them
+    return json_response(FavoriteBusinessListResponse.model_construct(
         favorites=favorites,
         total=total,
         skip=skip,
         limit=limit
-    )
+    ))
 
 
 @router.post("/", response_model=FavoriteBusinessResponse)
 async def add_favorite_business(
     favorite_data: FavoriteBusinessCreate,
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add a business to favorites.
     Client only.
     """
     # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
+    client_id = await _get_client_id(db, firebase_uid)
     
     # Verify business exists
-    business = db.query(Business).filter(Business.id == favorite_data.business_id).first()
-    if not business:
+    if not await db.scalar(_BUSINESS_EXISTS_STMT, {"business_id": favorite_data.business_id}):
         raise HTTPException(status_code=404, detail="Business not found")
     
     # Check if already favorited
-    existing_favorite = db.query(FavoriteBusiness).filter(
-        FavoriteBusiness.client_id == client.id,
-        FavoriteBusiness.business_id == favorite_data.business_id
-    ).first()
+    already_favorited = await db.scalar(
+        select(exists().where(
+            FavoriteBusiness.client_id == client_id,
+            FavoriteBusiness.business_id == favorite_data.business_id
+        ))
+    )
     
-    if existing_favorite:
+    if already_favorited:
         raise HTTPException(status_code=400, detail="Business already in favorites")
     
     # Create favorite
     favorite = FavoriteBusiness(
-        client_id=client.id,
+        client_id=client_id,
         business_id=favorite_data.business_id,
         notes=favorite_data.notes,
         notify_on_availability=favorite_data.notify_on_availability,
@@ -105,10 +161,9 @@ async def add_favorite_business(
     )
     
     db.add(favorite)
-    db.commit()
-    db.refresh(favorite)
+    await db.commit()
     
-    return favorite
+    return json_response(FavoriteBusinessResponse.model_validate(favorite))
 
 
 @router.put("/{favorite_id}", response_model=FavoriteBusinessResponse)
@@ -116,22 +171,17 @@ async def update_favorite_business(
     favorite_id: uuid.UUID,
     favorite_update: FavoriteBusinessUpdate,
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update favorite business settings.
     Client only.
     """
     # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
+    client_id = await _get_client_id(db, firebase_uid)
     
     # Get favorite
-    favorite = db.query(FavoriteBusiness).filter(
-        FavoriteBusiness.id == favorite_id,
-        FavoriteBusiness.client_id == client.id
-    ).first()
+    favorite = await db.scalar(_OWNED_FAVORITE_STMT, {"favorite_id": favorite_id, "client_id": client_id})
     
     if not favorite:
         raise HTTPException(status_code=404, detail="Favorite not found")
@@ -141,39 +191,32 @@ async def update_favorite_business(
     for field, value in update_data.items():
         setattr(favorite, field, value)
     
-    favorite.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(favorite)
+    await db.commit()
     
-    return favorite
+    return json_response(FavoriteBusinessResponse.model_validate(favorite))
 
 
 @router.delete("/{favorite_id}")
 async def remove_favorite_business(
     favorite_id: uuid.UUID,
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove a business from favorites.
     Client only.
     """
     # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
+    client_id = await _get_client_id(db, firebase_uid)
     
     # Get and delete favorite
-    favorite = db.query(FavoriteBusiness).filter(
-        FavoriteBusiness.id == favorite_id,
-        FavoriteBusiness.client_id == client.id
-    ).first()
+    favorite = await db.scalar(_OWNED_FAVORITE_STMT, {"favorite_id": favorite_id, "client_id": client_id})
     
     if not favorite:
         raise HTTPException(status_code=404, detail="Favorite not found")
     
-    db.delete(favorite)
-    db.commit()
+    await db.delete(favorite)
+    await db.commit()
     
     return {"message": "Business removed from favorites"}
 
@@ -182,92 +225,74 @@ async def remove_favorite_business(
 @router.get("/collections", response_model=List[BusinessCollectionResponse])
 async def get_collections(
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all business collections for the current client.
     Client only.
     """
     # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
+    client_id = await _get_client_id(db, firebase_uid)
     
     # Get collections
-    collections = (
-        db.query(BusinessCollection)
-        .filter(BusinessCollection.client_id == client.id)
+    collections = await db.scalars(
+        select(BusinessCollection)
+        .where(BusinessCollection.client_id == client_id)
         .order_by(desc(BusinessCollection.created_at))
-        .all()
     )
     
-    return collections
+    return json_list_response(_COLLECTION_LIST_ADAPTER, collections.all())
 
 
 @router.post("/collections", response_model=BusinessCollectionResponse)
 async def create_collection(
     collection_data: BusinessCollectionCreate,
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new business collection.
     Client only.
     """
     # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
+    client_id = await _get_client_id(db, firebase_uid)
     
     # Create collection
     collection = BusinessCollection(
-        client_id=client.id,
+        client_id=client_id,
         **collection_data.model_dump()
     )
     
     db.add(collection)
-    db.commit()
-    db.refresh(collection)
+    await db.commit()
     
-    return collection
+    return json_response(BusinessCollectionResponse.model_validate(collection))
 
 
 @router.get("/collections/{collection_id}", response_model=CollectionWithBusinessesResponse)
 async def get_collection_with_businesses(
     collection_id: uuid.UUID,
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a collection with all its businesses.
     Client only.
     """
-    # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
-    
-    # Get collection
-    collection = db.query(BusinessCollection).filter(
-        BusinessCollection.id == collection_id,
-        BusinessCollection.client_id == client.id
-    ).first()
-    
-    if not collection:
-        raise HTTPException(status_code=404, detail="Collection not found")
+    # Get collection, verifying client ownership
+    collection = await _get_owned_collection(db, collection_id, firebase_uid)
     
     # Get collection items
-    items = (
-        db.query(BusinessCollectionItem)
-        .filter(BusinessCollectionItem.collection_id == collection_id)
+    items = await db.scalars(
+        select(BusinessCollectionItem)
+        .where(BusinessCollectionItem.collection_id == collection_id)
         .order_by(BusinessCollectionItem.sort_order)
-        .all()
     )
     
-    return CollectionWithBusinessesResponse(
+    return json_response(CollectionWithBusinessesResponse(
         collection=collection,
-        businesses=items
-    )
+        businesses=items.all()
+    ))
 
 
 @router.put("/collections/{collection_id}", response_model=BusinessCollectionResponse)
@@ -275,64 +300,44 @@ async def update_collection(
     collection_id: uuid.UUID,
     collection_update: BusinessCollectionUpdate,
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a collection.
     Client only.
     """
-    # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
-    
-    # Get collection
-    collection = db.query(BusinessCollection).filter(
-        BusinessCollection.id == collection_id,
-        BusinessCollection.client_id == client.id
-    ).first()
-    
-    if not collection:
-        raise HTTPException(status_code=404, detail="Collection not found")
+    # Get collection, verifying client ownership
+    collection = await _get_owned_collection(db, collection_id, firebase_uid)
     
     # Update fields
     update_data = collection_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(collection, field, value)
     
-    collection.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(collection)
+    await db.commit()
     
-    return collection
+    return json_response(BusinessCollectionResponse.model_validate(collection))
 
 
 @router.delete("/collections/{collection_id}")
 async def delete_collection(
     collection_id: uuid.UUID,
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a collection and all its items.
     Client only.
     """
-    # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
-    
-    # Get and delete collection
-    collection = db.query(BusinessCollection).filter(
-        BusinessCollection.id == collection_id,
-        BusinessCollection.client_id == client.id
-    ).first()
-    
-    if not collection:
-        raise HTTPException(status_code=404, detail="Collection not found")
+    # Get and delete collection; its items are loaded up front for the
+    # delete-orphan cascade, since async sessions can't lazy load them
+    collection = await _get_owned_collection(
+        db, collection_id, firebase_uid,
+        _OWNED_COLLECTION_STMT.options(selectinload(BusinessCollection.businesses))
+    )
     
-    db.delete(collection)
-    db.commit()
+    await db.delete(collection)
+    await db.commit()
     
     return {"message": "Collection deleted successfully"}
 
@@ -343,38 +348,28 @@ async def add_business_to_collection(
     collection_id: uuid.UUID,
     item_data: BusinessCollectionItemCreate,
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add a business to a collection.
     Client only.
     """
-    # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
-    
     # Verify collection ownership
-    collection = db.query(BusinessCollection).filter(
-        BusinessCollection.id == collection_id,
-        BusinessCollection.client_id == client.id
-    ).first()
-    
-    if not collection:
-        raise HTTPException(status_code=404, detail="Collection not found")
+    await _get_owned_collection(db, collection_id, firebase_uid)
     
     # Verify business exists
-    business = db.query(Business).filter(Business.id == item_data.business_id).first()
-    if not business:
+    if not await db.scalar(_BUSINESS_EXISTS_STMT, {"business_id": item_data.business_id}):
         raise HTTPException(status_code=404, detail="Business not found")
     
     # Check if already in collection
-    existing_item = db.query(BusinessCollectionItem).filter(
-        BusinessCollectionItem.collection_id == collection_id,
-        BusinessCollectionItem.business_id == item_data.business_id
-    ).first()
+    already_in_collection = await db.scalar(
+        select(exists().where(
+            BusinessCollectionItem.collection_id == collection_id,
+            BusinessCollectionItem.business_id == item_data.business_id
+        ))
+    )
     
-    if existing_item:
+    if already_in_collection:
         raise HTTPException(status_code=400, detail="Business already in this collection")
     
     # Create collection item
@@ -386,10 +381,9 @@ async def add_business_to_collection(
     )
     
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    await db.commit()
     
-    return item
+    return json_response(BusinessCollectionItemResponse.model_validate(item))
 
 
 @router.put("/collections/{collection_id}/businesses/{item_id}", response_model=BusinessCollectionItemResponse)
@@ -398,31 +392,17 @@ async def update_collection_item(
     item_id: uuid.UUID,
     item_update: BusinessCollectionItemUpdate,
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a business in a collection.
     Client only.
     """
-    # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
-    
     # Verify collection ownership
-    collection = db.query(BusinessCollection).filter(
-        BusinessCollection.id == collection_id,
-        BusinessCollection.client_id == client.id
-    ).first()
-    
-    if not collection:
-        raise HTTPException(status_code=404, detail="Collection not found")
+    await _get_owned_collection(db, collection_id, firebase_uid)
     
     # Get item
-    item = db.query(BusinessCollectionItem).filter(
-        BusinessCollectionItem.id == item_id,
-        BusinessCollectionItem.collection_id == collection_id
-    ).first()
+    item = await db.scalar(_COLLECTION_ITEM_STMT, {"item_id": item_id, "collection_id": collection_id})
     
     if not item:
         raise HTTPException(status_code=404, detail="Item not found in collection")
@@ -432,11 +412,9 @@ async def update_collection_item(
     for field, value in update_data.items():
         setattr(item, field, value)
     
-    item.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(item)
+    await db.commit()
     
-    return item
+    return json_response(BusinessCollectionItemResponse.model_validate(item))
 
 
 @router.delete("/collections/{collection_id}/businesses/{item_id}")
@@ -444,37 +422,23 @@ async def remove_business_from_collection(
     collection_id: uuid.UUID,
     item_id: uuid.UUID,
     firebase_uid: str = Query(..., description="Client Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove a business from a collection.
     Client only.
     """
-    # Verify client exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    if not client:
-        raise HTTPException(status_code=404, detail="Client profile not found")
-    
     # Verify collection ownership
-    collection = db.query(BusinessCollection).filter(
-        BusinessCollection.id == collection_id,
-        BusinessCollection.client_id == client.id
-    ).first()
-    
-    if not collection:
-        raise HTTPException(status_code=404, detail="Collection not found")
+    await _get_owned_collection(db, collection_id, firebase_uid)
     
     # Get and delete item
-    item = db.query(BusinessCollectionItem).filter(
-        BusinessCollectionItem.id == item_id,
-        BusinessCollectionItem.collection_id == collection_id
-    ).first()
+    item = await db.scalar(_COLLECTION_ITEM_STMT, {"item_id": item_id, "collection_id": collection_id})
     
     if not item:
         raise HTTPException(status_code=404, detail="Item not found in collection")
     
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await db.commit()
     
     return {"message": "Business removed from collection"}
 
@@ -8,13 +8,13 @@ Firebase UID is passed as parameter from frontend.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, and_, func, select, update
 from typing import List, Optional
-from datetime import datetime, timedelta
 import uuid
 
-from app.core.database import get_db
+from app.core.auth import Principal, PrincipalKind, get_principal
+from app.core.database import get_async_db
 from app.models.notifications import (
     NotificationLog, NotificationPreference,
     NotificationType, NotificationEvent, NotificationStatus
@@ -38,42 +38,39 @@ async def get_notifications(
     notification_type: Optional[NotificationType] = Query(None, description="Filter by type"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    principal: Optional[Principal] = Depends(get_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get notification history for current user.
     
     Returns paginated list of notifications sent to the user.
     """
-    # Verify user exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
-    if not client and not business:
+    # Verify user exists; the caller's role is resolved in one cached lookup
+    if not principal:
         raise HTTPException(status_code=404, detail="User profile not found")
     
     # Build query
-    query = db.query(NotificationLog).filter(
+    query = select(NotificationLog).where(
         NotificationLog.recipient_firebase_uid == firebase_uid
     )
     
     # Apply filters
     if status:
-        query = query.filter(NotificationLog.status == status)
+        query = query.where(NotificationLog.status == status)
     
     if notification_type:
-        query = query.filter(NotificationLog.notification_type == notification_type)
+        query = query.where(NotificationLog.notification_type == notification_type)
     
     # Get total count
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
     
     # Apply pagination and ordering
-    notifications = (
+    notifications = (await db.scalars(
         query.order_by(desc(NotificationLog.created_at))
         .offset(skip)
         .limit(limit)
-        .all()
-    )
+    )).all()
     
     return NotificationListResponse(
         notifications=notifications,
@@ -86,7 +83,8 @@ async def get_notifications(
 @router.get("/preferences", response_model=List[NotificationPreferenceResponse])
 async def get_notification_preferences(
     firebase_uid: str = Query(..., description="User Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    principal: Optional[Principal] = Depends(get_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get notification preferences for current user.
@@ -94,23 +92,16 @@ async def get_notification_preferences(
     Returns all notification preference settings for the user.
     """
     # Verify user exists and get their ID
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
-    if not client and not business:
+    if not principal:
         raise HTTPException(status_code=404, detail="User profile not found")
     
     # Get preferences
-    if client:
-        preferences = db.query(NotificationPreference).filter(
-            NotificationPreference.client_id == client.id
-        ).all()
+    if principal.kind == PrincipalKind.CLIENT:
+        owner = NotificationPreference.client_id == principal.id
     else:
-        preferences = db.query(NotificationPreference).filter(
-            NotificationPreference.business_id == business.id
-        ).all()
+        owner = NotificationPreference.business_id == principal.id
     
-    return preferences
+    return (await db.scalars(select(NotificationPreference).where(owner))).all()
 
 
 @router.put("/preferences/{event}")
@@ -118,7 +109,8 @@ async def update_notification_preference(
     event: NotificationEvent,
     preference_update: NotificationPreferenceUpdate,
     firebase_uid: str = Query(..., description="User Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    principal: Optional[Principal] = Depends(get_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update notification preference for a specific event.
@@ -126,23 +118,20 @@ async def update_notification_preference(
     Allows users to enable/disable notifications for specific events.
     """
     # Verify user exists and get their ID
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
-    if not client and not business:
+    if not principal:
         raise HTTPException(status_code=404, detail="User profile not found")
     
     # Find or create preference
-    if client:
-        preference = db.query(NotificationPreference).filter(
-            NotificationPreference.client_id == client.id,
+    if principal.kind == PrincipalKind.CLIENT:
+        preference = await db.scalar(select(NotificationPreference).where(
+            NotificationPreference.client_id == principal.id,
             NotificationPreference.event == event,
             NotificationPreference.notification_type == preference_update.notification_type
-        ).first()
+        ))
         
         if not preference:
             preference = NotificationPreference(
-                client_id=client.id,
+                client_id=principal.id,
                 event=event,
                 notification_type=preference_update.notification_type,
                 is_enabled=preference_update.is_enabled
@@ -151,15 +140,15 @@ async def update_notification_preference(
         else:
             preference.is_enabled = preference_update.is_enabled
     else:
-        preference = db.query(NotificationPreference).filter(
-            NotificationPreference.business_id == business.id,
+        preference = await db.scalar(select(NotificationPreference).where(
+            NotificationPreference.business_id == principal.id,
             NotificationPreference.event == event,
             NotificationPreference.notification_type == preference_update.notification_type
-        ).first()
+        ))
         
         if not preference:
             preference = NotificationPreference(
-                business_id=business.id,
+                business_id=principal.id,
                 event=event,
                 notification_type=preference_update.notification_type,
                 is_enabled=preference_update.is_enabled
@@ -168,8 +157,7 @@ async def update_notification_preference(
         else:
             preference.is_enabled = preference_update.is_enabled
     
-    db.commit()
-    db.refresh(preference)
+    await db.commit()
     
     return {"status": "success", "message": "Notification preference updated"}
 
@@ -178,7 +166,8 @@ async def update_notification_preference(
 async def update_fcm_token(
     fcm_token: str,
     firebase_uid: str = Query(..., description="User Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    principal: Optional[Principal] = Depends(get_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update FCM token for push notifications.
@@ -186,21 +175,14 @@ async def update_fcm_token(
     Updates the user's Firebase Cloud Messaging token for receiving push notifications.
     """
     # Find user
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
-    if not client and not business:
+    if not principal:
         raise HTTPException(status_code=404, detail="User profile not found")
     
     # Update FCM token
-    if client:
-        client.fcm_token = fcm_token
-        client.updated_at = datetime.utcnow()
-    else:
-        business.fcm_token = fcm_token
-        business.updated_at = datetime.utcnow()
+    model = Client if principal.kind == PrincipalKind.CLIENT else Business
+    await db.execute(update(model).where(model.id == principal.id).values(fcm_token=fcm_token))
     
-    db.commit()
+    await db.commit()
     
     return {"status": "success", "message": "FCM token updated successfully"}
 
@@ -208,7 +190,8 @@ async def update_fcm_token(
 @router.delete("/fcm-token")
 async def remove_fcm_token(
     firebase_uid: str = Query(..., description="User Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    principal: Optional[Principal] = Depends(get_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove FCM token (for logout/unregister device).
@@ -216,21 +199,14 @@ async def remove_fcm_token(
     Clears the user's FCM token to stop receiving push notifications on this device.
     """
     # Find user
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
-    if not client and not business:
+    if not principal:
         raise HTTPException(status_code=404, detail="User profile not found")
     
     # Clear FCM token
-    if client:
-        client.fcm_token = None
-        client.updated_at = datetime.utcnow()
-    else:
-        business.fcm_token = None
-        business.updated_at = datetime.utcnow()
+    model = Client if principal.kind == PrincipalKind.CLIENT else Business
+    await db.execute(update(model).where(model.id == principal.id).values(fcm_token=None))
     
-    db.commit()
+    await db.commit()
     
     return {"status": "success", "message": "FCM token removed successfully"}
 
@@ -238,25 +214,23 @@ async def remove_fcm_token(
 @router.get("/unread-count")
 async def get_unread_notification_count(
     firebase_uid: str = Query(..., description="User Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    principal: Optional[Principal] = Depends(get_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get count of unread notifications.
     
     Returns the number of unread notifications for quick badge display.
     """
-    # Verify user exists
-    client = db.query(Client).filter(Client.firebase_uid == firebase_uid).first()
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    
-    if not client and not business:
+    # Verify user exists; the caller's role is resolved in one cached lookup
+    if not principal:
         raise HTTPException(status_code=404, detail="User profile not found")
     
     # Count unread notifications (sent but not delivered)
-    unread_count = db.query(NotificationLog).filter(
+    unread_count = await db.scalar(select(func.count()).select_from(NotificationLog).where(
         NotificationLog.recipient_firebase_uid == firebase_uid,
         NotificationLog.status == NotificationStatus.SENT
-    ).count()
+    ))
     
     return {"unread_count": unread_count}
 
@@ -265,17 +239,17 @@ async def get_unread_notification_count(
 async def mark_notification_read(
     notification_id: uuid.UUID,
     firebase_uid: str = Query(..., description="User Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark a specific notification as read.
     
     Updates the notification status to indicate it has been seen by the user.
     """
-    notification = db.query(NotificationLog).filter(
+    notification = await db.scalar(select(NotificationLog).where(
         NotificationLog.id == notification_id,
         NotificationLog.recipient_firebase_uid == firebase_uid
-    ).first()
+    ))
     
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
@@ -283,7 +257,7 @@ async def mark_notification_read(
     # Mark as delivered (read)
     notification.mark_delivered()
     
-    db.commit()
+    await db.commit()
     
     return {"status": "success", "message": "Notification marked as read"}
 
@@ -291,7 +265,7 @@ async def mark_notification_read(
 @router.put("/mark-all-read")
 async def mark_all_notifications_read(
     firebase_uid: str = Query(..., description="User Firebase UID from frontend"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark all notifications as read.
@@ -299,11 +273,15 @@ async def mark_all_notifications_read(
     Bulk update to mark all unread notifications as read.
     """
     # Update all unread notifications
-    db.query(NotificationLog).filter(
-        NotificationLog.recipient_firebase_uid == firebase_uid,
-        NotificationLog.status == NotificationStatus.SENT
-    ).update({"status": NotificationStatus.DELIVERED})
+    await db.execute(
+        update(NotificationLog)
+        .where(
+            NotificationLog.recipient_firebase_uid == firebase_uid,
+            NotificationLog.status == NotificationStatus.SENT
+        )
+        .values(status=NotificationStatus.DELIVERED)
+    )
     
-    db.commit()
+    await db.commit()
     
     return {"status": "success", "message": "All notifications marked as read"}
@@ -12,7 +12,6 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func, and_
 from typing import List, Optional
-from datetime import datetime
 import uuid
 
 from app.core.database import get_db
@@ -103,7 +102,6 @@ async def create_review(
     business.average_rating = float(all_reviews) if all_reviews else review_data.overall_rating
     
     db.commit()
-    db.refresh(review)
     
     return review
 
@@ -174,8 +172,6 @@ async def update_review(
     for field, value in update_data.items():
         setattr(review, field, value)
     
-    review.updated_at = datetime.utcnow()
-    
     # Recalculate business average rating
     business = review.business
     all_reviews = db.query(func.avg(Review.overall_rating)).filter(
@@ -186,7 +182,6 @@ async def update_review(
     business.average_rating = float(all_reviews) if all_reviews else 0.0
     
     db.commit()
-    db.refresh(review)
     
     return review
 
@@ -372,10 +367,8 @@ async def add_business_response(
     
     # Add business response
     review.add_business_response(response_data.business_response)
-    review.updated_at = datetime.utcnow()
     
     db.commit()
-    db.refresh(review)
     
     return review
 
@@ -457,7 +450,6 @@ async def flag_review(
     
     # Flag the review
     review.flag_review(flag_data.reason)
-    review.updated_at = datetime.utcnow()
     
     db.commit()
     
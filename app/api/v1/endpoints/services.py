@@ -8,18 +8,66 @@ Authentication is handled by API key middleware.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Float, Numeric, bindparam, cast, func, null, or_, select
 from typing import List, Optional
-from datetime import datetime
+import orjson
 import uuid
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.responses import json_data_response
+from app.models.appointments import Appointment
+from app.models.base import geography_point
 from app.models.businesses import Service, Business, BusinessCategory
 from app.schemas.businesses import ServiceResponse
+from app.services.search_cache import cached_search_response, search_cache_key
 
 router = APIRouter()
 
+# An active service with its business, for the details page
+_SERVICE_DETAILS_STMT = (
+    select(Service, Business)
+    .join(Business, Service.business_id == Business.id)
+    .where(Service.id == bindparam("service_id"), Service.is_active == True)
+)
+
+# Columns service search results are built from, labelled with their
+# response keys, so rows serialize directly without hydrating Service and
+# Business objects; numerics are cast for JSON and missing ratings read as 0
+_SERVICE_SEARCH_COLUMNS = (
+    Service.id.label("service_id"),
+    Service.name.label("service_name"),
+    Service.description.label("service_description"),
+    Service.duration_minutes,
+    cast(Service.price, Float).label("price"),
+    Service.service_image_url,
+    Service.requires_deposit,
+    cast(Service.deposit_amount, Float).label("deposit_amount"),
+    Service.sort_order,
+    Service.color_code,
+    Business.id.label("business_id"),
+    Business.name.label("business_name"),
+    Business.description.label("business_description"),
+    Business.business_phone,
+    Business.business_email,
+    Business.logo_url,
+    Business.cover_image_url,
+    Business.booking_slug,
+    func.coalesce(cast(Business.average_rating, Float), 0.0).label("average_rating"),
+    Business.total_reviews,
+    Business.address,
+    Business.city,
+    Business.state,
+    Business.postal_code,
+    Business.country,
+)
+
+
+async def _search_body(db: AsyncSession, stmt) -> bytes:
+    """Run a service search and return its JSON body."""
+    results = await db.execute(stmt)
+    return orjson.dumps([dict(row._mapping) for row in results])
+
 
 @router.get("/search", response_model=List[dict])
 async def search_services(
@@ -36,7 +84,7 @@ async def search_services(
     requires_deposit: Optional[bool] = Query(None, description="Filter by deposit requirement"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Global service search across all businesses.
@@ -50,13 +98,15 @@ async def search_services(
     - City/state filtering
     
     Returns services with their business information.
-    Public endpoint.
+    Public endpoint. Identical searches share one query and a cached
+    response for SEARCH_CACHE_TTL seconds.
     """
     # Build base query - join service with business
     query_builder = (
-        db.query(Service, Business)
+        select(*_SERVICE_SEARCH_COLUMNS)
+        .select_from(Service)
         .join(Business, Service.business_id == Business.id)
-        .filter(
+        .where(
             Service.is_active == True,
             Business.is_active == True,
             Business.is_approved == True
@@ -69,125 +119,86 @@ async def search_services(
             func.lower(Service.name).contains(query.lower()),
             func.lower(Service.description).contains(query.lower())
         )
-        query_builder = query_builder.filter(search_filter)
+        query_builder = query_builder.where(search_filter)
     
     # Business category filter
     if category_id:
-        query_builder = query_builder.filter(Business.category_id == category_id)
+        query_builder = query_builder.where(Business.category_id == category_id)
     
     # Price range filters
     if min_price is not None:
-        query_builder = query_builder.filter(Service.price >= min_price)
+        query_builder = query_builder.where(Service.price >= min_price)
     
     if max_price is not None:
-        query_builder = query_builder.filter(Service.price <= max_price)
+        query_builder = query_builder.where(Service.price <= max_price)
     
     # Duration filter
     if max_duration is not None:
-        query_builder = query_builder.filter(Service.duration_minutes <= max_duration)
+        query_builder = query_builder.where(Service.duration_minutes <= max_duration)
     
     # Deposit requirement filter
     if requires_deposit is not None:
-        query_builder = query_builder.filter(Service.requires_deposit == requires_deposit)
+        query_builder = query_builder.where(Service.requires_deposit == requires_deposit)
     
     # Location filters
     if city:
-        query_builder = query_builder.filter(
+        query_builder = query_builder.where(
             func.lower(Business.city).contains(city.lower())
         )
     
     if state:
-        query_builder = query_builder.filter(
+        query_builder = query_builder.where(
             func.lower(Business.state).contains(state.lower())
         )
     
-    # Geographic proximity search
+    # Geographic proximity search; the distance is computed in km alongside
+    # each row instead of being queried per result
     if latitude and longitude:
-        from geoalchemy2 import func as geo_func
-        from geoalchemy2.elements import WKTElement
-        
-        user_point = WKTElement(f'POINT({longitude} {latitude})', srid=4326)
+        user_point = geography_point(latitude, longitude)
+        distance_km = func.round(cast(func.ST_Distance(Business.location, user_point) / 1000, Numeric), 2)
         
         query_builder = (
             query_builder
-            .filter(Business.location.isnot(None))
-            .filter(
-                geo_func.ST_DWithin(
-                    Business.location,
-                    user_point,
-                    radius_km * 1000  # Convert km to meters
-                )
+            .add_columns(cast(distance_km, Float).label("distance_km"))
+            .where(
+                Business.location.isnot(None),
+                Business.within_radius(latitude, longitude, radius_km * 1000, user_point)  # Convert km to meters
             )
         )
+    else:
+        query_builder = query_builder.add_columns(null().label("distance_km"))
     
     # Order by service name
     query_builder = query_builder.order_by(Service.name)
     
-    # Apply pagination
-    results = query_builder.offset(skip).limit(limit).all()
+    # Coordinates in the key are bucketed to 3 decimals (about 100 m) so that
+    # nearby users share cached results; the query itself uses the exact ones
+    cache_key = search_cache_key("services", {
+        "query": query,
+        "category_id": category_id,
+        "min_price": min_price,
+        "max_price": max_price,
+        "max_duration": max_duration,
+        "latitude": None if latitude is None else round(latitude, 3),
+        "longitude": None if longitude is None else round(longitude, 3),
+        "radius_km": radius_km,
+        "city": city,
+        "state": state,
+        "requires_deposit": requires_deposit,
+        "skip": skip,
+        "limit": limit,
+    })
     
-    # Format response with service and business details
-    services_with_business = []
-    for service, business in results:
-        service_dict = {
-            # Service information
-            "service_id": str(service.id),
-            "service_name": service.name,
-            "service_description": service.description,
-            "duration_minutes": service.duration_minutes,
-            "price": float(service.price) if service.price else None,
-            "service_image_url": service.service_image_url,
-            "requires_deposit": service.requires_deposit,
-            "deposit_amount": float(service.deposit_amount) if service.deposit_amount else None,
-            "sort_order": service.sort_order,
-            "color_code": service.color_code,
-            
-            # Business information
-            "business_id": str(business.id),
-            "business_name": business.name,
-            "business_description": business.description,
-            "business_phone": business.business_phone,
-            "business_email": business.business_email,
-            "logo_url": business.logo_url,
-            "cover_image_url": business.cover_image_url,
-            "booking_slug": business.booking_slug,
-            "average_rating": float(business.average_rating) if business.average_rating else 0.0,
-            "total_reviews": business.total_reviews,
-            
-            # Location
-            "address": business.address,
-            "city": business.city,
-            "state": business.state,
-            "postal_code": business.postal_code,
-            "country": business.country,
-            
-            # Calculate distance if coordinates provided
-            "distance_km": None
-        }
-        
-        # Calculate distance if location search was used
-        if latitude and longitude and business.location:
-            from geoalchemy2 import func as geo_func
-            from geoalchemy2.elements import WKTElement
-            
-            user_point = WKTElement(f'POINT({longitude} {latitude})', srid=4326)
-            distance = db.query(
-                geo_func.ST_Distance(Business.location, user_point)
-            ).filter(Business.id == business.id).scalar()
-            
-            if distance:
-                service_dict["distance_km"] = round(distance / 1000, 2)
-        
-        services_with_business.append(service_dict)
-    
-    return services_with_business
+    # Apply pagination; each row is already shaped like a response item
+    page_stmt = query_builder.offset(skip).limit(limit)
+    return await cached_search_response(cache_key, lambda: _search_body(db, page_stmt))
 
 
 @router.get("/popular", response_model=List[dict])
 async def get_popular_services(
     category_id: Optional[uuid.UUID] = Query(None, description="Filter by business category"),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get popular/most booked services.
@@ -195,18 +206,16 @@ async def get_popular_services(
     Returns services sorted by total number of appointments.
     Public endpoint.
     """
-    from app.models.appointments import Appointment
-    
     # Build query with appointment count
     query_builder = (
-        db.query(
+        select(
             Service,
             Business,
             func.count(Appointment.id).label('appointment_count')
         )
         .join(Business, Service.business_id == Business.id)
         .outerjoin(Appointment, Service.id == Appointment.service_id)
-        .filter(
+        .where(
             Service.is_active == True,
             Business.is_active == True,
             Business.is_approved == True
@@ -216,10 +225,10 @@ async def get_popular_services(
     
     # Category filter
     if category_id:
-        query_builder = query_builder.filter(Business.category_id == category_id)
+        query_builder = query_builder.where(Business.category_id == category_id)
     
     # Order by appointment count
-    results = query_builder.order_by(func.count(Appointment.id).desc()).limit(limit).all()
+    results = await db.execute(query_builder.order_by(func.count(Appointment.id).desc()).limit(limit))
     
     # Format response
     popular_services = []
@@ -238,13 +247,13 @@ async def get_popular_services(
             "total_bookings": appointment_count
         })
     
-    return popular_services
+    return json_data_response(popular_services)
 
 
 @router.get("/{service_id}/details", response_model=dict)
 async def get_service_details(
     service_id: uuid.UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed information about a specific service.
@@ -253,22 +262,14 @@ async def get_service_details(
     Public endpoint.
     """
     # Get service with business
-    result = (
-        db.query(Service, Business)
-        .join(Business, Service.business_id == Business.id)
-        .filter(
-            Service.id == service_id,
-            Service.is_active == True
-        )
-        .first()
-    )
+    result = (await db.execute(_SERVICE_DETAILS_STMT, {"service_id": service_id})).first()
     
     if not result:
         raise HTTPException(status_code=404, detail="Service not found")
     
     service, business = result
     
-    return {
+    return json_data_response({
         # Service information
         "service_id": str(service.id),
         "service_name": service.name,
@@ -302,5 +303,5 @@ async def get_service_details(
             "country": business.country,
             "timezone": business.timezone
         }
-    }
+    })
 
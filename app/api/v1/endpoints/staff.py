@@ -12,12 +12,12 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from typing import List, Optional
-from datetime import datetime, date
+from datetime import date
 import uuid
 
+from app.core.auth import get_current_business_id
 from app.core.database import get_db
 from app.models.staff import StaffMember, StaffWorkingHours, StaffTimeOff
-from app.models.businesses import Business
 from app.schemas.staff import (
     StaffMemberCreate, StaffMemberUpdate, StaffMemberResponse, StaffListResponse,
     StaffWorkingHoursCreate, StaffWorkingHoursResponse,
@@ -30,7 +30,7 @@ router = APIRouter()
 # Staff Member Management
 @router.get("/", response_model=StaffListResponse)
 async def get_business_staff(
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
@@ -40,13 +40,8 @@ async def get_business_staff(
     Get all staff members for a business.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
     # Build query
-    query = db.query(StaffMember).filter(StaffMember.business_id == business.id)
+    query = db.query(StaffMember).filter(StaffMember.business_id == business_id)
     
     # Apply filters
     if is_active is not None:
@@ -74,22 +69,17 @@ async def get_business_staff(
 @router.get("/{staff_id}", response_model=StaffMemberResponse)
 async def get_staff_member(
     staff_id: uuid.UUID,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     db: Session = Depends(get_db)
 ):
     """
     Get details of a specific staff member.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
     # Get staff member
     staff_member = db.query(StaffMember).filter(
         StaffMember.id == staff_id,
-        StaffMember.business_id == business.id
+        StaffMember.business_id == business_id
     ).first()
     
     if not staff_member:
@@ -101,22 +91,17 @@ async def get_staff_member(
 @router.post("/", response_model=StaffMemberResponse)
 async def create_staff_member(
     staff_data: StaffMemberCreate,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     db: Session = Depends(get_db)
 ):
     """
     Add a new staff member to the business.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
     # Check if email already exists for this business (if provided)
     if staff_data.email:
         existing_staff = db.query(StaffMember).filter(
-            StaffMember.business_id == business.id,
+            StaffMember.business_id == business_id,
             StaffMember.email == staff_data.email
         ).first()
         if existing_staff:
@@ -124,13 +109,12 @@ async def create_staff_member(
     
     # Create staff member
     staff_member = StaffMember(
-        business_id=business.id,
+        business_id=business_id,
         **staff_data.model_dump()
     )
     
     db.add(staff_member)
     db.commit()
-    db.refresh(staff_member)
     
     return staff_member
 
@@ -139,22 +123,17 @@ async def create_staff_member(
 async def update_staff_member(
     staff_id: uuid.UUID,
     staff_update: StaffMemberUpdate,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     db: Session = Depends(get_db)
 ):
     """
     Update a staff member's information.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
     # Get staff member
     staff_member = db.query(StaffMember).filter(
         StaffMember.id == staff_id,
-        StaffMember.business_id == business.id
+        StaffMember.business_id == business_id
     ).first()
     
     if not staff_member:
@@ -163,7 +142,7 @@ async def update_staff_member(
     # Check email conflicts if email is being updated
     if staff_update.email and staff_update.email != staff_member.email:
         existing_staff = db.query(StaffMember).filter(
-            StaffMember.business_id == business.id,
+            StaffMember.business_id == business_id,
             StaffMember.email == staff_update.email,
             StaffMember.id != staff_id
         ).first()
@@ -175,9 +154,7 @@ async def update_staff_member(
     for field, value in update_data.items():
         setattr(staff_member, field, value)
     
-    staff_member.updated_at = datetime.utcnow()
     db.commit()
-    db.refresh(staff_member)
     
     return staff_member
 
@@ -185,22 +162,17 @@ async def update_staff_member(
 @router.delete("/{staff_id}")
 async def delete_staff_member(
     staff_id: uuid.UUID,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     db: Session = Depends(get_db)
 ):
     """
     Delete (deactivate) a staff member.
     Business owner only.
     """
-    # Verify business ownership
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
     # Get staff member
     staff_member = db.query(StaffMember).filter(
         StaffMember.id == staff_id,
-        StaffMember.business_id == business.id
+        StaffMember.business_id == business_id
     ).first()
     
     if not staff_member:
@@ -208,7 +180,6 @@ async def delete_staff_member(
     
     # Soft delete (deactivate)
     staff_member.is_active = False
-    staff_member.updated_at = datetime.utcnow()
     
     db.commit()
     
@@ -219,21 +190,17 @@ async def delete_staff_member(
 @router.get("/{staff_id}/working-hours", response_model=List[StaffWorkingHoursResponse])
 async def get_staff_working_hours(
     staff_id: uuid.UUID,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     db: Session = Depends(get_db)
 ):
     """
     Get working hours for a staff member.
     Business owner only.
     """
-    # Verify business ownership and staff member
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
+    # Verify staff member belongs to the business
     staff_member = db.query(StaffMember).filter(
         StaffMember.id == staff_id,
-        StaffMember.business_id == business.id
+        StaffMember.business_id == business_id
     ).first()
     
     if not staff_member:
@@ -251,21 +218,17 @@ async def get_staff_working_hours(
 async def create_staff_working_hours(
     staff_id: uuid.UUID,
     hours_data: StaffWorkingHoursCreate,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     db: Session = Depends(get_db)
 ):
     """
     Set working hours for a staff member for a specific day.
     Business owner only.
     """
-    # Verify business ownership and staff member
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
+    # Verify staff member belongs to the business
     staff_member = db.query(StaffMember).filter(
         StaffMember.id == staff_id,
-        StaffMember.business_id == business.id
+        StaffMember.business_id == business_id
     ).first()
     
     if not staff_member:
@@ -291,7 +254,6 @@ async def create_staff_working_hours(
     
     db.add(working_hours)
     db.commit()
-    db.refresh(working_hours)
     
     return working_hours
 
@@ -301,21 +263,17 @@ async def update_staff_working_hours(
     staff_id: uuid.UUID,
     hours_id: uuid.UUID,
     hours_update: StaffWorkingHoursCreate,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     db: Session = Depends(get_db)
 ):
     """
     Update working hours for a staff member.
     Business owner only.
     """
-    # Verify business ownership and staff member
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
+    # Verify staff member belongs to the business
     staff_member = db.query(StaffMember).filter(
         StaffMember.id == staff_id,
-        StaffMember.business_id == business.id
+        StaffMember.business_id == business_id
     ).first()
     
     if not staff_member:
@@ -335,9 +293,7 @@ async def update_staff_working_hours(
     for field, value in update_data.items():
         setattr(working_hours, field, value)
     
-    working_hours.updated_at = datetime.utcnow()
     db.commit()
-    db.refresh(working_hours)
     
     return working_hours
 
@@ -346,7 +302,7 @@ async def update_staff_working_hours(
 @router.get("/{staff_id}/time-off", response_model=List[StaffTimeOffResponse])
 async def get_staff_time_off(
     staff_id: uuid.UUID,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     upcoming_only: bool = Query(False, description="Only show upcoming/future time-off"),
     db: Session = Depends(get_db)
 ):
@@ -354,14 +310,10 @@ async def get_staff_time_off(
     Get time-off requests for a staff member.
     Business owner only.
     """
-    # Verify business ownership and staff member
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
+    # Verify staff member belongs to the business
     staff_member = db.query(StaffMember).filter(
         StaffMember.id == staff_id,
-        StaffMember.business_id == business.id
+        StaffMember.business_id == business_id
     ).first()
     
     if not staff_member:
@@ -382,21 +334,17 @@ async def get_staff_time_off(
 async def create_time_off_request(
     staff_id: uuid.UUID,
     time_off_data: StaffTimeOffCreate,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     db: Session = Depends(get_db)
 ):
     """
     Create a time-off request for a staff member.
     Business owner only.
     """
-    # Verify business ownership and staff member
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
+    # Verify staff member belongs to the business
     staff_member = db.query(StaffMember).filter(
         StaffMember.id == staff_id,
-        StaffMember.business_id == business.id
+        StaffMember.business_id == business_id
     ).first()
     
     if not staff_member:
@@ -423,7 +371,6 @@ async def create_time_off_request(
     
     db.add(time_off)
     db.commit()
-    db.refresh(time_off)
     
     return time_off
 
@@ -433,21 +380,17 @@ async def update_time_off_request(
     staff_id: uuid.UUID,
     time_off_id: uuid.UUID,
     time_off_update: StaffTimeOffUpdate,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     db: Session = Depends(get_db)
 ):
     """
     Update or approve a time-off request.
     Business owner only.
     """
-    # Verify business ownership and staff member
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
+    # Verify staff member belongs to the business
     staff_member = db.query(StaffMember).filter(
         StaffMember.id == staff_id,
-        StaffMember.business_id == business.id
+        StaffMember.business_id == business_id
     ).first()
     
     if not staff_member:
@@ -467,9 +410,7 @@ async def update_time_off_request(
     for field, value in update_data.items():
         setattr(time_off, field, value)
     
-    time_off.updated_at = datetime.utcnow()
     db.commit()
-    db.refresh(time_off)
     
     return time_off
 
@@ -478,21 +419,17 @@ async def update_time_off_request(
 async def delete_time_off_request(
     staff_id: uuid.UUID,
     time_off_id: uuid.UUID,
-    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    business_id: uuid.UUID = Depends(get_current_business_id),
     db: Session = Depends(get_db)
 ):
     """
     Delete a time-off request.
     Business owner only.
     """
-    # Verify business ownership and staff member
-    business = db.query(Business).filter(Business.firebase_uid == firebase_uid).first()
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-    
+    # Verify staff member belongs to the business
     staff_member = db.query(StaffMember).filter(
         StaffMember.id == staff_id,
-        StaffMember.business_id == business.id
+        StaffMember.business_id == business_id
     ).first()
     
     if not staff_member:
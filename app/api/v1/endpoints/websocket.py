@@ -7,10 +7,13 @@ between clients and businesses.
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import String, literal_column
 import json
 import logging
-from typing import Optional
+from typing import NamedTuple, Optional
+import uuid
 
+from app.core.auth import PrincipalKind, preferred_principal, principal_statement
 from app.core.database import get_db
 from app.websocket.connection_manager import connection_manager
 from app.models.communications import ChatRoom, ChatMessage, MessageType
@@ -22,6 +25,39 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+class Caller(NamedTuple):
+    """Account behind a WebSocket connection, with the name its messages are sent under."""
+    kind: PrincipalKind
+    id: uuid.UUID
+    name: str
+
+
+# The principal lookup, also selecting the name messages are sent under
+_RESOLVE_CALLER_STMT = principal_statement(
+    client_columns=[(Client.first_name + literal_column("' '", String) + Client.last_name).label("name")],
+    business_columns=[Business.name]
+)
+
+
+def resolve_caller(db: Session, firebase_uid: str) -> Optional[Caller]:
+    """
+    Resolve a Firebase UID to the client or business it belongs to.
+    
+    A client account takes precedence if the UID is registered as both.
+    
+    Args:
+        db: Database session
+        firebase_uid: Firebase UID of the connection
+        
+    Returns:
+        Optional[Caller]: Resolved account, or None if no profile exists
+    """
+    return preferred_principal([
+        Caller(PrincipalKind(kind), id, name)
+        for kind, id, name in db.execute(_RESOLVE_CALLER_STMT, {"firebase_uid": firebase_uid})
+    ])
+
+
 async def get_chat_room(room_id: str, db: Session):
     """Get chat room and validate access."""
     chat_room = db.query(ChatRoom).filter(ChatRoom.id == room_id).first()
@@ -47,15 +83,14 @@ async def websocket_endpoint(
         await connection_manager.connect(websocket, firebase_uid)
         
         # Verify user exists (either client or business)
-        user = (db.query(Client).filter(Client.firebase_uid == firebase_uid).first() or
-                db.query(Business).filter(Business.firebase_uid == firebase_uid).first())
+        user = resolve_caller(db, firebase_uid)
         
         if not user:
             await websocket.close(code=4004, reason="User not found")
             return
         
         # Join user's active chat rooms
-        if isinstance(user, Client):
+        if user.kind == PrincipalKind.CLIENT:
             chat_rooms = db.query(ChatRoom).filter(ChatRoom.client_id == user.id).all()
         else:  # Business
             chat_rooms = db.query(ChatRoom).filter(ChatRoom.business_id == user.id).all()
@@ -130,13 +165,12 @@ async def handle_send_message(message_data: dict, firebase_uid: str, db: Session
         chat_room = await get_chat_room(room_id, db)
         
         # Verify user is part of this chat room
-        user = (db.query(Client).filter(Client.firebase_uid == firebase_uid).first() or
-                db.query(Business).filter(Business.firebase_uid == firebase_uid).first())
+        user = resolve_caller(db, firebase_uid)
         
         if not user:
             return
         
-        is_from_client = isinstance(user, Client)
+        is_from_client = user.kind == PrincipalKind.CLIENT
         
         # Verify access to chat room
         if ((is_from_client and chat_room.client_id != user.id) or 
@@ -161,15 +195,15 @@ async def handle_send_message(message_data: dict, firebase_uid: str, db: Session
         )
         
         db.add(new_message)
-        db.commit()
-        db.refresh(new_message)
+        db.flush()
         
-        # Update chat room
+        # Update chat room in the same transaction; unread counts are
+        # incremented in SQL since this long-lived session may hold a stale room
         chat_room.last_message_at = new_message.created_at
         if is_from_client:
-            chat_room.business_unread_count += 1
+            chat_room.business_unread_count = ChatRoom.business_unread_count + 1
         else:
-            chat_room.client_unread_count += 1
+            chat_room.client_unread_count = ChatRoom.client_unread_count + 1
         
         db.commit()
         
@@ -179,7 +213,7 @@ async def handle_send_message(message_data: dict, firebase_uid: str, db: Session
             "content": content,
             "message_type": msg_type,
             "file_url": message_data.get("file_url"),
-            "sender_name": user.full_name if is_from_client else user.name,
+            "sender_name": user.name,
             "created_at": new_message.created_at.isoformat()
         }, room_id, firebase_uid)
         
@@ -228,13 +262,12 @@ async def handle_mark_read(message_data: dict, firebase_uid: str, db: Session):
             return
         
         # Determine if user is client or business
-        user = (db.query(Client).filter(Client.firebase_uid == firebase_uid).first() or
-                db.query(Business).filter(Business.firebase_uid == firebase_uid).first())
+        user = resolve_caller(db, firebase_uid)
         
         if not user:
             return
         
-        is_client = isinstance(user, Client)
+        is_client = user.kind == PrincipalKind.CLIENT
         
         # Mark messages as read
         if is_client:
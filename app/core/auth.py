@@ -6,13 +6,35 @@ Firebase UID is passed as parameter from frontend, no token validation.
 Only API key authentication is used (handled by middleware).
 """
 
-from fastapi import HTTPException, Query
-from typing import Optional
+from fastapi import Depends, HTTPException, Query
+from sqlalchemy import bindparam, select, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, NamedTuple, Optional, Sequence, TypeVar
+from enum import Enum
 import logging
+import uuid
+
+from app.core.cache import cache_delete, cache_get, cache_set
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.models.businesses import Business
+from app.models.clients import Client
 
 logger = logging.getLogger(__name__)
 
 
+class PrincipalKind(str, Enum):
+    """Kind of account a Firebase UID belongs to."""
+    CLIENT = "client"
+    BUSINESS = "business"
+
+
+class Principal(NamedTuple):
+    """Account resolved from a Firebase UID."""
+    kind: PrincipalKind
+    id: uuid.UUID
+
+
 def get_firebase_uid_param(firebase_uid: str = Query(..., description="Firebase UID from frontend authentication")) -> str:
     """
     Get Firebase UID from query parameter.
@@ -56,6 +78,266 @@ def get_optional_firebase_uid_param(firebase_uid: Optional[str] = Query(None, de
     return None
 
 
+def principal_statement(client_columns: Sequence = (), business_columns: Sequence = ()):
+    """
+    Build the statement resolving the firebase_uid bind parameter to accounts.
+    
+    Both tables are probed in a single UNION ALL round trip. Each row is the
+    account kind and ID, followed by the given extra columns of that side;
+    both sides must add matching columns.
+    
+    Args:
+        client_columns: Extra columns selected for a client match
+        business_columns: Extra columns selected for a business match
+    """
+    return (
+        select(literal(PrincipalKind.CLIENT.value).label("kind"), Client.id.label("id"), *client_columns)
+        .where(Client.firebase_uid == bindparam("firebase_uid"))
+        .union_all(
+            select(literal(PrincipalKind.BUSINESS.value), Business.id, *business_columns)
+            .where(Business.firebase_uid == bindparam("firebase_uid"))
+        )
+    )
+
+
+PrincipalT = TypeVar("PrincipalT", bound=tuple)
+
+
+def preferred_principal(principals: Sequence[PrincipalT]) -> Optional[PrincipalT]:
+    """
+    Pick the account a Firebase UID acts as among those it resolved to.
+    
+    A client account takes precedence if the UID is registered as both.
+    """
+    for principal in principals:
+        if principal.kind == PrincipalKind.CLIENT:
+            return principal
+    
+    return principals[0] if principals else None
+
+
+# Built once at import; only the bound firebase_uid changes per request, so the
+# compiled SQL is reused from the engine's statement cache.
+_RESOLVE_PRINCIPAL_STMT = principal_statement()
+
+
+async def resolve_principals(db: AsyncSession, firebase_uid: str) -> List[Principal]:
+    """
+    Resolve a Firebase UID to every client and business account it belongs to.
+    
+    Both tables are probed in a single UNION ALL round trip instead of two
+    sequential lookups. Firebase UIDs are only unique per table, so a UID
+    can be registered as both a client and a business.
+    
+    Args:
+        db: Database session
+        firebase_uid: Firebase UID passed from frontend
+        
+    Returns:
+        List[Principal]: Resolved accounts, empty if no profile exists
+    """
+    result = await db.execute(_RESOLVE_PRINCIPAL_STMT, {"firebase_uid": firebase_uid})
+    return [Principal(PrincipalKind(kind), id) for kind, id in result]
+
+
+async def resolve_principal(db: AsyncSession, firebase_uid: str) -> Optional[Principal]:
+    """
+    Resolve a Firebase UID to the client or business account it acts as.
+    
+    A client account takes precedence if the UID is registered as both.
+    
+    Args:
+        db: Database session
+        firebase_uid: Firebase UID passed from frontend
+        
+    Returns:
+        Optional[Principal]: Resolved account, or None if no profile exists
+    """
+    return preferred_principal(await resolve_principals(db, firebase_uid))
+
+
+_BUSINESS_ID_STMT = select(Business.id).where(Business.firebase_uid == bindparam("firebase_uid"))
+
+
+def _business_id_cache_key(firebase_uid: str) -> str:
+    """Cache key for the business ID registered under a Firebase UID."""
+    return f"business_uid:{firebase_uid}"
+
+
+async def get_business_id(db: AsyncSession, firebase_uid: str) -> Optional[uuid.UUID]:
+    """
+    Look up the ID of the business registered under a Firebase UID.
+    
+    Only the primary key is selected, for endpoints that need the owning
+    business's ID but none of its other columns. Found IDs are cached in
+    Redis; unknown UIDs always fall through to the database.
+    
+    Args:
+        db: Database session
+        firebase_uid: Firebase UID passed from frontend
+        
+    Returns:
+        Optional[uuid.UUID]: Business ID, or None if no business exists
+    """
+    cache_key = _business_id_cache_key(firebase_uid)
+    
+    cached = await cache_get(cache_key)
+    if cached:
+        return uuid.UUID(cached)
+    
+    business_id = await db.scalar(_BUSINESS_ID_STMT, {"firebase_uid": firebase_uid})
+    if business_id:
+        await cache_set(cache_key, str(business_id), settings.PRINCIPAL_CACHE_TTL)
+    
+    return business_id
+
+
+async def get_current_business_id(
+    firebase_uid: str = Query(..., description="Business Firebase UID from frontend"),
+    db: AsyncSession = Depends(get_async_db)
+) -> uuid.UUID:
+    """
+    Dependency resolving the ID of the business making the request.
+    
+    Owner-only endpoints declare this instead of looking the business up
+    themselves. FastAPI resolves it once per request however many other
+    dependencies use it, and the ID comes from the Redis cache behind
+    get_business_id, so most requests don't query the database for it.
+    
+    Args:
+        firebase_uid: Business Firebase UID passed from frontend
+        db: Database session
+        
+    Returns:
+        uuid.UUID: Business ID
+        
+    Raises:
+        HTTPException: 404 if no business is registered under the UID
+    """
+    business_id = await get_business_id(db, firebase_uid)
+    if not business_id:
+        raise HTTPException(status_code=404, detail="Business not found")
+    return business_id
+
+
+def _principal_cache_key(firebase_uid: str) -> str:
+    """Cache key for the accounts resolved from a Firebase UID."""
+    return f"principals:{firebase_uid}"
+
+
+async def get_cached_principals(db: AsyncSession, firebase_uid: str) -> List[Principal]:
+    """
+    Resolve a Firebase UID to all of its accounts, using Redis as a cache.
+    
+    Only resolved UIDs are cached; unknown UIDs always fall through to the
+    database so a freshly registered profile is visible immediately.
+    
+    Args:
+        db: Database session
+        firebase_uid: Firebase UID passed from frontend
+        
+    Returns:
+        List[Principal]: Resolved accounts, empty if no profile exists
+    """
+    cache_key = _principal_cache_key(firebase_uid)
+    
+    cached = await cache_get(cache_key)
+    if cached:
+        return [Principal(PrincipalKind(item["kind"]), uuid.UUID(item["id"])) for item in cached]
+    
+    principals = await resolve_principals(db, firebase_uid)
+    if principals:
+        await cache_set(
+            cache_key, [principal._asdict() for principal in principals], settings.PRINCIPAL_CACHE_TTL
+        )
+    
+    return principals
+
+
+async def get_cached_principal(db: AsyncSession, firebase_uid: str) -> Optional[Principal]:
+    """
+    Resolve a Firebase UID to the account it acts as, using Redis as a cache.
+    
+    A client account takes precedence if the UID is registered as both.
+    
+    Args:
+        db: Database session
+        firebase_uid: Firebase UID passed from frontend
+        
+    Returns:
+        Optional[Principal]: Resolved account, or None if no profile exists
+    """
+    return preferred_principal(await get_cached_principals(db, firebase_uid))
+
+
+async def get_client_id(db: AsyncSession, firebase_uid: str) -> Optional[uuid.UUID]:
+    """
+    Look up the ID of the client registered under a Firebase UID.
+    
+    Answered from the cached principal, so warm callers don't query the
+    database for it.
+    
+    Args:
+        db: Database session
+        firebase_uid: Firebase UID passed from frontend
+        
+    Returns:
+        Optional[uuid.UUID]: Client ID, or None if no client exists
+    """
+    principal = await get_cached_principal(db, firebase_uid)
+    if principal and principal.kind == PrincipalKind.CLIENT:
+        return principal.id
+    return None
+
+
+async def get_principal(
+    firebase_uid: str = Query(..., description="Firebase UID from frontend"),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[Principal]:
+    """
+    Dependency resolving the request's Firebase UID to a principal.
+    
+    Args:
+        firebase_uid: Firebase UID passed from frontend
+        db: Database session
+        
+    Returns:
+        Optional[Principal]: Resolved account, or None if no profile exists
+    """
+    return await get_cached_principal(db, firebase_uid)
+
+
+async def get_principals(
+    firebase_uid: str = Query(..., description="Firebase UID from frontend"),
+    db: AsyncSession = Depends(get_async_db)
+) -> List[Principal]:
+    """
+    Dependency resolving the request's Firebase UID to all of its accounts.
+    
+    For access checks that must accept the UID as either side, such as an
+    appointment between a business and a client sharing one Firebase UID.
+    
+    Args:
+        firebase_uid: Firebase UID passed from frontend
+        db: Database session
+        
+    Returns:
+        List[Principal]: Resolved accounts, empty if no profile exists
+    """
+    return await get_cached_principals(db, firebase_uid)
+
+
+async def invalidate_principal(firebase_uid: str):
+    """
+    Drop the cached principal and business ID for a Firebase UID.
+    Call whenever a client or business profile is created or deleted.
+    
+    Args:
+        firebase_uid: Firebase UID whose cached principal should be removed
+    """
+    await cache_delete(_principal_cache_key(firebase_uid), _business_id_cache_key(firebase_uid))
+
+
 # For backward compatibility - remove Firebase token validation
 async def get_current_firebase_user() -> dict:
     """
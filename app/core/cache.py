@@ -0,0 +1,219 @@
+"""
+Redis cache helpers for Bookora.
+
+This module provides a shared asyncio Redis client and small JSON
+get/set/delete helpers for caching hot, read-mostly lookups, plus raw
+byte helpers for responses cached already serialized.
+Cache failures are logged and treated as misses so that a Redis
+outage never fails a request.
+"""
+
+from typing import Any, Optional
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+import logging
+import orjson
+
+from app.core.config import settings
+from app.core.credentials import get_redis_url
+
+logger = logging.getLogger(__name__)
+
+_redis: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> aioredis.Redis:
+    """
+    Get the shared Redis client, creating it on first use.
+
+    Returns:
+        Redis: asyncio Redis client bound to REDIS_URL
+    """
+    global _redis
+    if _redis is None:
+        _redis = aioredis.from_url(
+            get_redis_url(),
+            socket_connect_timeout=settings.CACHE_SOCKET_TIMEOUT,
+            socket_timeout=settings.CACHE_SOCKET_TIMEOUT,
+        )
+    return _redis
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """
+    Get a JSON value from the cache.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Optional[Any]: Decoded value, or None on a miss or cache error
+    """
+    if not settings.CACHE_ENABLED:
+        return None
+
+    try:
+        raw = await get_redis().get(key)
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cache get failed for {key}: {e}")
+        return None
+
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def cache_set(key: str, value: Any, ttl: int):
+    """
+    Store a JSON-serializable value in the cache.
+
+    Args:
+        key: Cache key
+        value: Value to store (serialized with orjson)
+        ttl: Time to live in seconds
+    """
+    if not settings.CACHE_ENABLED:
+        return
+
+    try:
+        await get_redis().set(key, orjson.dumps(value), ex=ttl)
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cache set failed for {key}: {e}")
+
+
+async def cache_get_bytes(key: str) -> Optional[bytes]:
+    """
+    Get a raw value from the cache, for payloads stored already encoded.
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Optional[bytes]: Stored bytes, or None on a miss or cache error
+    """
+    if not settings.CACHE_ENABLED:
+        return None
+
+    try:
+        return await get_redis().get(key)
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cache get failed for {key}: {e}")
+        return None
+
+
+async def cache_set_bytes(key: str, value: bytes, ttl: int):
+    """
+    Store a raw value in the cache.
+
+    Args:
+        key: Cache key
+        value: Encoded payload
+        ttl: Time to live in seconds
+    """
+    if not settings.CACHE_ENABLED:
+        return
+
+    try:
+        await get_redis().set(key, value, ex=ttl)
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cache set failed for {key}: {e}")
+
+
+async def cache_add(key: str, ttl: float) -> bool:
+    """
+    Set a key only if it doesn't exist yet, as a short-lived lock.
+
+    Fails open: with caching disabled or Redis unavailable the caller is
+    told it holds the key, so work is never blocked on the cache.
+
+    Args:
+        key: Cache key
+        ttl: Time to live in seconds
+
+    Returns:
+        bool: False only if another holder already set the key
+    """
+    if not settings.CACHE_ENABLED:
+        return True
+
+    try:
+        return bool(await get_redis().set(key, b"1", px=int(ttl * 1000), nx=True))
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cache add failed for {key}: {e}")
+        return True
+
+
+async def cache_hget(key: str, field: str) -> Optional[Any]:
+    """
+    Get a JSON value from a field of a cached hash.
+
+    Args:
+        key: Cache key of the hash
+        field: Hash field
+
+    Returns:
+        Optional[Any]: Decoded value, or None on a miss or cache error
+    """
+    if not settings.CACHE_ENABLED:
+        return None
+
+    try:
+        raw = await get_redis().hget(key, field)
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cache hget failed for {key}[{field}]: {e}")
+        return None
+
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def cache_hset(key: str, field: str, value: Any, ttl: int):
+    """
+    Store a JSON-serializable value in a field of a cached hash.
+
+    The TTL is only applied when the hash has none yet, so adding fields
+    never extends the lifetime of the ones already cached.
+
+    Args:
+        key: Cache key of the hash
+        field: Hash field
+        value: Value to store (serialized with orjson)
+        ttl: Time to live of the hash in seconds
+    """
+    if not settings.CACHE_ENABLED:
+        return
+
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.hset(key, field, orjson.dumps(value))
+            pipe.expire(key, ttl, nx=True)
+            await pipe.execute()
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cache hset failed for {key}[{field}]: {e}")
+
+
+async def cache_delete(*keys: str):
+    """
+    Remove keys from the cache.
+
+    Args:
+        keys: Cache keys to delete
+    """
+    if not settings.CACHE_ENABLED or not keys:
+        return
+
+    try:
+        await get_redis().delete(*keys)
+    except (RedisError, OSError) as e:
+        logger.warning(f"Cache delete failed for {keys}: {e}")
+
+
+async def close_cache():
+    """
+    Close the shared Redis client.
+    Called during application shutdown.
+    """
+    global _redis
+    if _redis is not None:
+        try:
+            await _redis.aclose()
+        except (RedisError, OSError) as e:
+            logger.warning(f"Error closing cache connection: {e}")
+        _redis = None
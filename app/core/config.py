@@ -64,10 +64,34 @@ class Settings(BaseSettings):
     DATABASE_HOST: str = Field(default="localhost", env="DATABASE_HOST")
     DATABASE_PORT: int = Field(default=5432, env="DATABASE_PORT")
     DATABASE_NAME: str = Field(env="DATABASE_NAME")
+    DATABASE_REPLICA_URL: Optional[str] = Field(default=None, env="DATABASE_REPLICA_URL")  # Read replica; reads use the primary when unset
+    
+    # Connection Pool Configuration (per worker process)
+    DATABASE_POOL_SIZE: int = Field(default=20, env="DATABASE_POOL_SIZE")
+    DATABASE_MAX_OVERFLOW: int = Field(default=10, env="DATABASE_MAX_OVERFLOW")
+    DATABASE_POOL_TIMEOUT: int = Field(default=30, env="DATABASE_POOL_TIMEOUT")  # seconds
+    DATABASE_POOL_RECYCLE: int = Field(default=3600, env="DATABASE_POOL_RECYCLE")  # seconds before a connection is replaced
+    DATABASE_PGBOUNCER: bool = Field(default=False, env="DATABASE_PGBOUNCER")  # DATABASE_URL points at PgBouncer (transaction pooling)
+    DATABASE_RAISELOAD: bool = Field(default=True, env="DATABASE_RAISELOAD")  # fail on unplanned relationship lazy loads instead of querying
+    WEB_CONCURRENCY: int = Field(default=4, env="WEB_CONCURRENCY")  # API worker processes, for the startup connection budget check
     
     # Redis Configuration (for Celery and WebSocket)
     REDIS_URL: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
     
+    # Cache Configuration (Redis-backed, fails open when Redis is unavailable)
+    CACHE_ENABLED: bool = Field(default=True, env="CACHE_ENABLED")
+    CACHE_SOCKET_TIMEOUT: float = Field(default=0.5, env="CACHE_SOCKET_TIMEOUT")
+    PRINCIPAL_CACHE_TTL: int = Field(default=300, env="PRINCIPAL_CACHE_TTL")  # seconds; Firebase UID -> principal and business ID
+    CATALOG_CACHE_TTL: int = Field(default=300, env="CATALOG_CACHE_TTL")  # services, business profiles, hours and categories
+    CATEGORY_CACHE_TTL: int = Field(default=60, env="CATEGORY_CACHE_TTL")  # in-process business category list
+    AVAILABILITY_CACHE_TTL: int = Field(default=60, env="AVAILABILITY_CACHE_TTL")  # available-slots responses
+    CHAT_ROOM_CACHE_TTL: int = Field(default=3600, env="CHAT_ROOM_CACHE_TTL")  # chat room client/business membership, which never changes
+    SEARCH_CACHE_TTL: int = Field(default=30, env="SEARCH_CACHE_TTL")  # public business search responses
+    SEARCH_LOCK_TTL: float = Field(default=2.0, env="SEARCH_LOCK_TTL")  # seconds identical searches wait for the first one
+    ETAG_CACHE_TTL: int = Field(default=5, env="ETAG_CACHE_TTL")  # business profile, services and gallery ETags
+    RESPONSE_CACHE_TTL: int = Field(default=60, env="RESPONSE_CACHE_TTL")  # service gallery and client profile responses
+    PUBLIC_CACHE_MAX_AGE: int = Field(default=30, env="PUBLIC_CACHE_MAX_AGE")  # Cache-Control max-age of public business resources
+    
     # Firebase Configuration
     FIREBASE_PROJECT_ID: str = Field(default="", env="FIREBASE_PROJECT_ID")
     FIREBASE_PRIVATE_KEY_ID: str = Field(default="", env="FIREBASE_PRIVATE_KEY_ID")
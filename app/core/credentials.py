@@ -10,6 +10,7 @@ import json
 import tempfile
 import os
 from pathlib import Path
+from sqlalchemy.engine import make_url
 
 from app.core.config import settings
 
@@ -175,6 +176,28 @@ def get_database_url() -> str:
     return settings.DATABASE_URL
 
 
+def _with_async_driver(database_url: str) -> str:
+    """Swap a database URL's driver for its asyncio counterpart (asyncpg for PostgreSQL)."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    elif url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+
+def get_async_database_url() -> str:
+    """Get database URL with the asyncio driver."""
+    return _with_async_driver(settings.DATABASE_URL)
+
+
+def get_async_replica_database_url() -> Optional[str]:
+    """Get read replica URL with the asyncio driver, or None if no replica is configured."""
+    if not settings.DATABASE_REPLICA_URL:
+        return None
+    return _with_async_driver(settings.DATABASE_REPLICA_URL)
+
+
 def get_redis_url() -> str:
     """Get Redis URL."""
     return settings.REDIS_URL
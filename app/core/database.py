@@ -5,31 +5,117 @@ This module sets up SQLAlchemy with PostgreSQL and PostGIS support
 for location-based services and provides database session management.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import Select, create_engine, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import raiseload, sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 from geoalchemy2 import Geography
 import logging
+import uuid
 
-from app.core.credentials import get_database_url, is_development
+from app.core.config import settings
+from app.core.credentials import (
+    get_async_database_url, get_async_replica_database_url, get_database_url, is_development
+)
 
 logger = logging.getLogger(__name__)
 
+# Connection pool settings shared by the sync and async engines
+pool_options = {
+    "pool_size": settings.DATABASE_POOL_SIZE,
+    "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+    "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+    "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    "pool_pre_ping": True,
+    # Reuse the most recently returned connection first. Connections left over
+    # from a burst then sit untouched at the bottom of the stack until the
+    # server's (or PgBouncer's) idle timeout closes them; pool_recycle only
+    # applies at checkout, and pool_pre_ping reconnects one if it is reused
+    "pool_use_lifo": True,
+}
+
+# PgBouncer in transaction mode can hand each transaction a different server
+# connection, so asyncpg must not rely on named server-side prepared statements.
+async_connect_args = {}
+if settings.DATABASE_PGBOUNCER:
+    async_connect_args = {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
 # Create SQLAlchemy engine with PostGIS support
 engine = create_engine(
     get_database_url(),
-    pool_pre_ping=True,
+    **pool_options,
     echo=is_development(),  # Log SQL queries in debug mode
 )
 
 # Create SessionLocal class for database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for request handlers, so queries don't block the event loop.
+# The sync engine above is kept for schema creation and Celery tasks.
+async_engine = create_async_engine(
+    get_async_database_url(),
+    poolclass=AsyncAdaptedQueuePool,  # explicit, so pool_options always apply to an asyncio-safe queue pool
+    **pool_options,
+    connect_args=async_connect_args,
+    query_cache_size=1200,  # keep compiled forms of the hot statements resident
+    echo=is_development(),
+)
+
+# Create AsyncSessionLocal class for async database sessions
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Read replica engine for read-only endpoints; falls back to the primary
+replica_url = get_async_replica_database_url()
+replica_engine = create_async_engine(
+    replica_url,
+    poolclass=AsyncAdaptedQueuePool,
+    **pool_options,
+    connect_args=async_connect_args,
+    query_cache_size=1200,
+    echo=is_development(),
+) if replica_url else async_engine
+
+ReplicaSessionLocal = async_sessionmaker(
+    bind=replica_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Create Base class for models
 Base = declarative_base()
 
 
+def safe_select(*entities) -> Select:
+    """
+    Build a SELECT whose relationships raise instead of lazy loading.
+    
+    Relationships a handler renders must be loaded with explicit loader
+    options (selectinload, joinedload, contains_eager), which override the
+    wildcard; touching any other relationship raises rather than silently
+    issuing one query per row. Many-to-one lookups answered from the
+    identity map are still allowed. Disabled with DATABASE_RAISELOAD=false.
+    
+    Args:
+        *entities: Models and columns to select
+        
+    Returns:
+        Select: The statement
+    """
+    stmt = select(*entities)
+    if settings.DATABASE_RAISELOAD:
+        stmt = stmt.options(raiseload("*", sql_only=True))
+    return stmt
+
+
 def get_db() -> Session:
     """
     Dependency function to get database session.
@@ -37,16 +123,110 @@ def get_db() -> Session:
     This function creates a new SQLAlchemy SessionLocal that will
     be used in a single request, and then close it once the request is finished.
     
+    Objects are not expired on commit, as with the async sessions: models
+    fetch server-generated values with RETURNING (eager_defaults), so a
+    handler can serialize what it just wrote without a refresh() SELECT.
+    Closing the session rolls back anything left uncommitted by an error.
+    
     Yields:
         Session: SQLAlchemy database session
     """
-    db = SessionLocal()
+    db = SessionLocal(expire_on_commit=False)
     try:
         yield db
     finally:
         db.close()
 
 
+async def get_async_db() -> AsyncSession:
+    """
+    Dependency function to get an async database session.
+    
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_replica_db() -> AsyncSession:
+    """
+    Dependency function to get an async session on the read replica.
+    
+    Only use for endpoints that never write; results may lag the primary
+    by the replication delay.
+    
+    Yields:
+        AsyncSession: SQLAlchemy async database session bound to the replica
+    """
+    async with ReplicaSessionLocal() as db:
+        yield db
+
+
+def pool_metrics() -> str:
+    """
+    Render connection pool gauges in the Prometheus text exposition format.
+
+    Reports checked-out and overflow connections for each engine, so pool
+    exhaustion shows up before requests start waiting on pool_timeout.
+
+    Returns:
+        str: Prometheus metrics text
+    """
+    engines = {"primary": async_engine.sync_engine.pool, "sync": engine.pool}
+    if replica_engine is not async_engine:
+        engines["replica"] = replica_engine.sync_engine.pool
+
+    gauges = {
+        "bookora_db_pool_size": ("Configured pool size", lambda pool: pool.size()),
+        "bookora_db_pool_checked_out": ("Connections currently checked out", lambda pool: pool.checkedout()),
+        "bookora_db_pool_checked_in": ("Idle connections in the pool", lambda pool: pool.checkedin()),
+        "bookora_db_pool_overflow": ("Connections open beyond pool_size", lambda pool: max(pool.overflow(), 0)),
+    }
+
+    lines = []
+    for name, (help_text, read) in gauges.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for label, pool in engines.items():
+            lines.append(f'{name}{{engine="{label}"}} {read(pool)}')
+
+    return "\n".join(lines) + "\n"
+
+
+def check_connection_budget():
+    """
+    Warn when the configured pools could open more connections than the server allows.
+    
+    Every API worker can hold pool_size + max_overflow connections on each
+    engine; if all of them together exceed max_connections, requests fail
+    under load instead of waiting in the pool. Skipped behind PgBouncer,
+    which multiplexes client connections onto its own server pool.
+    """
+    if settings.DATABASE_PGBOUNCER:
+        return
+    
+    # The sync and async engines both connect to the primary; a replica has
+    # its own max_connections
+    per_worker = 2 * (settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW)
+    budget = per_worker * settings.WEB_CONCURRENCY
+    
+    try:
+        with engine.connect() as connection:
+            max_connections = int(connection.execute(text("SHOW max_connections")).scalar())
+    except Exception as e:
+        logger.warning(f"Could not check the connection budget: {e}")
+        return
+    
+    if budget > max_connections:
+        logger.warning(
+            f"Connection pools may open {budget} connections "
+            f"({per_worker} per worker x {settings.WEB_CONCURRENCY} workers) "
+            f"but max_connections is {max_connections}; lower DATABASE_POOL_SIZE / "
+            f"DATABASE_MAX_OVERFLOW or put PgBouncer in front of the database"
+        )
+
+
 async def init_db():
     """
     Initialize database tables.
@@ -76,6 +256,9 @@ async def close_db():
     """
     try:
         engine.dispose()
+        await async_engine.dispose()
+        if replica_engine is not async_engine:
+            await replica_engine.dispose()
         logger.info("Database connections closed")
     except Exception as e:
         logger.error(f"Error closing database connections: {e}")
\ No newline at end of file
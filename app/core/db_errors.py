@@ -0,0 +1,37 @@
+"""
+Database error helpers for Bookora API endpoints.
+
+Writes rely on PostgreSQL constraints instead of checking first, so the
+violations they raise are mapped back to client errors here.
+"""
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Mapping
+
+# PostgreSQL SQLSTATE raised when a unique index rejects a write
+UNIQUE_VIOLATION = "23505"
+
+# PostgreSQL SQLSTATE raised when an exclusion constraint rejects a write
+EXCLUSION_VIOLATION = "23P01"
+
+
+async def raise_if_duplicate(db: AsyncSession, e: IntegrityError, details: Mapping[str, str]):
+    """
+    Roll back a failed write, mapping unique index violations to 400.
+
+    Args:
+        db: Database session the write failed in
+        e: Error raised by the write
+        details: Error detail reported for each unique index name
+
+    Raises:
+        HTTPException: 400 if the write collided with one of the given indexes
+        IntegrityError: Any other integrity error, unchanged
+    """
+    await db.rollback()
+    constraint = getattr(e.orig.__cause__, "constraint_name", None)
+    if getattr(e.orig, "pgcode", None) == UNIQUE_VIOLATION and constraint in details:
+        raise HTTPException(status_code=400, detail=details[constraint])
+    raise e
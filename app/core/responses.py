@@ -0,0 +1,55 @@
+"""
+JSON response helpers for Bookora API endpoints.
+
+Routes keep their response_model for the OpenAPI schema, but return a
+Response built here so the payload is validated and serialized once in
+pydantic-core instead of going through FastAPI's response_model pass again.
+Plain data the endpoint assembled itself skips validation altogether.
+"""
+
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, Iterable
+
+
+def json_response(content: BaseModel) -> Response:
+    """
+    Serialize an already validated response model to JSON.
+
+    Args:
+        content: Validated response model
+
+    Returns:
+        Response: JSON response
+    """
+    return Response(content.model_dump_json(), media_type="application/json")
+
+
+def json_list_response(adapter: TypeAdapter, rows: Iterable[Any]) -> Response:
+    """
+    Validate ORM rows against a list schema and serialize them to JSON.
+
+    Args:
+        adapter: TypeAdapter for the list schema, built once at module level
+        rows: ORM objects to validate
+
+    Returns:
+        Response: JSON response
+    """
+    return Response(adapter.dump_json(adapter.validate_python(rows)), media_type="application/json")
+
+
+def json_data_response(content: Any) -> Response:
+    """
+    Serialize plain data (dicts and lists built from our own rows) to JSON.
+
+    The data is trusted as already matching the route's response_model, so
+    it is encoded with orjson directly without a validation pass.
+
+    Args:
+        content: JSON-compatible data; UUIDs, dates and Decimals are allowed
+
+    Returns:
+        Response: JSON response
+    """
+    return ORJSONResponse(content)
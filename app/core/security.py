@@ -8,7 +8,7 @@ for the Bookora REST API.
 from fastapi import Request, Response, HTTPException
 from fastapi.security import HTTPBearer
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import time
 
 from app.core.config import settings
@@ -46,7 +46,7 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
         api_key = request.headers.get("X-API-Key")
         
         if not api_key:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=401,
                 content={
                     "detail": "API key required",
@@ -56,7 +56,7 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
         
         # Validate API key
         if api_key != settings.API_KEY:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=403,
                 content={
                     "detail": "Invalid API key",
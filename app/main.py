@@ -9,14 +9,15 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 import time
 import logging
 
 from app.core.config import settings
 from app.core.security import APIKeyMiddleware
-from app.api.v1.api import api_router
-from app.core.database import engine
+from app.api.v1 import api_router
+from app.core.cache import close_cache
+from app.core.database import check_connection_budget, close_db, engine, pool_metrics
 from app.models import Base
 
 # Configure logging
@@ -41,10 +42,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Failed to create database tables (continuing without DB): {e}")
     
+    check_connection_budget()
+    
     yield
     
     # Shutdown events
     logger.info("Shutting down Bookora API...")
+    await close_cache()
+    await close_db()
 
 
 # Create FastAPI application
@@ -53,7 +58,8 @@ app_kwargs = {
     "title": "Bookora API",
     "description": "Multi-tenant appointment booking REST API for businesses and clients",
     "version": "1.0.0",
-    "lifespan": lifespan
+    "lifespan": lifespan,
+    "default_response_class": ORJSONResponse  # orjson encodes datetimes, UUIDs and Decimals natively
 }
 
 # Configure URLs based on environment
@@ -178,13 +184,20 @@ async def health_check():
     }
 
 
+# Metrics endpoint (Prometheus scrape target; requires the API key)
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics():
+    """Database connection pool gauges in Prometheus text format."""
+    return pool_metrics()
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for unhandled errors."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal server error",
@@ -5,13 +5,16 @@ This module contains all models related to appointments, including
 appointment status, scheduling, and appointment history.
 """
 
-from sqlalchemy import Column, String, Text, Boolean, Integer, DateTime, ForeignKey, Enum as SQLEnum, DECIMAL
+from sqlalchemy import Column, String, Text, Boolean, Integer, DateTime, ForeignKey, Enum as SQLEnum, DECIMAL, DDL, Index, Computed, event
+from sqlalchemy.dialects.postgresql import TSTZRANGE, ExcludeConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum
 from datetime import datetime, timedelta
 from typing import Optional
+import random
+import string
 import uuid
 
 from app.models.base import BaseModel
@@ -28,6 +31,21 @@ class AppointmentStatus(str, Enum):
     RESCHEDULED = "rescheduled"  # Appointment was rescheduled
 
 
+# Statuses that hold a time slot on the business calendar
+ACTIVE_APPOINTMENT_STATUSES = (AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED)
+
+
+# Confirmation codes are random; uniqueness is enforced by the column's
+# unique constraint, never by a lookup at booking time.
+CONFIRMATION_CODE_ALPHABET = string.ascii_uppercase + string.digits
+CONFIRMATION_CODE_LENGTH = 8
+
+
+def new_confirmation_code() -> str:
+    """Generate a random appointment confirmation code."""
+    return ''.join(random.choices(CONFIRMATION_CODE_ALPHABET, k=CONFIRMATION_CODE_LENGTH))
+
+
 class CancellationReason(str, Enum):
     """Enumeration for cancellation reasons."""
     CLIENT_REQUEST = "client_request"
@@ -49,17 +67,24 @@ class Appointment(BaseModel):
     __tablename__ = "appointments"
     
     # Related Entities
-    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
-    business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False, index=True)
+    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False)
+    business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False)
     service_id = Column(UUID(as_uuid=True), ForeignKey("services.id"), nullable=False)
     
     # Appointment Details
     appointment_date = Column(DateTime(timezone=True), nullable=False, index=True)
     duration_minutes = Column(Integer, nullable=False, comment="Appointment duration in minutes")
+    appointment_range = Column(
+        TSTZRANGE,
+        Computed("appointment_period(appointment_date, duration_minutes)", persisted=True),
+        comment="Occupied time range, used for overlap checks"
+    )
     
     # Status and Tracking
     status = Column(SQLEnum(AppointmentStatus), default=AppointmentStatus.PENDING, nullable=False, index=True)
-    confirmation_code = Column(String(20), unique=True, nullable=True, comment="Unique confirmation code")
+    confirmation_code = Column(
+        String(20), unique=True, nullable=True, default=new_confirmation_code, comment="Unique confirmation code"
+    )
     
     # Pricing
     service_price = Column(DECIMAL(10, 2), nullable=True, comment="Price at time of booking")
@@ -147,11 +172,8 @@ class Appointment(BaseModel):
         return None
     
     def generate_confirmation_code(self) -> str:
-        """Generate a unique confirmation code for the appointment."""
-        import random
-        import string
-        
-        code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
+        """Generate a new confirmation code for the appointment."""
+        code = new_confirmation_code()
         self.confirmation_code = code
         return code
     
@@ -196,4 +218,54 @@ class Appointment(BaseModel):
         return new_appointment
     
     def __repr__(self):
-        return f"<Appointment(id={self.id}, client={self.client.full_name if self.client else 'None'}, business={self.business.name if self.business else 'None'}, date={self.appointment_date}, status={self.status})>"
\ No newline at end of file
+        return f"<Appointment(id={self.id}, client={self.client.full_name if self.client else 'None'}, business={self.business.name if self.business else 'None'}, date={self.appointment_date}, status={self.status})>"
+
+
+# Appointment time range as a tstzrange. Postgres only marks
+# ``timestamptz + interval`` as STABLE, so this IMMUTABLE wrapper is what
+# allows the range to back the generated appointment_range column.
+appointment_period_function = DDL("""
+CREATE OR REPLACE FUNCTION appointment_period(start_at timestamptz, minutes integer)
+RETURNS tstzrange
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$ SELECT tstzrange(start_at, start_at + make_interval(mins => minutes)) $$
+""")
+
+event.listen(
+    Appointment.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql")
+)
+event.listen(
+    Appointment.__table__,
+    "before_create",
+    appointment_period_function.execute_if(dialect="postgresql")
+)
+
+# Composite indexes serving the per-client and per-business appointment
+# listings, ordered newest first (also cover plain client_id/business_id lookups).
+Index("ix_appointments_client_date", Appointment.client_id, Appointment.appointment_date.desc())
+Index("ix_appointments_business_date", Appointment.business_id, Appointment.appointment_date.desc())
+
+# Partial index over the slot-holding appointments only, for business date
+# range lookups that skip cancelled/completed history (reminders, open slots).
+Index(
+    "ix_appointments_business_date_active",
+    Appointment.business_id,
+    Appointment.appointment_date,
+    postgresql_where=Appointment.status.in_(ACTIVE_APPOINTMENT_STATUSES)
+)
+
+# No two pending/confirmed appointments of a business may overlap. The
+# constraint makes double-booking impossible regardless of concurrency, and
+# its GiST index on (business, period) also serves the && overlap checks in
+# slot availability.
+Appointment.__table__.append_constraint(
+    ExcludeConstraint(
+        (Appointment.business_id, "="),
+        (Appointment.appointment_range, "&&"),
+        name="excl_appointments_no_overlap",
+        using="gist",
+        where="status IN ({})".format(", ".join(f"'{status.name}'" for status in ACTIVE_APPOINTMENT_STATUSES))
+    ).ddl_if(dialect="postgresql")
+)
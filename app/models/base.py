@@ -5,30 +5,88 @@ This module contains abstract base models and mixins that provide
 common functionality across different domain models.
 """
 
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Float
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Float, DDL, FetchedValue, and_, bindparam, cast, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
-from geoalchemy2 import Geography
+from geoalchemy2 import Geography, WKTElement
 from datetime import datetime
+import math
+import os
+import time
 import uuid
 
 from app.core.database import Base
 
+# Mean Earth radius used to convert search radii to degrees
+EARTH_RADIUS_M = 6371008.8
+
+
+def location_point(latitude: float, longitude: float) -> WKTElement:
+    """Geography point (SRID 4326) value for a pair of coordinates."""
+    return WKTElement(f"POINT({longitude} {latitude})", srid=4326)
+
+
+def geography_point(latitude: float, longitude: float):
+    """
+    Geography point (SRID 4326) bound as a single query parameter.
+    
+    Every condition and ordering that uses the returned expression refers
+    to the same parameter, so the point is parsed once per query instead
+    of being rebuilt with ST_MakePoint wherever it appears.
+    
+    Args:
+        latitude: Latitude of the point
+        longitude: Longitude of the point
+        
+    Returns:
+        Bound parameter usable in place of a geography column
+    """
+    return bindparam(
+        "point",
+        location_point(latitude, longitude),
+        type_=Geography(geometry_type="POINT", srid=4326)
+    )
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+    
+    The first 48 bits are the Unix time in milliseconds and the rest is
+    random, so new primary keys land next to each other at the right edge
+    of the btree instead of on random pages, while staying as hard to guess
+    as version 4 IDs within each millisecond.
+    
+    Returns:
+        uuid.UUID: Version 7 UUID
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 9562 variant
+    return uuid.UUID(int=value)
+
 
 class BaseModel(Base):
     """
     Abstract base model that provides common fields for all entities.
     
     Includes:
-    - UUID primary key for better security and distributed systems
+    - Time-ordered UUID primary key for better security and distributed systems
     - Created and updated timestamps for audit trails
     - Soft delete functionality for data integrity
     """
     __abstract__ = True
+    # Fetch server-generated timestamps with RETURNING during the flush, so
+    # callers don't need a refresh() round trip after commit. updated_at is
+    # maintained by the touch_updated_at trigger on every UPDATE.
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    # The primary key constraint is the only index id needs; a separate
+    # index=True copy would double the write and cache cost of every key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     is_deleted = Column(Boolean, default=False, nullable=False)  # Soft delete
     
     def __repr__(self):
@@ -80,6 +138,52 @@ class LocationMixin:
         """Get formatted full address."""
         parts = [self.address, self.city, self.state, self.postal_code, self.country]
         return ', '.join(filter(None, parts))
+    
+    @classmethod
+    def within_radius(cls, latitude: float, longitude: float, radius_m: float, point=None):
+        """
+        SQL condition matching rows located within radius_m meters of a point.
+        
+        The spherical distance check is preceded by an explicit && against
+        the latitude/longitude box enclosing the circle, so the GiST index
+        discards far away rows on bounding boxes alone. The box is skipped
+        when the circle reaches a pole or the antimeridian, where it can't
+        be expressed as a single envelope.
+        
+        Args:
+            latitude: Latitude of the center point
+            longitude: Longitude of the center point
+            radius_m: Search radius in meters
+            point: geography_point for the center, when the query already
+                binds one for ordering or distances
+            
+        Returns:
+            SQL boolean expression usable in a WHERE clause
+        """
+        if point is None:
+            point = geography_point(latitude, longitude)
+        within = func.ST_DWithin(cls.location, point, radius_m)
+        
+        # Angular radius with a margin for the spheroid's flattening; the
+        # longitude half-width is the widest point of the circle at this latitude
+        angle = radius_m * 1.01 / EARTH_RADIUS_M
+        lat_delta = math.degrees(angle)
+        cos_lat = math.cos(math.radians(latitude))
+        if abs(latitude) + lat_delta >= 90 or math.sin(angle) >= cos_lat:
+            return within
+        lon_delta = math.degrees(math.asin(math.sin(angle) / cos_lat))
+        if abs(longitude) + lon_delta >= 180:
+            return within
+        
+        box = cast(
+            func.ST_MakeEnvelope(
+                longitude - lon_delta, latitude - lat_delta,
+                longitude + lon_delta, latitude + lat_delta,
+                4326
+            ),
+            Geography(srid=4326)
+        )
+        return and_(cls.location.op("&&")(box), within)
 
 
 class FirebaseUserMixin:
@@ -124,6 +228,42 @@ class TimestampedModel(Base):
     Lighter version of BaseModel without UUID and soft delete.
     """
     __abstract__ = True
+    __mapper_args__ = {"eager_defaults": True}
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
+
+
+# updated_at is set by the database on every UPDATE, including bulk and
+# upsert statements, instead of by a SET clause the application must add
+_TOUCH_UPDATED_AT_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+""")
+event.listen(Base.metadata, "before_create", _TOUCH_UPDATED_AT_FUNCTION.execute_if(dialect="postgresql"))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_updated_at_triggers(metadata, connection, **kw):
+    """
+    Attach the touch_updated_at trigger to every table with an updated_at column.
+    
+    Runs for all tables, not only newly created ones, so databases created
+    before the trigger existed get it on the next create_all.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    
+    for table in metadata.sorted_tables:
+        if "updated_at" not in table.c:
+            continue
+        trigger = f"{table.name}_touch_updated_at"
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger} ON {table.name}"))
+        connection.execute(text(
+            f"CREATE TRIGGER {trigger} BEFORE UPDATE ON {table.name} "
+            f"FOR EACH ROW EXECUTE FUNCTION touch_updated_at()"
+        ))
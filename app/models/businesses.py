@@ -8,9 +8,9 @@ This module contains all models related to businesses, including:
 - Business settings and preferences
 """
 
-from sqlalchemy import Column, String, Text, Boolean, Integer, Float, Time, ForeignKey, Enum as SQLEnum, DECIMAL
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, cast, func, Text, Boolean, Integer, Float, Time, ForeignKey, Enum as SQLEnum, DECIMAL, Index, UniqueConstraint, and_, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from enum import Enum
 from typing import List, Optional
@@ -39,6 +39,10 @@ class WeekDay(str, Enum):
     SUNDAY = "sunday"
 
 
+# WeekDay members indexed by date.weekday() (0=Monday, 6=Sunday)
+WEEKDAYS = tuple(WeekDay)
+
+
 class BusinessCategory(BaseModel):
     """
     Model for business categories (Hair Salon, Spa, Dentist, etc.).
@@ -69,6 +73,17 @@ class Business(BaseModel, LocationMixin, FirebaseUserMixin):
     about a business including location, contact details, and settings.
     """
     __tablename__ = "businesses"
+    # Vacuum after 2% of rows change rather than the default 20%, keeping the
+    # visibility map current so firebase_uid lookups stay index-only scans
+    __table_args__ = {
+        "postgresql_with": {
+            "autovacuum_vacuum_scale_factor": 0.02,
+            "autovacuum_analyze_scale_factor": 0.01,
+        }
+    }
+    
+    # Indexed by ix_businesses_firebase_uid below instead of the mixin's plain unique index
+    firebase_uid = Column(String(128), nullable=False, comment="Firebase User ID for authentication")
     
     # Basic Information
     name = Column(String(200), nullable=False, index=True)
@@ -110,12 +125,23 @@ class Business(BaseModel, LocationMixin, FirebaseUserMixin):
     push_notifications = Column(Boolean, default=True)
     sms_notifications = Column(Boolean, default=False)
     
+    # Full-text search document over name and description, maintained by
+    # PostgreSQL; deferred so it is never loaded with the row
+    search_tsv = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))", persisted=True)
+    ))
+    
     # Relationships
+    # Collections are never lazy loaded: queries that need them must eager-load
+    # explicitly, so an accidental per-row load fails instead of issuing N queries.
     category = relationship("BusinessCategory", back_populates="businesses")
-    services = relationship("Service", back_populates="business", cascade="all, delete-orphan")
-    business_hours = relationship("BusinessHours", back_populates="business", cascade="all, delete-orphan")
-    appointments = relationship("Appointment", back_populates="business")
-    staff_members = relationship("StaffMember", back_populates="business", cascade="all, delete-orphan")
+    services = relationship("Service", back_populates="business", cascade="all, delete-orphan", lazy="raise")
+    business_hours = relationship("BusinessHours", back_populates="business", cascade="all, delete-orphan", lazy="raise")
+    appointments = relationship("Appointment", back_populates="business", lazy="raise")
+    staff_members = relationship("StaffMember", back_populates="business", cascade="all, delete-orphan", lazy="raise")
+    gallery_images = relationship("BusinessGallery", back_populates="business", lazy="raise")
+    favorited_by = relationship("FavoriteBusiness", back_populates="business", lazy="raise")
     
     @hybrid_property
     def booking_url(self) -> str:
@@ -124,10 +150,51 @@ class Business(BaseModel, LocationMixin, FirebaseUserMixin):
             return f"https://bookora.com/book/{self.booking_slug}"
         return f"https://bookora.com/book/{self.id}"
     
+    @booking_url.expression
+    def booking_url(cls):
+        """SQL form of booking_url, for queries that select columns instead of rows."""
+        return func.concat("https://bookora.com/book/", func.coalesce(cls.booking_slug, cast(cls.id, String)))
+    
     def __repr__(self):
         return f"<Business(name='{self.name}', category='{self.category.name if self.category else 'None'}')>"
 
 
+# Ownership checks resolve a Firebase UID to the business ID (and the email or
+# active flag) on nearly every request; covering those columns lets the lookup
+# be answered by an index-only scan without visiting the heap
+Index(
+    "ix_businesses_firebase_uid",
+    Business.firebase_uid,
+    unique=True,
+    postgresql_include=["id", "email", "is_active"]
+)
+
+# Rating that listings are ranked by, with unrated businesses ranked as 0.
+# The zero is inlined rather than bound so that queries ordering by this
+# expression match the index expressions below
+LISTING_RATING = func.coalesce(Business.average_rating, literal_column("0"))
+
+# Category browsing and search only ever consider listed businesses, best
+# rated first; both indexes end in the (rating, id) keyset order so a page
+# is read straight off the index without sorting the listed rows
+Index(
+    "ix_businesses_listed_category",
+    Business.category_id,
+    LISTING_RATING.desc(),
+    Business.id.desc(),
+    postgresql_where=and_(Business.is_active == True, Business.is_approved == True)
+)
+Index(
+    "ix_businesses_listed_rating",
+    LISTING_RATING.desc(),
+    Business.id.desc(),
+    postgresql_where=and_(Business.is_active == True, Business.is_approved == True)
+)
+
+# Business text search matches against the full-text document
+Index("ix_businesses_search_tsv", Business.search_tsv, postgresql_using="gin")
+
+
 class Service(BaseModel):
     """
     Model for services offered by a business.
@@ -163,11 +230,24 @@ class Service(BaseModel):
     # Relationships
     business = relationship("Business", back_populates="services")
     appointments = relationship("Appointment", back_populates="service")
+    gallery_images = relationship("ServiceGallery", back_populates="service")
     
     def __repr__(self):
         return f"<Service(name='{self.name}', business='{self.business.name if self.business else 'None'}')>"
 
 
+# Per-business service lookups, plus a partial index matching the public
+# listing's filter (active services) and sort order
+Index("ix_services_business", Service.business_id)
+Index(
+    "ix_services_business_active",
+    Service.business_id,
+    Service.sort_order,
+    Service.name,
+    postgresql_where=Service.is_active == True
+)
+
+
 class BusinessHours(BaseModel):
     """
     Model for business operating hours.
@@ -190,6 +270,11 @@ class BusinessHours(BaseModel):
     break_start = Column(Time, nullable=True)
     break_end = Column(Time, nullable=True)
     
+    # One schedule row per business and day (also the batch upsert's conflict target)
+    __table_args__ = (
+        UniqueConstraint('business_id', 'day_of_week', name='uq_business_hours_business_day'),
+    )
+    
     # Relationships
     business = relationship("Business", back_populates="business_hours")
     
@@ -208,7 +293,7 @@ class BusinessGallery(BaseModel):
     """
     __tablename__ = "business_gallery"
     
-    business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False, index=True)
+    business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False)
     
     # Image details
     image_url = Column(String(500), nullable=False, comment="Image URL")
@@ -224,12 +309,22 @@ class BusinessGallery(BaseModel):
     image_type = Column(String(50), nullable=True, comment="Type: exterior, interior, work_sample, team, etc.")
     
     # Relationships
-    business = relationship("Business", backref="gallery_images")
+    business = relationship("Business", back_populates="gallery_images")
     
     def __repr__(self):
         return f"<BusinessGallery(business={self.business.name if self.business else 'None'}, title='{self.image_title}')>"
 
 
+# Gallery listings filter by business and sort by display order, so the
+# index returns rows already ordered
+Index(
+    "ix_business_gallery_business_sort",
+    BusinessGallery.business_id,
+    BusinessGallery.sort_order,
+    BusinessGallery.created_at
+)
+
+
 class ServiceGallery(BaseModel):
     """
     Model for service photo gallery.
@@ -239,7 +334,7 @@ class ServiceGallery(BaseModel):
     """
     __tablename__ = "service_gallery"
     
-    service_id = Column(UUID(as_uuid=True), ForeignKey("services.id"), nullable=False, index=True)
+    service_id = Column(UUID(as_uuid=True), ForeignKey("services.id"), nullable=False)
     
     # Image details
     image_url = Column(String(500), nullable=False, comment="Image URL")
@@ -255,7 +350,12 @@ class ServiceGallery(BaseModel):
     image_type = Column(String(50), nullable=True, comment="Type: before, after, in_progress, result, etc.")
     
     # Relationships
-    service = relationship("Service", backref="gallery_images")
+    service = relationship("Service", back_populates="gallery_images")
     
     def __repr__(self):
-        return f"<ServiceGallery(service={self.service.name if self.service else 'None'}, title='{self.image_title}')>"
\ No newline at end of file
+        return f"<ServiceGallery(service={self.service.name if self.service else 'None'}, title='{self.image_title}')>"
+
+
+# A service's gallery is listed in display order; the index returns it
+# already sorted and also serves lookups by service alone
+Index("ix_service_gallery_service_sort", ServiceGallery.service_id, ServiceGallery.sort_order, ServiceGallery.created_at)
@@ -5,7 +5,7 @@ This module contains all models related to clients/customers who
 book appointments with businesses.
 """
 
-from sqlalchemy import Column, String, Text, Boolean, Integer, Date, DECIMAL
+from sqlalchemy import Column, DDL, String, Text, Boolean, Integer, Date, DECIMAL, Index, event, func, literal_column
 from sqlalchemy.orm import relationship
 from datetime import date
 from typing import Optional
@@ -62,6 +62,9 @@ class Client(BaseModel, LocationMixin, FirebaseUserMixin):
     
     # Relationships
     appointments = relationship("Appointment", back_populates="client")
+    favorite_businesses = relationship("FavoriteBusiness", back_populates="client")
+    business_collections = relationship("BusinessCollection", back_populates="client")
+    payment_methods = relationship("PaymentMethod", back_populates="client")
     
     @property
     def full_name(self) -> str:
@@ -101,4 +104,28 @@ class Client(BaseModel, LocationMixin, FirebaseUserMixin):
         return max(0.0, min(10.0, score))  # Ensure score is between 0-10
     
     def __repr__(self):
-        return f"<Client(name='{self.full_name}', email='{self.email}')>"
\ No newline at end of file
+        return f"<Client(name='{self.full_name}', email='{self.email}')>"
+
+
+# Lower-cased "first last" name that client search matches substrings of.
+# Built with || rather than concat(), which isn't IMMUTABLE and so can't be
+# indexed. The space is inlined rather than bound so queries match the
+# trigram index below, which answers LIKE '%...%' on the expression
+CLIENT_NAME_SEARCH = func.lower(Client.first_name + literal_column("' '", String) + Client.last_name)
+
+event.listen(
+    Client.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+Index(
+    "ix_clients_name_trgm",
+    CLIENT_NAME_SEARCH.label("name_search"),
+    postgresql_using="gin",
+    postgresql_ops={"name_search": "gin_trgm_ops"}
+)
+
+# Phone numbers identify a client like their email does; registration and
+# profile updates rely on this index to reject duplicates
+Index("ix_clients_phone_number", Client.phone_number, unique=True)
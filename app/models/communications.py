@@ -5,12 +5,13 @@ This module contains models for real-time chat functionality
 between clients and businesses.
 """
 
-from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, Enum as SQLEnum, DateTime
+from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, Enum as SQLEnum, DateTime, Index, UniqueConstraint, and_, select
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import aliased, relationship
 from sqlalchemy.sql import func
 from enum import Enum
 from datetime import datetime
+from functools import lru_cache
 import uuid
 
 from app.models.base import BaseModel
@@ -41,9 +42,13 @@ class ChatRoom(BaseModel):
     communication and appointment-related messages.
     """
     __tablename__ = "chat_rooms"
+    __table_args__ = (
+        # One room per client-business pair; also serves lookups by client
+        UniqueConstraint("client_id", "business_id", name="uq_chat_rooms_client_business"),
+    )
     
     # Participants
-    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
+    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False)
     business_id = Column(UUID(as_uuid=True), ForeignKey("businesses.id"), nullable=False, index=True)
     
     # Room Details
@@ -61,14 +66,19 @@ class ChatRoom(BaseModel):
     # Relationships
     client = relationship("Client")
     business = relationship("Business")
-    messages = relationship("ChatMessage", back_populates="chat_room", cascade="all, delete-orphan", order_by="ChatMessage.created_at")
+    messages = relationship("ChatMessage", back_populates="chat_room", cascade="all, delete-orphan", order_by="[ChatMessage.created_at, ChatMessage.id]")
     
     @property
     def latest_message(self):
-        """Get the latest message in this chat room."""
-        if self.messages:
-            return self.messages[-1]
-        return None
+        """
+        Get the latest message in this chat room.
+        
+        Read from the messages collection when it is already loaded, and
+        otherwise from last_message, which loads just that one message.
+        """
+        if "messages" in self.__dict__:
+            return self.messages[-1] if self.messages else None
+        return self.last_message
     
     def mark_read_by_client(self):
         """Mark all messages as read by client."""
@@ -102,7 +112,7 @@ class ChatMessage(BaseModel):
     __tablename__ = "chat_messages"
     
     # Room and Sender
-    chat_room_id = Column(UUID(as_uuid=True), ForeignKey("chat_rooms.id"), nullable=False, index=True)
+    chat_room_id = Column(UUID(as_uuid=True), ForeignKey("chat_rooms.id"), nullable=False)
     sender_firebase_uid = Column(String(128), nullable=False, comment="Firebase UID of message sender")
     is_from_client = Column(Boolean, nullable=False, comment="True if sent by client, False if sent by business")
     
@@ -175,4 +185,42 @@ class ChatMessage(BaseModel):
     
     def __repr__(self):
         content_preview = self.content[:50] + "..." if len(self.content) > 50 else self.content
-        return f"<ChatMessage(sender={self.sender_name}, type={self.message_type}, content='{content_preview}')>"
\ No newline at end of file
+        return f"<ChatMessage(sender={self.sender_name}, type={self.message_type}, content='{content_preview}')>"
+
+
+# Messages are paged newest first within a room, with the ID breaking ties
+# between messages created at the same instant; the index also serves
+# lookups by room alone
+Index(
+    "ix_chat_messages_room_created",
+    ChatMessage.chat_room_id, ChatMessage.created_at.desc(), ChatMessage.id.desc()
+)
+
+
+# Each room's latest message, for room listings that show it without
+# loading the whole conversation; selectinload fetches it for a page of
+# rooms in one query, with the room filter pushed below the window
+_latest_messages = select(
+    ChatMessage,
+    func.row_number().over(
+        partition_by=ChatMessage.chat_room_id,
+        order_by=(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+    ).label("row_number")
+).subquery()
+
+
+@lru_cache(maxsize=None)
+def _latest_chat_message():
+    """ChatMessage mapped onto the ranked subquery; aliased once mappers are configured."""
+    return aliased(ChatMessage, _latest_messages)
+
+
+ChatRoom.last_message = relationship(
+    _latest_chat_message,
+    primaryjoin=lambda: and_(
+        _latest_chat_message().chat_room_id == ChatRoom.id,
+        _latest_messages.c.row_number == 1
+    ),
+    uselist=False,
+    viewonly=True
+)
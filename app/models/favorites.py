@@ -40,8 +40,8 @@ class FavoriteBusiness(BaseModel):
     )
     
     # Relationships
-    client = relationship("Client", backref="favorite_businesses")
-    business = relationship("Business", backref="favorited_by")
+    client = relationship("Client", back_populates="favorite_businesses")
+    business = relationship("Business", back_populates="favorited_by")
     
     def __repr__(self):
         client_name = self.client.full_name if self.client else "Unknown"
@@ -72,7 +72,7 @@ class BusinessCollection(BaseModel):
     is_private = Column(Boolean, default=True, nullable=False)
     
     # Relationships
-    client = relationship("Client", backref="business_collections")
+    client = relationship("Client", back_populates="business_collections")
     businesses = relationship("BusinessCollectionItem", back_populates="collection", cascade="all, delete-orphan")
     
     def __repr__(self):
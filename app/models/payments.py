@@ -82,7 +82,7 @@ class PaymentMethod(BaseModel):
     billing_country = Column(String(100), nullable=True)
     
     # Relationships
-    client = relationship("Client", backref="payment_methods")
+    client = relationship("Client", back_populates="payment_methods")
     transactions = relationship("PaymentTransaction", back_populates="payment_method")
     
     @property
@@ -4,7 +4,7 @@ Pydantic schemas for appointment-related API endpoints.
 
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 import uuid
 
@@ -99,4 +99,14 @@ class AppointmentListResponse(BaseModel):
     appointments: List[AppointmentResponse]
     total: int
     skip: int
-    limit: int
\ No newline at end of file
+    limit: int
+
+
+class AvailableSlotsResponse(BaseModel):
+    """Response schema for a business's bookable time slots on a date."""
+    business_id: uuid.UUID
+    service_id: uuid.UUID
+    date: date
+    duration_minutes: int
+    slot_interval_minutes: int
+    slots: List[str] = Field(default_factory=list, description="Slot start times (HH:MM, business timezone)")
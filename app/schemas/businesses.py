@@ -137,6 +137,7 @@ class BusinessListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, when results are ordered by rating")
 
 
 # Service Schemas
@@ -270,6 +271,12 @@ class BusinessGalleryUpdate(BaseModel):
     image_type: Optional[str] = Field(None, max_length=50)
 
 
+class GalleryOrderItem(BaseModel):
+    """Schema for one image's position in a gallery reorder."""
+    image_id: uuid.UUID
+    sort_order: int = Field(..., ge=0)
+
+
 class BusinessGalleryResponse(BaseModel):
     """Response schema for business gallery image."""
     id: uuid.UUID
@@ -0,0 +1,456 @@
+"""
+Redis-cached lookups for rarely changing business catalog data.
+
+Services, business booking profiles and weekly business hours are read
+on every booking and availability check but change only when the owner
+edits them, so they are cached for a few minutes and invalidated by the
+endpoints that mutate them.
+
+Business categories are only managed by administrators, so the active
+list is additionally held in process memory for a short TTL and carries
+an ETag for conditional requests.
+
+Public business profiles, service lists and galleries get weak ETags
+derived from their latest updated_at, cached for ETAG_CACHE_TTL seconds
+so repeat polls are answered without querying the database at all.
+
+Available appointment slots depend on appointments, hours and services
+alike, so they are cached per business for AVAILABILITY_CACHE_TTL seconds
+and dropped whenever any of those change.
+"""
+
+from bisect import bisect_right
+from decimal import Decimal
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from datetime import date, datetime, time
+import hashlib
+import orjson
+import time as clock
+import uuid
+
+from app.core.cache import cache_delete, cache_get, cache_hget, cache_hset, cache_set
+from app.core.config import settings
+from app.models.businesses import Business, BusinessCategory, BusinessGallery, BusinessHours, Service, WeekDay
+
+
+# Statements built once at import so each cache miss only binds parameters
+_SERVICE_WITH_BUSINESS_STMT = (
+    select(Service)
+    .options(joinedload(Service.business))
+    .where(Service.id == bindparam("service_id"))
+)
+_BUSINESS_HOURS_STMT = select(BusinessHours).where(BusinessHours.business_id == bindparam("business_id"))
+_ACTIVE_CATEGORIES_STMT = (
+    select(BusinessCategory)
+    .where(BusinessCategory.is_active == True)
+    .order_by(BusinessCategory.sort_order, BusinessCategory.name)
+)
+
+# Latest change and row count behind each public business resource; the
+# count makes deleted rows change the ETag too
+_BUSINESS_VERSION_STMT = (
+    select(func.max(func.greatest(Business.updated_at, BusinessCategory.updated_at)), func.count())
+    .select_from(Business)
+    .outerjoin(Business.category)
+    .where(Business.id == bindparam("business_id"), Business.is_active == True)
+)
+_SERVICES_VERSION_STMT = (
+    select(func.max(Service.updated_at), func.count())
+    .where(Service.business_id == bindparam("business_id"))
+)
+_GALLERY_VERSION_STMT = (
+    select(func.max(BusinessGallery.updated_at), func.count())
+    .where(BusinessGallery.business_id == bindparam("business_id"))
+)
+
+_CATEGORIES_KEY = "business_categories:active"
+
+# In-process snapshot of the active categories: (expires at, categories)
+_categories: Optional[Tuple[float, "CachedCategories"]] = None
+
+
+class CachedService(NamedTuple):
+    """Booking-relevant fields of a service."""
+    id: uuid.UUID
+    business_id: uuid.UUID
+    duration_minutes: int
+    price: Optional[Decimal]
+
+
+class CachedBusiness(NamedTuple):
+    """Booking-relevant fields of a business."""
+    id: uuid.UUID
+    status: str
+    timezone: str
+
+
+class CachedHours(NamedTuple):
+    """Operating hours of a business for one day of the week."""
+    is_closed: bool
+    open_time: Optional[time]
+    close_time: Optional[time]
+    break_start: Optional[time]
+    break_end: Optional[time]
+
+    def is_open_at(self, at: time) -> bool:
+        """
+        Whether the business is open at a time of day.
+
+        Open hours are [open, break start) and [break end, close); the time
+        is located among those boundaries with a binary search, and an odd
+        insertion point means it falls inside an open interval.
+        """
+        if self.is_closed or self.open_time is None or self.close_time is None:
+            return False
+
+        if self.break_start is not None and self.break_end is not None:
+            boundaries = (self.open_time, self.break_start, self.break_end, self.close_time)
+        else:
+            boundaries = (self.open_time, self.close_time)
+
+        return bisect_right(boundaries, at) % 2 == 1
+
+
+class CachedCategory(NamedTuple):
+    """Public fields of a business category."""
+    id: uuid.UUID
+    name: str
+    description: Optional[str]
+    icon_url: Optional[str]
+    is_active: bool
+    sort_order: int
+    created_at: datetime
+
+
+class CachedCategories(NamedTuple):
+    """Active business categories with a validator for conditional requests."""
+    items: Tuple[CachedCategory, ...]
+    etag: str
+
+
+def _service_key(service_id: uuid.UUID) -> str:
+    return f"service:{service_id}"
+
+
+def _business_key(business_id: uuid.UUID) -> str:
+    return f"business:{business_id}:profile"
+
+
+def _hours_key(business_id: uuid.UUID) -> str:
+    return f"business_hours:{business_id}"
+
+
+def _etag_key(resource: str, business_id: uuid.UUID) -> str:
+    return f"etag:{resource}:{business_id}"
+
+
+def _availability_key(business_id: uuid.UUID) -> str:
+    return f"availability:{business_id}"
+
+
+def _availability_field(slot_date: date, service_id: uuid.UUID) -> str:
+    return f"{slot_date.isoformat()}:{service_id}"
+
+
+def _parse_time(value: Optional[str]) -> Optional[time]:
+    return time.fromisoformat(value) if value else None
+
+
+async def _store_business(business: Business) -> CachedBusiness:
+    snapshot = CachedBusiness(business.id, business.status, business.timezone)
+    await cache_set(_business_key(business.id), snapshot._asdict(), settings.CATALOG_CACHE_TTL)
+    return snapshot
+
+
+async def get_service_cached(db: AsyncSession, service_id: uuid.UUID) -> Optional[CachedService]:
+    """
+    Get a service, serving it from Redis when possible.
+
+    On a miss the service is loaded together with its business, and both
+    are cached so a following get_business_cached call is a hit.
+
+    Args:
+        db: Database session
+        service_id: Service ID
+
+    Returns:
+        Optional[CachedService]: Service snapshot, or None if it doesn't exist
+    """
+    cached = await cache_get(_service_key(service_id))
+    if cached:
+        return CachedService(
+            id=uuid.UUID(cached["id"]),
+            business_id=uuid.UUID(cached["business_id"]),
+            duration_minutes=cached["duration_minutes"],
+            price=Decimal(cached["price"]) if cached["price"] is not None else None
+        )
+
+    service = await db.scalar(_SERVICE_WITH_BUSINESS_STMT, {"service_id": service_id})
+    if not service:
+        return None
+
+    snapshot = CachedService(service.id, service.business_id, service.duration_minutes, service.price)
+    await cache_set(
+        _service_key(service.id),
+        {**snapshot._asdict(), "price": str(service.price) if service.price is not None else None},
+        settings.CATALOG_CACHE_TTL
+    )
+    await _store_business(service.business)
+
+    return snapshot
+
+
+async def get_business_cached(db: AsyncSession, business_id: uuid.UUID) -> Optional[CachedBusiness]:
+    """
+    Get a business's booking profile, serving it from Redis when possible.
+
+    Args:
+        db: Database session
+        business_id: Business ID
+
+    Returns:
+        Optional[CachedBusiness]: Business snapshot, or None if it doesn't exist
+    """
+    cached = await cache_get(_business_key(business_id))
+    if cached:
+        return CachedBusiness(uuid.UUID(cached["id"]), cached["status"], cached["timezone"])
+
+    business = await db.get(Business, business_id)
+    if not business:
+        return None
+
+    return await _store_business(business)
+
+
+async def get_business_hours_cached(db: AsyncSession, business_id: uuid.UUID) -> Dict[WeekDay, CachedHours]:
+    """
+    Get a business's weekly schedule, serving it from Redis when possible.
+
+    Args:
+        db: Database session
+        business_id: Business ID
+
+    Returns:
+        Dict[WeekDay, CachedHours]: Hours keyed by day; days without hours are absent
+    """
+    cached = await cache_get(_hours_key(business_id))
+    if cached is not None:
+        return {
+            WeekDay(day): CachedHours(
+                is_closed=hours["is_closed"],
+                open_time=_parse_time(hours["open_time"]),
+                close_time=_parse_time(hours["close_time"]),
+                break_start=_parse_time(hours["break_start"]),
+                break_end=_parse_time(hours["break_end"])
+            )
+            for day, hours in cached.items()
+        }
+
+    result = await db.scalars(_BUSINESS_HOURS_STMT, {"business_id": business_id})
+    schedule = {
+        hours.day_of_week: CachedHours(
+            hours.is_closed, hours.open_time, hours.close_time, hours.break_start, hours.break_end
+        )
+        for hours in result
+    }
+
+    await cache_set(
+        _hours_key(business_id),
+        {day.value: hours._asdict() for day, hours in schedule.items()},
+        settings.CATALOG_CACHE_TTL
+    )
+
+    return schedule
+
+
+async def _get_etag(db: AsyncSession, resource: str, stmt, business_id: uuid.UUID) -> Optional[str]:
+    key = _etag_key(resource, business_id)
+    etag = await cache_get(key)
+    if etag:
+        return etag
+
+    updated_at, count = (await db.execute(stmt, {"business_id": business_id})).one()
+    if not count:
+        return None
+
+    etag = f'W/"{int(updated_at.timestamp() * 1_000_000):x}-{count}"'
+    await cache_set(key, etag, settings.ETAG_CACHE_TTL)
+    return etag
+
+
+async def get_business_etag(db: AsyncSession, business_id: uuid.UUID) -> Optional[str]:
+    """
+    Get the ETag of an active business's public profile.
+
+    Args:
+        db: Database session
+        business_id: Business ID
+
+    Returns:
+        Optional[str]: Weak ETag, or None if the business doesn't exist or is inactive
+    """
+    return await _get_etag(db, "business", _BUSINESS_VERSION_STMT, business_id)
+
+
+async def get_services_etag(db: AsyncSession, business_id: uuid.UUID) -> Optional[str]:
+    """
+    Get the ETag of a business's service list, covering inactive services too.
+
+    Args:
+        db: Database session
+        business_id: Business ID
+
+    Returns:
+        Optional[str]: Weak ETag, or None if the business has no services
+    """
+    return await _get_etag(db, "services", _SERVICES_VERSION_STMT, business_id)
+
+
+async def get_gallery_etag(db: AsyncSession, business_id: uuid.UUID) -> Optional[str]:
+    """
+    Get the ETag of a business's gallery, covering inactive images too.
+
+    Args:
+        db: Database session
+        business_id: Business ID
+
+    Returns:
+        Optional[str]: Weak ETag, or None if the gallery is empty
+    """
+    return await _get_etag(db, "gallery", _GALLERY_VERSION_STMT, business_id)
+
+
+async def _load_categories(db: AsyncSession) -> CachedCategories:
+    cached = await cache_get(_CATEGORIES_KEY)
+    if cached:
+        return CachedCategories(
+            items=tuple(
+                CachedCategory(
+                    id=uuid.UUID(category["id"]),
+                    name=category["name"],
+                    description=category["description"],
+                    icon_url=category["icon_url"],
+                    is_active=category["is_active"],
+                    sort_order=category["sort_order"],
+                    created_at=datetime.fromisoformat(category["created_at"])
+                )
+                for category in cached["items"]
+            ),
+            etag=cached["etag"]
+        )
+
+    result = await db.scalars(_ACTIVE_CATEGORIES_STMT)
+    items = tuple(
+        CachedCategory(
+            category.id, category.name, category.description, category.icon_url,
+            category.is_active, category.sort_order, category.created_at
+        )
+        for category in result
+    )
+
+    # The ETag is a digest of the list, so every worker derives the same one
+    payload = [category._asdict() for category in items]
+    etag = f'W/"{hashlib.sha1(orjson.dumps(payload)).hexdigest()[:16]}"'
+    await cache_set(_CATEGORIES_KEY, {"items": payload, "etag": etag}, settings.CATALOG_CACHE_TTL)
+
+    return CachedCategories(items, etag)
+
+
+async def get_active_categories_cached(db: AsyncSession) -> CachedCategories:
+    """
+    Get all active business categories in display order.
+
+    The list is kept in process memory for CATEGORY_CACHE_TTL seconds and
+    shared between workers through Redis, so it is queried at most once
+    per CATALOG_CACHE_TTL; callers slice it for pagination.
+
+    Args:
+        db: Database session
+
+    Returns:
+        CachedCategories: Active categories ordered by sort order and name, and their ETag
+    """
+    global _categories
+
+    now = clock.monotonic()
+    if _categories is not None and _categories[0] > now:
+        return _categories[1]
+
+    categories = await _load_categories(db)
+    _categories = (now + settings.CATEGORY_CACHE_TTL, categories)
+    return categories
+
+
+async def invalidate_categories():
+    """Drop the cached category list. Call after categories change."""
+    global _categories
+    _categories = None
+    await cache_delete(_CATEGORIES_KEY)
+
+
+async def invalidate_service(service_id: uuid.UUID):
+    """Drop a cached service. Call after the service is updated or deleted."""
+    await cache_delete(_service_key(service_id))
+
+
+async def invalidate_business(business_id: uuid.UUID):
+    """Drop a cached business profile and its ETag. Call after the business is updated."""
+    await cache_delete(_business_key(business_id), _etag_key("business", business_id))
+
+
+async def invalidate_business_content(business_id: uuid.UUID):
+    """Drop the ETags of a business's services and gallery. Call after either changes."""
+    await cache_delete(_etag_key("services", business_id), _etag_key("gallery", business_id))
+
+
+async def invalidate_business_hours(business_id: uuid.UUID):
+    """Drop a cached weekly schedule. Call after any business hours change."""
+    await cache_delete(_hours_key(business_id))
+
+
+async def get_availability_cached(business_id: uuid.UUID, slot_date: date, service_id: uuid.UUID) -> Optional[Any]:
+    """
+    Get a cached available-slots response.
+
+    A business's slots for every date and service share one hash, because
+    a booking, an hours change or a service change can affect any of them,
+    and dropping the hash invalidates them all at once.
+
+    Args:
+        business_id: Business ID
+        slot_date: Date the slots are on
+        service_id: Service the slots are for
+
+    Returns:
+        Optional[Any]: Cached response data, or None on a miss
+    """
+    return await cache_hget(_availability_key(business_id), _availability_field(slot_date, service_id))
+
+
+async def store_availability(business_id: uuid.UUID, slot_date: date, service_id: uuid.UUID, data: Any):
+    """
+    Cache an available-slots response for AVAILABILITY_CACHE_TTL seconds.
+
+    Args:
+        business_id: Business ID
+        slot_date: Date the slots are on
+        service_id: Service the slots are for
+        data: JSON-serializable response data
+    """
+    await cache_hset(
+        _availability_key(business_id),
+        _availability_field(slot_date, service_id),
+        data,
+        settings.AVAILABILITY_CACHE_TTL
+    )
+
+
+async def invalidate_availability(business_id: uuid.UUID):
+    """
+    Drop a business's cached available slots. Call after its appointments,
+    hours or services change.
+    """
+    await cache_delete(_availability_key(business_id))
@@ -0,0 +1,81 @@
+"""
+Shared, short-lived caching of public search responses.
+
+Identical searches that arrive together are answered by a single database
+query: the first request takes a short Redis lock and caches its response
+body, and the others wait briefly for that body instead of running the
+same query. Cached bodies are then served for SEARCH_CACHE_TTL seconds.
+"""
+
+from fastapi.responses import Response
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+import hashlib
+import orjson
+
+from app.core.cache import cache_add, cache_delete, cache_get_bytes, cache_set_bytes
+from app.core.config import settings
+
+# How often a waiting request checks whether the first one has finished
+SEARCH_POLL_INTERVAL = 0.05
+
+
+def search_cache_key(namespace: str, params: Dict[str, Any]) -> str:
+    """
+    Cache key for a search with the given (already normalized) parameters.
+
+    Args:
+        namespace: Name of the search endpoint
+        params: Query parameters that determine the response
+
+    Returns:
+        str: Cache key
+    """
+    digest = hashlib.sha1(orjson.dumps(params, option=orjson.OPT_SORT_KEYS, default=str)).hexdigest()
+    return f"search:{namespace}:{digest}"
+
+
+async def cached_search_response(key: str, produce: Callable[[], Awaitable[bytes]]) -> Response:
+    """
+    Serve a JSON search response from the cache, or produce it once.
+
+    The body is built in full before anything is sent, so a failing query
+    surfaces as an error response rather than an aborted 200.
+
+    Args:
+        key: Cache key from search_cache_key
+        produce: Runs the search and returns the response body
+
+    Returns:
+        Response: Cached or freshly produced body
+    """
+    body = await cache_get_bytes(key)
+    if body is not None:
+        return Response(body, media_type="application/json")
+
+    lock_key = f"{key}:lock"
+    if await cache_add(lock_key, settings.SEARCH_LOCK_TTL):
+        try:
+            body = await produce()
+            await cache_set_bytes(key, body, settings.SEARCH_CACHE_TTL)
+        finally:
+            await cache_delete(lock_key)
+        return Response(body, media_type="application/json")
+
+    # The same search is already running; wait for its body rather than
+    # repeating the query, up to as long as it may hold the lock
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.SEARCH_LOCK_TTL
+    while loop.time() < deadline:
+        await asyncio.sleep(SEARCH_POLL_INTERVAL)
+        # Read the lock before the body: the body is cached before the lock
+        # is released, so a released lock with no body means the first
+        # request failed and there is nothing left to wait for
+        locked = await cache_get_bytes(lock_key) is not None
+        body = await cache_get_bytes(key)
+        if body is not None:
+            return Response(body, media_type="application/json")
+        if not locked:
+            break
+
+    return Response(await produce(), media_type="application/json")
@@ -13,7 +13,7 @@ Author: Bookora Team
 from datetime import datetime, timedelta
 from typing import List, Optional
 from celery import shared_task
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 import logging
 
@@ -219,7 +219,7 @@ Thank you for choosing Bookora!
             subject=subject,
             body=body,
             status=NotificationStatus.SENT if notification_sent else NotificationStatus.FAILED,
-            sent_at=datetime.utcnow() if notification_sent else None,
+            sent_at=func.now() if notification_sent else None,
             related_appointment_id=appointment.id,
             related_client_id=client.id,
             related_business_id=business.id
@@ -339,7 +339,7 @@ def send_appointment_confirmation(
             subject=subject,
             body=body,
             status=NotificationStatus.SENT if notification_sent else NotificationStatus.FAILED,
-            sent_at=datetime.utcnow() if notification_sent else None,
+            sent_at=func.now() if notification_sent else None,
             related_appointment_id=appointment.id,
             related_client_id=client.id,
             related_business_id=business.id
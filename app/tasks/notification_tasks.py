@@ -13,7 +13,7 @@ Author: Bookora Team
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from celery import shared_task
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 import logging
 
@@ -91,10 +91,10 @@ def retry_failed_notifications(self):
                 
                 if success:
                     notification.status = NotificationStatus.SENT
-                    notification.sent_at = datetime.utcnow()
+                    notification.sent_at = func.now()
                     results["success"] += 1
                 else:
-                    notification.failed_at = datetime.utcnow()
+                    notification.failed_at = func.now()
                     results["failed"] += 1
                 
             except Exception as e:
@@ -312,8 +312,8 @@ def send_single_notification(
             subject=subject,
             body=body,
             status=NotificationStatus.SENT if notification_sent else NotificationStatus.FAILED,
-            sent_at=datetime.utcnow() if notification_sent else None,
-            failed_at=None if notification_sent else datetime.utcnow(),
+            sent_at=func.now() if notification_sent else None,
+            failed_at=None if notification_sent else func.now(),
             related_client_id=client.id if client else None,
             related_business_id=business.id if business else None,
             extra_data=data
@@ -204,8 +204,8 @@ Thank you for using Bookora!
             subject=subject,
             body=body,
             status=NotificationStatus.SENT if notification_sent else NotificationStatus.FAILED,
-            sent_at=datetime.utcnow() if notification_sent else None,
-            failed_at=None if notification_sent else datetime.utcnow(),
+            sent_at=func.now() if notification_sent else None,
+            failed_at=None if notification_sent else func.now(),
             related_appointment_id=appointment.id,
             related_client_id=client.id,
             related_business_id=business.id
@@ -5,14 +5,16 @@ Multi-tenant appointment booking system with DDD/CQRS architecture.
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
 
 from app.core.credentials import credentials
-from app.core.database import engine
-from app.api.v1.api import api_router
+from app.core.cache import close_cache
+from app.core.database import check_connection_budget, close_db, engine, pool_metrics
+from app.api.v1 import api_router
 from app.websocket.connection_manager import connection_manager
 from app.middleware.security import APIKeyMiddleware
 
@@ -25,9 +27,12 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     print("🚀 Starting Bookora API...")
+    check_connection_budget()
     yield
     # Shutdown
     print("🛑 Shutting down Bookora API...")
+    await close_cache()
+    await close_db()
 
 
 # Create FastAPI application
@@ -39,7 +44,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
-    root_path="/bookora"
+    root_path="/bookora",
+    default_response_class=ORJSONResponse  # orjson encodes datetimes, UUIDs and Decimals natively
 )
 
 # Get CORS configuration
@@ -94,6 +100,12 @@ async def health_check():
     return {"status": "healthy", "service": "bookora-api"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Database connection pool gauges in Prometheus text format."""
+    return pool_metrics()
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -0,0 +1,237 @@
+"""Tests for appointment slot generation, double-booking and availability caching."""
+
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+
+from app.api.v1.endpoints import appointments
+from app.core.auth import Principal, PrincipalKind
+from app.core.database import get_async_db
+from app.models.appointments import Appointment
+from app.services.catalog_cache import (
+    CachedHours, get_availability_cached, invalidate_availability, store_availability
+)
+from main import app
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeSession:
+    """Async session double returning canned results."""
+
+    def __init__(self, scalar=None, scalars=(), commit_error=None):
+        self._scalar = scalar
+        self._scalars = scalars
+        self._commit_error = commit_error
+        self.rolled_back = False
+
+    async def scalar(self, *args, **kwargs):
+        return self._scalar
+
+    async def scalars(self, *args, **kwargs):
+        return iter(self._scalars)
+
+    async def commit(self):
+        if self._commit_error:
+            raise self._commit_error
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+class PgError(Exception):
+    """DBAPI error carrying a PostgreSQL SQLSTATE, like asyncpg's."""
+
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def fake_db_client(session: FakeSession) -> TestClient:
+    """Test client whose endpoints get ``session`` as their database."""
+    async def override_get_async_db():
+        yield session
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return TestClient(app, base_url="http://localhost")
+
+
+@pytest.fixture(autouse=True)
+def clear_overrides():
+    yield
+    app.dependency_overrides.pop(get_async_db, None)
+
+
+def next_monday() -> date:
+    """A Monday far enough ahead that all of its slots are in the future."""
+    day = date.today() + timedelta(days=30)
+    return day + timedelta(days=-day.weekday() % 7)
+
+
+async def test_find_open_slots_labels_in_business_time():
+    tz = ZoneInfo("Europe/Berlin")
+    slot_date = date(2026, 7, 6)
+    hours = CachedHours(False, time(9, 0), time(12, 0), None, None)
+    starts = [
+        datetime(2026, 7, 6, 7, 0, tzinfo=timezone.utc),
+        datetime(2026, 7, 6, 7, 15, tzinfo=timezone.utc),
+        datetime(2026, 7, 6, 9, 45, tzinfo=timezone.utc),
+    ]
+
+    slots = await appointments._find_open_slots(
+        FakeSession(scalars=starts), uuid.uuid4(), slot_date, hours, 60, tz
+    )
+
+    assert slots == ["09:00", "09:15", "11:45"]
+
+
+async def test_commit_exclusion_violation_is_conflict():
+    error = IntegrityError("INSERT INTO appointments", {}, PgError(appointments.EXCLUSION_VIOLATION))
+    db = FakeSession(commit_error=error)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await appointments._commit_or_conflict(db, "Time slot is already booked")
+
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail == "Time slot is already booked"
+    assert db.rolled_back
+
+
+async def test_commit_other_integrity_errors_propagate():
+    error = IntegrityError("INSERT INTO appointments", {}, PgError("23503"))
+
+    with pytest.raises(IntegrityError):
+        await appointments._commit_or_conflict(FakeSession(commit_error=error), "Time slot is already booked")
+
+
+async def test_invalidate_availability_drops_every_date_and_service(memory_cache):
+    business_id, other_business_id = uuid.uuid4(), uuid.uuid4()
+    service_id = uuid.uuid4()
+    await store_availability(business_id, date(2026, 7, 6), service_id, {"slots": ["09:00"]})
+    await store_availability(business_id, date(2026, 7, 7), uuid.uuid4(), {"slots": ["10:00"]})
+    await store_availability(other_business_id, date(2026, 7, 6), service_id, {"slots": ["11:00"]})
+
+    assert await get_availability_cached(business_id, date(2026, 7, 6), service_id) == {"slots": ["09:00"]}
+
+    await invalidate_availability(business_id)
+
+    assert f"availability:{business_id}" not in memory_cache
+    assert await get_availability_cached(business_id, date(2026, 7, 6), service_id) is None
+    assert await get_availability_cached(other_business_id, date(2026, 7, 6), service_id) == {"slots": ["11:00"]}
+
+
+async def test_deleting_business_hours_invalidates_availability(memory_cache):
+    business_id = uuid.uuid4()
+    await store_availability(business_id, date(2026, 7, 6), uuid.uuid4(), {"slots": ["09:00"]})
+
+    response = fake_db_client(FakeSession(scalar=business_id)).delete(
+        f"/api/v1/business-hours/{uuid.uuid4()}", params={"firebase_uid": "business-firebase-uid"}
+    )
+
+    assert response.status_code == 200
+    assert f"availability:{business_id}" not in memory_cache
+
+
+async def test_deleting_service_invalidates_availability(memory_cache):
+    business_id = uuid.uuid4()
+    await store_availability(business_id, date(2026, 7, 6), uuid.uuid4(), {"slots": ["09:00"]})
+
+    response = fake_db_client(FakeSession(scalar=business_id)).delete(
+        f"/api/v1/businesses/me/services/{uuid.uuid4()}", params={"firebase_uid": "business-firebase-uid"}
+    )
+
+    assert response.status_code == 200
+    assert f"availability:{business_id}" not in memory_cache
+
+
+async def test_available_slots_skip_booked_time(async_client, async_db, seeded):
+    slot_date = next_monday()
+    async_db.add(Appointment(
+        client_id=seeded.client.id,
+        business_id=seeded.business.id,
+        service_id=seeded.service.id,
+        appointment_date=datetime.combine(slot_date, time(10, 0), tzinfo=timezone.utc),
+        duration_minutes=60
+    ))
+    await async_db.commit()
+
+    response = await async_client.get(
+        f"/api/v1/appointments/business/{seeded.business.id}/available-slots",
+        params={"service_id": str(seeded.service.id), "date": slot_date.isoformat()}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["slots"] == ["09:00", "11:00"]
+
+
+async def test_appointment_response_serializes_under_raiseload(async_client, async_session_factory, seeded):
+    start = datetime.combine(next_monday(), time(9, 0), tzinfo=timezone.utc)
+    async with async_session_factory() as session:
+        session.add(Appointment(
+            client_id=seeded.client.id,
+            business_id=seeded.business.id,
+            service_id=seeded.service.id,
+            appointment_date=start,
+            duration_minutes=60
+        ))
+        await session.commit()
+
+    # A fresh session, so every attribute the schema reads comes from the statement
+    async with async_session_factory() as session:
+        calendar = await session.scalars(
+            appointments._BUSINESS_CALENDAR_STMT,
+            {"business_id": seeded.business.id, "start_date": start, "end_date": start + timedelta(days=1)}
+        )
+        assert appointments._APPOINTMENT_LIST_ADAPTER.dump_json(
+            appointments._APPOINTMENT_LIST_ADAPTER.validate_python(calendar.all())
+        )
+
+    response = await async_client.get(
+        "/api/v1/appointments/business/calendar",
+        params={
+            "firebase_uid": seeded.business.firebase_uid,
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=1)).isoformat()
+        }
+    )
+
+    assert response.status_code == 200
+    assert [item["client_id"] for item in response.json()] == [str(seeded.client.id)]
+
+
+async def test_find_open_slots_labels_across_dst_change():
+    # Clocks in Berlin jump from 02:00 to 03:00 on 2026-03-29
+    tz = ZoneInfo("Europe/Berlin")
+    slot_date = date(2026, 3, 29)
+    hours = CachedHours(False, time(1, 0), time(5, 0), None, None)
+    starts = [
+        datetime(2026, 3, 29, 0, 0, tzinfo=timezone.utc),
+        datetime(2026, 3, 29, 0, 45, tzinfo=timezone.utc),
+        datetime(2026, 3, 29, 1, 0, tzinfo=timezone.utc),
+        datetime(2026, 3, 29, 1, 15, tzinfo=timezone.utc),
+    ]
+
+    slots = await appointments._find_open_slots(
+        FakeSession(scalars=starts), uuid.uuid4(), slot_date, hours, 60, tz
+    )
+
+    assert slots == ["01:00", "01:45", "03:00", "03:15"]
+
+
+def test_access_checks_accept_either_account_of_a_shared_uid():
+    client_id, business_id = uuid.uuid4(), uuid.uuid4()
+    # One Firebase UID registered as both a client and a business
+    principals = [Principal(PrincipalKind.CLIENT, client_id), Principal(PrincipalKind.BUSINESS, business_id)]
+    with_own_business = Appointment(client_id=uuid.uuid4(), business_id=business_id)
+    with_other_business = Appointment(client_id=client_id, business_id=uuid.uuid4())
+
+    assert appointments._is_appointment_business(with_own_business, principals)
+    assert not appointments._is_appointment_client(with_own_business, principals)
+    assert appointments._is_appointment_client(with_other_business, principals)
+    assert not appointments._is_appointment_business(with_other_business, principals)
+    assert not appointments._is_appointment_client(with_own_business, [])
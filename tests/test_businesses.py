@@ -0,0 +1,145 @@
+"""Tests for business profile serialization, listings and gallery ordering."""
+
+import uuid
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import raiseload
+
+from app.api.v1.endpoints import businesses
+from app.models.businesses import Business, BusinessGallery
+from app.schemas.businesses import BusinessResponse
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_business_response_serializes_under_raiseload(async_session_factory, seeded):
+    # A fresh session, so every attribute the schema reads comes from the statement
+    async with async_session_factory() as session:
+        business = await session.scalar(
+            businesses._BUSINESS_BY_ID_STMT.options(raiseload("*")), {"business_id": seeded.business.id}
+        )
+        response = BusinessResponse.model_validate(business)
+
+    assert response.id == seeded.business.id
+    assert response.category.name == seeded.business.category.name
+
+
+async def test_get_business_by_id(async_client, seeded):
+    response = await async_client.get(f"/api/v1/businesses/{seeded.business.id}")
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Test Business"
+    assert response.headers["etag"]
+
+
+async def test_search_listing_loads_page_in_one_query(async_client, async_session_factory, seeded):
+    async with async_session_factory() as session:
+        for n in range(3):
+            session.add(Business(
+                firebase_uid=f"business-{uuid.uuid4().hex}",
+                email=f"listing-{uuid.uuid4().hex}@example.com",
+                name=f"Listed Business {n}",
+                category_id=seeded.business.category_id,
+                is_approved=True
+            ))
+        await session.commit()
+
+    # Categories come from the same joined query as the page, so listing
+    # more businesses must not add per-row loads
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sync_engine = async_session_factory.kw["bind"].sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        response = await async_client.get("/api/v1/businesses/search")
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 4
+    assert {item["category"]["name"] for item in body["businesses"]} == {seeded.business.category.name}
+    assert len(statements) == 1
+
+
+@pytest.fixture
+async def gallery(async_session_factory, seeded):
+    """Four gallery images of the seeded business, in sort_order 0-3."""
+    async with async_session_factory() as session:
+        images = [
+            BusinessGallery(business_id=seeded.business.id, image_url=f"https://example.com/{n}.jpg", sort_order=n)
+            for n in range(4)
+        ]
+        session.add_all(images)
+        await session.commit()
+    return images
+
+
+async def test_reorder_gallery_returns_new_order(async_client, seeded, gallery):
+    response = await async_client.post(
+        "/api/v1/businesses/gallery/reorder",
+        params={"firebase_uid": seeded.business.firebase_uid},
+        json=[
+            {"image_id": str(gallery[0].id), "sort_order": 3},
+            {"image_id": str(gallery[3].id), "sort_order": 0},
+        ]
+    )
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [str(gallery[3].id), str(gallery[0].id)]
+    assert [item["sort_order"] for item in response.json()] == [0, 3]
+
+
+async def test_reorder_gallery_rejects_images_of_other_businesses(async_client, async_session_factory, seeded, gallery):
+    other_uid = f"business-{uuid.uuid4().hex}"
+    async with async_session_factory() as session:
+        session.add(Business(
+            firebase_uid=other_uid,
+            email=f"other-{uuid.uuid4().hex}@example.com",
+            name="Other Business",
+            category_id=seeded.business.category_id
+        ))
+        await session.commit()
+
+    response = await async_client.post(
+        "/api/v1/businesses/gallery/reorder",
+        params={"firebase_uid": other_uid},
+        json=[{"image_id": str(gallery[0].id), "sort_order": 3}]
+    )
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Gallery image not found"
+    async with async_session_factory() as session:
+        assert await session.scalar(
+            select(BusinessGallery.sort_order).where(BusinessGallery.id == gallery[0].id)
+        ) == 0
+
+
+async def test_gallery_pages_follow_new_order(async_client, seeded, gallery):
+    response = await async_client.post(
+        "/api/v1/businesses/gallery/reorder",
+        params={"firebase_uid": seeded.business.firebase_uid},
+        json=[
+            {"image_id": str(gallery[0].id), "sort_order": 3},
+            {"image_id": str(gallery[1].id), "sort_order": 2},
+            {"image_id": str(gallery[2].id), "sort_order": 1},
+            {"image_id": str(gallery[3].id), "sort_order": 0},
+        ]
+    )
+    assert response.status_code == 200
+
+    first_page = await async_client.get(
+        "/api/v1/businesses/gallery", params={"business_id": str(seeded.business.id), "limit": 2}
+    )
+    second_page = await async_client.get(
+        "/api/v1/businesses/gallery",
+        params={"business_id": str(seeded.business.id), "limit": 2, "cursor": first_page.json()[-1]["id"]}
+    )
+
+    assert [item["id"] for item in first_page.json() + second_page.json()] == [
+        str(image.id) for image in reversed(gallery)
+    ]
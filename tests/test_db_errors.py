@@ -0,0 +1,53 @@
+"""Tests for mapping database constraint violations to client errors."""
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app.core.db_errors import UNIQUE_VIOLATION, raise_if_duplicate
+
+pytestmark = pytest.mark.anyio
+
+DETAILS = {"ix_clients_phone_number": "Phone number already registered"}
+
+
+class FakeSession:
+    def __init__(self):
+        self.rolled_back = False
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+def integrity_error(pgcode: str, constraint_name: str) -> IntegrityError:
+    """IntegrityError shaped like the asyncpg dialect's: the driver error is the DBAPI error's cause."""
+    cause = Exception(constraint_name)
+    cause.constraint_name = constraint_name
+    orig = Exception(pgcode)
+    orig.pgcode = pgcode
+    orig.__cause__ = cause
+    return IntegrityError("INSERT INTO clients", {}, orig)
+
+
+async def test_known_unique_index_maps_to_400():
+    db = FakeSession()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await raise_if_duplicate(db, integrity_error(UNIQUE_VIOLATION, "ix_clients_phone_number"), DETAILS)
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Phone number already registered"
+    assert db.rolled_back
+
+
+@pytest.mark.parametrize("pgcode, constraint_name", [
+    (UNIQUE_VIOLATION, "ix_businesses_email"),
+    ("23503", "ix_clients_phone_number"),
+])
+async def test_other_integrity_errors_propagate(pgcode, constraint_name):
+    db = FakeSession()
+
+    with pytest.raises(IntegrityError):
+        await raise_if_duplicate(db, integrity_error(pgcode, constraint_name), DETAILS)
+
+    assert db.rolled_back
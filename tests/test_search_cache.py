@@ -0,0 +1,44 @@
+"""Tests for shared search response caching."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.search_cache import cached_search_response
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_search_error_propagates_and_releases_lock(memory_cache):
+    async def fail():
+        raise RuntimeError("query failed")
+
+    with pytest.raises(RuntimeError):
+        await cached_search_response("search:test:key", fail)
+
+    assert "search:test:key" not in memory_cache
+    assert "search:test:key:lock" not in memory_cache
+
+
+async def test_waiting_search_stops_once_lock_is_released(memory_cache, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_LOCK_TTL", 60)
+    memory_cache["search:test:key:lock"] = b"1"
+
+    async def produce():
+        return b"[]"
+
+    async def release():
+        await asyncio.sleep(0.1)
+        del memory_cache["search:test:key:lock"]
+
+    # The lock holder gave up without caching a body, so the waiting
+    # request runs the search itself instead of polling out the lock TTL
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    release_task = asyncio.create_task(release())
+    response = await cached_search_response("search:test:key", produce)
+    await release_task
+
+    assert response.body == b"[]"
+    assert loop.time() - started < 1